@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+성능 측정 프로그램
+합성 Git 저장소를 만들어 GitAnalyzer 커밋 수집(git 명령어/객체 직접 읽기/색인)과
+프롬프트 생성 단계의 성능을 측정합니다.
+결과는 버전 간 비교를 위해 JSON으로 출력합니다.
+
+사용 예:
+    python benchmark.py --repos 5 --days 60 --commits-per-day 20 --output result.json
+    python benchmark.py --startup-only --startup-budget-ms 300   # 시작 시간 목표 확인 (초과 시 종료 코드 1)
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from commit_graph import CommitGraph
+from commit_index import CommitIndex
+from git_analyzer import GitAnalyzer
+from prompt_budget import fit_prompt
+
+BENCH_AUTHOR = "bench"
+BASE_DATE = datetime(2025, 9, 1)
+
+# 시작 시간 측정 대상 (모듈을 불러오기만 해도 requests 같은 무거운 모듈이나 환경변수 검사가 실행되면 안 됨)
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+STARTUP_COMMANDS = {
+    'cli_help': ['cli.py', '--help'],
+    'import_modules': ['-c', 'import sys, cli, main, daily_post, week_post, scheduler, cohort; print("requests" in sys.modules)'],
+}
+
+
+class _CountingPopen(subprocess.Popen):
+    """실행된 하위 프로세스 수를 세는 Popen (subprocess.run도 내부적으로 사용)"""
+    count = 0
+
+    def __init__(self, *args, **kwargs):
+        _CountingPopen.count += 1
+        super().__init__(*args, **kwargs)
+
+
+class StubGeminiAPI:
+    """네트워크 호출 없이 고정 응답을 돌려주는 GeminiAPI 대체 클래스"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def call_api(self, prompt, max_tokens=1000, max_retries=3, use_cache=True):
+        self.calls += 1
+        return f"# 보고서\n프롬프트 {len(prompt)}자에 대한 요약입니다."
+
+
+def build_repository(path, days, commits_per_day, files_per_commit, seed):
+    """git fast-import로 합성 저장소 생성
+
+    Args:
+        path: 생성할 저장소 경로
+        days: 커밋을 만들 일수 (BASE_DATE부터)
+        commits_per_day: 하루 커밋 수
+        files_per_commit: 커밋당 변경 파일 수
+        seed: 내용 생성용 난수 시드
+    """
+    rng = random.Random(seed)
+    subprocess.run(['git', 'init', '-q', path], check=True)
+
+    file_pool = [f"src/module{i // 20}/file{i}.py" for i in range(max(files_per_commit * 10, 1))]
+    tz = time.strftime('%z')
+
+    chunks = []
+    mark = 0
+    for day in range(days):
+        for n in range(commits_per_day):
+            mark += 1
+            when = int((BASE_DATE + timedelta(days=day, hours=9, minutes=n)).timestamp())
+            # 같은 제목이 반복되는 실제 작업 패턴도 일부 포함
+            subject = rng.choice(["fix typo", "update tests", f"feat: 기능 {mark} 추가", f"refactor module {mark % 7}"])
+            message = subject.encode()
+            chunks.append(b"commit refs/heads/main\n")
+            chunks.append(f"mark :{mark}\n".encode())
+            chunks.append(f"author {BENCH_AUTHOR} <bench@example.com> {when} {tz}\n".encode())
+            chunks.append(f"committer {BENCH_AUTHOR} <bench@example.com> {when} {tz}\n".encode())
+            chunks.append(f"data {len(message)}\n".encode() + message + b"\n")
+            if mark > 1:
+                chunks.append(f"from :{mark - 1}\n".encode())
+            for file_path in rng.sample(file_pool, min(files_per_commit, len(file_pool))):
+                content = "".join(f"line {mark} {i} {rng.random()}\n" for i in range(rng.randint(5, 40))).encode()
+                chunks.append(f"M 100644 inline {file_path}\ndata {len(content)}\n".encode() + content + b"\n")
+
+    subprocess.run(['git', '-C', path, 'fast-import', '--quiet'], input=b"".join(chunks), check=True)
+    subprocess.run(['git', '-C', path, 'symbolic-ref', 'HEAD', 'refs/heads/main'], check=True)
+
+
+def measure(func, repeat):
+    """함수를 반복 실행하며 실행 시간과 하위 프로세스 수 측정
+
+    process_peak_rss_kb는 이 단계만의 메모리 사용량이 아니라 측정 프로세스가 시작된 뒤
+    지금까지의 최대값이므로 단계를 거치며 줄지 않습니다 (앞 단계보다 커졌을 때만 이 단계의 영향).
+    """
+    timings = []
+    subprocesses = 0
+    for _ in range(repeat):
+        before = _CountingPopen.count
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+        subprocesses = _CountingPopen.count - before
+
+    return {
+        'wall_time_min': min(timings),
+        'wall_time_median': statistics.median(timings),
+        'subprocesses_per_run': subprocesses,
+        'process_peak_rss_kb': process_peak_rss_kb(),
+    }
+
+
+def process_peak_rss_kb():
+    """프로세스 시작 후 현재까지의 최대 RSS (자신과 종료된 하위 프로세스 중 큰 값, KB)
+
+    ru_maxrss는 프로세스 전체 기간의 최대값이라 단계별 사용량으로 해석하면 안 됩니다.
+    """
+    usage = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    # macOS는 바이트, Linux는 KB 단위
+    return usage // 1024 if sys.platform == 'darwin' else usage
+
+
+def measure_startup(repeat, budget_ms):
+    """CLI 시작 시간과 모듈 불러오기 부작용 측정
+
+    Args:
+        repeat: 반복 횟수
+        budget_ms: 시작 시간 목표(밀리초), 중앙값 기준
+
+    Returns:
+        명령별 측정 결과와 목표 달성 여부
+    """
+    # 게시용 환경변수가 없어도 불러오기만으로는 실패하지 않아야 함
+    env = {key: value for key, value in os.environ.items() if key != 'SESSION_COOKIE'}
+
+    results = {}
+    for name, command in STARTUP_COMMANDS.items():
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            completed = subprocess.run([sys.executable, *command], cwd=PROJECT_DIR, env=env,
+                                       capture_output=True, text=True)
+            timings.append(time.perf_counter() - start)
+
+        results[name] = {
+            'wall_time_min': min(timings),
+            'wall_time_median': statistics.median(timings),
+            'returncode': completed.returncode,
+        }
+        if name == 'import_modules':
+            results[name]['requests_imported'] = completed.stdout.strip() != 'False'
+
+    passed = (
+        all(result['returncode'] == 0 for result in results.values())
+        and not results['import_modules']['requests_imported']
+        and results['cli_help']['wall_time_median'] * 1000 <= budget_ms
+    )
+    return {'budget_ms': budget_ms, 'passed': passed, 'commands': results}
+
+
+def run_benchmarks(args, workdir):
+    """합성 저장소를 만들고 각 단계 측정"""
+    repositories = []
+    build_start = time.perf_counter()
+    for i in range(args.repos):
+        path = os.path.join(workdir, f"repo{i}")
+        build_repository(path, args.days, args.commits_per_day, args.files_per_commit, seed=i)
+        repositories.append(path)
+    build_time = time.perf_counter() - build_start
+
+    day = (BASE_DATE + timedelta(days=args.days // 2)).strftime('%Y-%m-%d')
+    range_start = (BASE_DATE + timedelta(days=max(args.days - 7, 0))).strftime('%Y-%m-%d')
+    range_end = (BASE_DATE + timedelta(days=args.days - 1)).strftime('%Y-%m-%d')
+
+    results = {}
+
+    # 결과 출력(print)은 측정에서 제외
+    devnull = open(os.devnull, 'w')
+    stdout = sys.stdout
+    sys.stdout = devnull
+    try:
+        analyzer = GitAnalyzer(repositories, max_workers=args.workers)
+        results['analyze_commits_for_date'] = measure(
+            lambda: analyzer.analyze_commits_for_date(day, author=BENCH_AUTHOR), args.repeat)
+        results['analyze_commits_for_date_range'] = measure(
+            lambda: analyzer.analyze_commits_for_date_range(range_start, range_end, author=BENCH_AUTHOR), args.repeat)
+
+        # git 프로세스 없이 .git을 직접 읽는 방식 (첫 실행 이후에는 팩 파일 mmap과 파싱 캐시를 재사용)
+        objects = GitAnalyzer(repositories, max_workers=args.workers, backend='objects')
+        results['objects_cold_date'] = measure(
+            lambda: objects.analyze_commits_for_date(day, author=BENCH_AUTHOR), 1)
+        results['objects_date'] = measure(
+            lambda: objects.analyze_commits_for_date(day, author=BENCH_AUTHOR), args.repeat)
+        results['objects_date_range'] = measure(
+            lambda: objects.analyze_commits_for_date_range(range_start, range_end, author=BENCH_AUTHOR), args.repeat)
+        results['backends_match'] = (
+            analyzer.collect_commits_for_date_range(range_start, range_end, author=BENCH_AUTHOR)
+            == objects.collect_commits_for_date_range(range_start, range_end, author=BENCH_AUTHOR)
+        )
+
+        index_path = os.path.join(workdir, 'commit_index.sqlite3')
+        indexed = GitAnalyzer(repositories, max_workers=args.workers, index=CommitIndex(index_path))
+        results['index_cold_build'] = measure(
+            lambda: indexed.analyze_commits_for_date(day, author=BENCH_AUTHOR), 1)
+        results['index_warm_date'] = measure(
+            lambda: indexed.analyze_commits_for_date(day, author=BENCH_AUTHOR), args.repeat)
+        results['index_warm_date_range'] = measure(
+            lambda: indexed.analyze_commits_for_date_range(range_start, range_end, author=BENCH_AUTHOR), args.repeat)
+
+        # 모든 브랜치 조회 (커밋 그래프 캐시)
+        graph = CommitGraph(os.path.join(workdir, 'commit_graph.sqlite3'))
+        all_refs = GitAnalyzer(repositories, max_workers=args.workers, graph=graph)
+        results['graph_cold_build'] = measure(
+            lambda: all_refs.analyze_commits_for_date(day, author=BENCH_AUTHOR), 1)
+        results['graph_warm_date_range'] = measure(
+            lambda: all_refs.analyze_commits_for_date_range(range_start, range_end, author=BENCH_AUTHOR), args.repeat)
+
+        # 변경 내용 요약 단계 (저장소별 git log -p 한 번)
+        digested = GitAnalyzer(repositories, max_workers=args.workers, diff_digest=True)
+        results['diff_digest_date_range'] = measure(
+            lambda: digested.collect_commits_for_date_range(range_start, range_end, author=BENCH_AUTHOR), args.repeat)
+
+        # 프롬프트 생성 + (대체) Gemini 호출 단계
+        from main import create_gemini_prompt
+        gemini = StubGeminiAPI()
+        range_results = analyzer.collect_commits_for_date_range(range_start, range_end, author=BENCH_AUTHOR)
+
+        def build_prompt():
+            prompt, _ = fit_prompt(lambda data: create_gemini_prompt(data, range_end), range_results,
+                                   day_of=analyzer.commit_day)
+            gemini.call_api(prompt)
+
+        results['prompt_build'] = measure(build_prompt, args.repeat)
+    finally:
+        sys.stdout = stdout
+        devnull.close()
+
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'git': subprocess.run(['git', '--version'], capture_output=True, text=True).stdout.strip(),
+        'config': {
+            'repos': args.repos,
+            'days': args.days,
+            'commits_per_day': args.commits_per_day,
+            'files_per_commit': args.files_per_commit,
+            'repeat': args.repeat,
+            'workers': args.workers,
+        },
+        'repo_build_time': build_time,
+        'results': results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GitAnalyzer/보고서 파이프라인 성능 측정")
+    parser.add_argument('--repos', type=int, default=3, help="합성 저장소 수")
+    parser.add_argument('--days', type=int, default=30, help="커밋을 만들 일수")
+    parser.add_argument('--commits-per-day', type=int, default=10, help="하루 커밋 수")
+    parser.add_argument('--files-per-commit', type=int, default=5, help="커밋당 변경 파일 수")
+    parser.add_argument('--repeat', type=int, default=3, help="측정 반복 횟수")
+    parser.add_argument('--workers', type=int, default=None, help="GitAnalyzer max_workers")
+    parser.add_argument('--workdir', help="합성 저장소를 만들 경로 (기본: 임시 디렉터리, 종료 시 삭제)")
+    parser.add_argument('--output', help="결과 JSON 파일 경로 (기본: 표준 출력)")
+    parser.add_argument('--startup-budget-ms', type=float, default=300,
+                        help="cli.py 시작 시간 목표(밀리초), 초과하면 종료 코드 1 (기본 300)")
+    parser.add_argument('--startup-only', action='store_true', help="시작 시간만 측정")
+    args = parser.parse_args()
+
+    startup = measure_startup(args.repeat, args.startup_budget_ms)
+
+    if args.startup_only:
+        report = {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'startup': startup,
+        }
+    else:
+        subprocess.Popen = _CountingPopen
+
+        workdir = args.workdir or tempfile.mkdtemp(prefix='cnu_report_bench_')
+        try:
+            report = run_benchmarks(args, workdir)
+        finally:
+            if not args.workdir:
+                shutil.rmtree(workdir, ignore_errors=True)
+        report['startup'] = startup
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + "\n")
+        print(f"✅ 측정 결과 저장: {args.output}")
+    else:
+        print(output)
+
+    if not startup['passed']:
+        print(f"❌ 시작 시간 목표({args.startup_budget_ms:g}ms) 또는 불러오기 부작용 검사를 통과하지 못했습니다.",
+              file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+보고서 작성 통합 명령행 도구
+하위 명령어별로 필요한 모듈만 불러오고, 필요한 환경변수를 실행 전에 한 번에 확인합니다.
+
+사용 예:
+    python cli.py analyze 2025-09-10
+    python cli.py daily 2025-09-10 --dry-run
+    python cli.py weekly 2025-09-12 --hierarchical
+    python cli.py backfill 2025-09-01 2025-09-12
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime
+
+from metrics import add_arguments as add_metrics_arguments, run_instrumented
+from portal_client import has_saved_session
+
+# 하위 명령어별 필수 환경변수 (게시하지 않는 --dry-run은 Gemini 키만 필요)
+GEMINI_ENV = ['GEMINI_API_KEY']
+PORTAL_ENV = ['SESSION_COOKIE', 'STUDENT_SEQ', 'CORP_SEQ', 'CLASS_SEQ', 'LECT_SEQ', 'STUDENT_ID']
+
+
+def date_argument(value):
+    """YYYY-MM-DD 형식 날짜 인자 검증"""
+    try:
+        datetime.strptime(value, '%Y-%m-%d')
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"올바른 날짜 형식이 아닙니다 (YYYY-MM-DD): {value}")
+    return value
+
+
+def required_env(args):
+    """실행할 하위 명령어에 필요한 환경변수 목록"""
+    if args.command == 'analyze':
+        return [] if args.commits_only else GEMINI_ENV
+    if getattr(args, 'dry_run', False):
+        return GEMINI_ENV
+    return GEMINI_ENV + PORTAL_ENV
+
+
+def validate_config(args):
+    """필수 환경변수를 한 번에 확인 (누락 시 목록을 출력하고 False)"""
+    missing = [name for name in required_env(args) if not os.getenv(name)]
+    # 이전 실행에서 저장한 포털 쿠키가 있으면 SESSION_COOKIE 없이도 게시 가능
+    if 'SESSION_COOKIE' in missing and has_saved_session(os.getenv('STUDENT_ID')):
+        missing.remove('SESSION_COOKIE')
+    if missing:
+        print(f"⚠️ 다음 환경변수들이 설정되지 않았습니다: {', '.join(missing)}")
+        print("💡 .env.example 파일을 참고하여 환경변수를 설정해주세요.")
+        return False
+    return True
+
+
+def run_analyze(args):
+    from main import analyze
+    analyze(args.date, commits_only=args.commits_only)
+
+
+def run_daily(args):
+    from daily_post import post_daily
+    post_daily(args.date or datetime.now().strftime('%Y-%m-%d'), dry_run=args.dry_run, force=args.force)
+
+
+def run_weekly(args):
+    from week_post import get_target_date, post_weekly
+    post_weekly(get_target_date(args.date), args.hierarchical, dry_run=args.dry_run, force=args.force)
+
+
+def run_backfill(args):
+    from daily_post import backfill
+    backfill(args.start, args.end, include_weekends=args.include_weekends, max_workers=args.workers,
+             force=args.force)
+
+
+def build_parser():
+    """하위 명령어 파서 생성"""
+    parser = argparse.ArgumentParser(description="CNU 인턴 보고서 자동 작성 도구")
+    add_metrics_arguments(parser)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    analyze = subparsers.add_parser('analyze', help="날짜의 커밋을 분석하고 보고서 미리보기 생성")
+    analyze.add_argument('date', nargs='?', type=date_argument, help="분석할 날짜 (YYYY-MM-DD, 기본값: 입력받음)")
+    analyze.add_argument('--commits-only', action='store_true', help="Gemini 보고서 없이 커밋 정보만 출력")
+    analyze.set_defaults(handler=run_analyze)
+
+    daily = subparsers.add_parser('daily', help="일일 보고서 생성 및 게시")
+    daily.add_argument('date', nargs='?', type=date_argument, help="보고서 날짜 (YYYY-MM-DD, 기본값: 오늘)")
+    daily.add_argument('--dry-run', action='store_true', help="생성 결과만 출력하고 게시하지 않음")
+    daily.add_argument('--force', action='store_true',
+                       help="전송 후 응답을 받지 못한 보고서도 다시 게시 (포털에서 미등록을 확인한 경우)")
+    daily.set_defaults(handler=run_daily)
+
+    weekly = subparsers.add_parser('weekly', help="주간 보고서 생성 및 게시")
+    weekly.add_argument('date', nargs='?', type=date_argument, help="기준 날짜 (YYYY-MM-DD, 기본값: 오늘)")
+    weekly.add_argument('--hierarchical', action='store_true',
+                        help="일일 보고서를 먼저 만들고(캐시 재사용) 이를 요약해 주간 보고서 생성")
+    weekly.add_argument('--dry-run', action='store_true', help="생성 결과만 출력하고 게시하지 않음")
+    weekly.add_argument('--force', action='store_true',
+                        help="전송 후 응답을 받지 못한 보고서도 다시 게시 (포털에서 미등록을 확인한 경우)")
+    weekly.set_defaults(handler=run_weekly)
+
+    backfill = subparsers.add_parser('backfill', help="기간 내 일일 보고서를 한 번에 생성 및 게시")
+    backfill.add_argument('start', type=date_argument, help="시작일 (YYYY-MM-DD)")
+    backfill.add_argument('end', type=date_argument, help="종료일 (YYYY-MM-DD)")
+    backfill.add_argument('--include-weekends', action='store_true', help="주말 포함")
+    backfill.add_argument('--workers', type=int, default=4, help="동시 생성 수 (기본 4)")
+    backfill.add_argument('--force', action='store_true',
+                          help="전송 후 응답을 받지 못한 보고서도 다시 게시 (포털에서 미등록을 확인한 경우)")
+    backfill.set_defaults(handler=run_backfill)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    if not validate_config(args):
+        return 2
+
+    run_instrumented(lambda: args.handler(args), args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+기수 단위 일괄 실행 프로그램
+설정 파일(TOML 또는 YAML)에 적힌 인턴 전원의 일일/주간 보고서를 한 번에 생성하고 게시합니다.
+여러 사용자가 함께 쓰는 저장소는 커밋 색인을 공유해 한 번만 읽고,
+Gemini 호출은 전체 사용자가 하나의 속도 제한(분당 요청 수)을 나눠 씁니다.
+
+사용 예:
+    python cohort.py cohort.toml --date 2025-09-10
+    python cohort.py cohort.toml --week 2025-09-12 --hierarchical
+    python cohort.py cohort.toml --backfill 2025-09-01 2025-09-12
+"""
+
+import argparse
+import os
+import tomllib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import List
+
+from commit_graph import CommitGraph
+from commit_index import CommitIndex
+from daily_post import summarize_commits, post_report, day_collector
+from git_analyzer import GitAnalyzer, has_commits
+from metrics import add_arguments as add_metrics_arguments, run_instrumented
+from pipeline import Pipeline, Stage, Finished
+from portal_client import PortalClient
+from post_ledger import PostLedger
+from rate_limiter import TokenBucket
+from response_cache import ResponseCache
+from week_post import (
+    calculate_week_number, collect_week_commits, summarize_week, post_week_report
+)
+
+# 게시에 필요한 사용자 정보 항목 (설정 파일 키 → 포털 요청 필드)
+STUDENT_FIELDS = {
+    'student_seq': 'seqStu',
+    'corp_seq': 'seqCorp',
+    'class_seq': 'seqClass',
+    'lect_seq': 'seqLect',
+    'student_id': 'id',
+}
+
+
+@dataclass
+class CohortUser:
+    """설정 파일의 사용자 한 명"""
+    name: str
+    author: str
+    repositories: List[str]
+    student_info: dict
+    session_cookie: str = field(repr=False)
+
+
+@dataclass
+class CohortConfig:
+    """일괄 실행 설정"""
+    users: List[CohortUser]
+    workers: int = 8
+    collect_workers: int = 4
+    post_workers: int = 4
+    gemini_rpm: float = 15
+    include_weekends: bool = False
+    all_refs: bool = False
+    force: bool = False  # 전송 후 응답을 받지 못한 보고서도 다시 게시 (명령행 --force)
+
+
+def _read_config_file(path):
+    """TOML 또는 YAML 설정 파일 읽기 (YAML은 PyYAML이 설치된 경우에만)"""
+    if path.endswith(('.yaml', '.yml')):
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError("YAML 설정 파일을 읽으려면 PyYAML이 필요합니다 (pip install pyyaml). TOML 형식을 사용할 수도 있습니다.")
+        with open(path, encoding='utf-8') as f:
+            return yaml.safe_load(f) or {}
+
+    with open(path, 'rb') as f:
+        return tomllib.load(f)
+
+
+def load_config(path):
+    """설정 파일을 읽어 CohortConfig로 변환
+
+    사용자별 session_cookie 대신 session_cookie_env에 환경변수 이름을 적으면 그 값을 사용합니다
+    (설정 파일에 쿠키를 직접 저장하지 않기 위함).
+    사용자 이름과 학번은 사용자마다 달라야 합니다 (같으면 다른 사람의 세션으로 게시될 수 있음).
+    """
+    raw = _read_config_file(path)
+    defaults = raw.get('defaults', {})
+
+    users = []
+    for index, entry in enumerate(raw.get('users', [])):
+        name = entry.get('name') or f"user{index + 1}"
+
+        missing = [key for key in ('author', 'repositories', *STUDENT_FIELDS) if not entry.get(key)]
+        cookie = entry.get('session_cookie') or os.getenv(entry.get('session_cookie_env', ''), '')
+        if not cookie:
+            missing.append('session_cookie')
+        if missing:
+            raise ValueError(f"{name}: 설정 항목이 누락되었습니다: {', '.join(missing)}")
+
+        users.append(CohortUser(
+            name=name,
+            author=entry['author'],
+            repositories=[os.path.expanduser(repo) for repo in entry['repositories']],
+            student_info={field_name: str(entry[key]) for key, field_name in STUDENT_FIELDS.items()},
+            session_cookie=cookie,
+        ))
+
+    if not users:
+        raise ValueError("설정 파일에 사용자가 없습니다.")
+
+    for label, values in (("사용자 이름", [user.name for user in users]),
+                          ("student_id", [user.student_info['id'] for user in users])):
+        duplicates = sorted({value for value in values if values.count(value) > 1})
+        if duplicates:
+            raise ValueError(f"중복된 {label}이 있습니다: {', '.join(duplicates)}")
+
+    return CohortConfig(
+        users=users,
+        workers=int(defaults.get('workers', 8)),
+        collect_workers=int(defaults.get('collect_workers', 4)),
+        post_workers=int(defaults.get('post_workers', 4)),
+        gemini_rpm=float(defaults.get('gemini_rpm', os.getenv('GEMINI_RPM', 15))),
+        include_weekends=bool(defaults.get('include_weekends', False)),
+        all_refs=bool(defaults.get('all_refs', False)),
+    )
+
+
+class CohortRunner:
+    """전체 사용자의 보고서를 수집 → 생성 → 게시 파이프라인으로 동시에 처리하는 클래스"""
+
+    def __init__(self, config):
+        """
+        Args:
+            config: CohortConfig
+        """
+        self.config = config
+        # 모든 사용자가 공유하는 상태 (같은 저장소는 한 번만 색인, Gemini 분당 요청 수는 전체 합산으로 제한)
+        self.index = CommitIndex()
+        # 병합되지 않은 브랜치까지 모으는 경우 저장소별 커밋 그래프도 모든 사용자가 공유
+        self.graph = CommitGraph() if config.all_refs else None
+        self.ledger = PostLedger()
+        # requests를 불러오는 Gemini 클라이언트는 실제로 실행할 때만 불러옴
+        from gemini_client import GeminiAPI
+        self.gemini = GeminiAPI(
+            cache=ResponseCache(),
+            pool_size=config.workers,
+            rate_limiter=TokenBucket(config.gemini_rpm),
+        )
+
+    def close(self):
+        """연결 정리"""
+        self.gemini.close()
+        self.index.close()
+        if self.graph is not None:
+            self.graph.close()
+        self.ledger.close()
+
+    def _analyzer(self, user):
+        # 사용자 단위로 이미 동시에 수집하므로 저장소는 순서대로 읽음
+        return GitAnalyzer(user.repositories, max_workers=1, index=self.index, graph=self.graph)
+
+    def _run_pipeline(self, kind, jobs, collect, generate, post):
+        """이미 등록된 보고서를 건너뛰고 수집 → 생성 → 게시
+
+        git 수집, Gemini 생성, 포털 게시는 단계별 동시 실행 수를 따로 두어,
+        한 사용자의 보고서를 생성하는 동안 다른 사용자의 커밋을 수집하고 앞선 보고서를 게시합니다.
+        포털 세션이 만료된 사용자는 시작 전에 확인해 수집/생성 없이 건너뜁니다.
+
+        Args:
+            kind: 게시판 종류 ("Day"/"Week")
+            jobs: (CohortUser, 키) 리스트 (게시 순서)
+            collect: (사용자, 키) → 수집 결과 (커밋이 없으면 None)
+            generate: (사용자, 키, 수집 결과) → (제목, 내용), 생성에 실패하면 None
+            post: (PortalClient, 사용자, 키, 제목, 내용) → insertResult
+
+        Returns:
+            (사용자 이름, 종류, 키, 상태) 리스트
+        """
+        import requests
+
+        def collect_stage(job):
+            user, key = job
+            if not valid[user.student_info['id']]:
+                return Finished("세션 만료")
+            if self.ledger.check(user.student_info['id'], kind, key, self.config.force):
+                return Finished("이미 등록")
+            data = collect(user, key)
+            if data is None:
+                return Finished("커밋 없음")
+            return user, key, data
+
+        def generate_stage(item):
+            user, key, data = item
+            report = generate(user, key, data)
+            # 생성에 실패하면 게시하지 않음 (게시 기록이 남지 않으므로 다음 실행에서 다시 생성)
+            if report is None:
+                print(f"✗ [{user.name}] {key} 보고서 생성에 실패해 게시하지 않습니다.")
+                return Finished("실패")
+            return user, key, report
+
+        def post_stage(item):
+            user, key, (subject, contents) = item
+            try:
+                insert_result = post(clients[user.student_info['id']], user, key, subject, contents)
+            except requests.exceptions.RequestException as e:
+                print(f"✗ [{user.name}] 게시 요청 실패: {e}")
+                return "실패"
+            return "성공" if insert_result > 0 else "실패"
+
+        pipeline = Pipeline([
+            Stage('collect', collect_stage, workers=self.config.collect_workers),
+            Stage('generate', generate_stage, workers=self.config.workers),
+            # 같은 사용자의 보고서는 하나씩 날짜순으로 게시하고, 다른 사용자끼리만 동시에 게시
+            Stage('post', post_stage, workers=self.config.post_workers, ordered=True,
+                  key=lambda item: item[0].student_info['id']),
+        ], name=f"cohort-{kind}")
+
+        # 세션은 학번 단위 (쿠키 저장소의 key와 같은 기준)
+        clients = {
+            user.student_info['id']: PortalClient(user.session_cookie, key=user.student_info['id'],
+                                                  pool_size=self.config.post_workers)
+            for user in self.config.users
+        }
+        try:
+            with ThreadPoolExecutor(max_workers=self.config.post_workers) as executor:
+                valid = dict(zip(clients, executor.map(lambda client: client.preflight(), clients.values())))
+            statuses = pipeline.run(jobs)
+        finally:
+            for client in clients.values():
+                client.close()
+        pipeline.print_stats()
+
+        return [
+            (user.name, kind, key, f"오류: {status}" if isinstance(status, Exception) else status)
+            for (user, key), status in zip(jobs, statuses)
+        ]
+
+    def run_days(self, start_date, end_date):
+        """전체 사용자의 기간 내 일일 보고서 생성/게시 (사용자별 히스토리는 주 단위로 한 번만 순회)"""
+        start = datetime.strptime(start_date, '%Y-%m-%d')
+        end = datetime.strptime(end_date, '%Y-%m-%d')
+        days = [
+            (start + timedelta(days=i)).strftime('%Y-%m-%d')
+            for i in range((end - start).days + 1)
+            # 날짜 하나를 지정한 경우는 주말이어도 실행
+            if self.config.include_weekends or start == end or (start + timedelta(days=i)).weekday() < 5
+        ]
+
+        collectors = {
+            user.name: day_collector(self._analyzer(user), user.author, days) for user in self.config.users
+        }
+
+        def collect(user, day):
+            results = collectors[user.name](day)
+            return results if has_commits(results) else None
+
+        def generate(user, day, results):
+            return summarize_commits(self.gemini, results, day)
+
+        def post(client, user, day, subject, contents):
+            return post_report(client, user.student_info, day, subject, contents, self.ledger)
+
+        # 날짜 순서로 나열해 같은 날짜의 여러 사용자를 동시에 처리
+        jobs = [(user, day) for day in days for user in self.config.users]
+        return self._run_pipeline("Day", jobs, collect, generate, post)
+
+    def run_week(self, target_date, hierarchical=False):
+        """전체 사용자의 주간 보고서 생성/게시"""
+        target = datetime.strptime(target_date, '%Y-%m-%d')
+        analyzers = {user.name: self._analyzer(user) for user in self.config.users}
+
+        def collect(user, week_number):
+            results = collect_week_commits(analyzers[user.name], target, user.author)
+            return results if has_commits(results) else None
+
+        def generate(user, week_number, results):
+            # 수집 단계의 결과를 그대로 사용 (히스토리를 다시 순회하지 않음)
+            return summarize_week(self.gemini, analyzers[user.name], results, target, hierarchical)
+
+        def post(client, user, week_number, subject, contents):
+            return post_week_report(client, user.student_info, week_number, subject, contents, self.ledger)
+
+        jobs = [(user, calculate_week_number(target)) for user in self.config.users]
+        return self._run_pipeline("Week", jobs, collect, generate, post)
+
+
+def print_summary(rows):
+    """사용자별 결과 요약 출력"""
+    print("\n📋 일괄 실행 결과")
+    print("=" * 50)
+    print(f"{'사용자':<14}{'종류':<6}{'대상':<12}상태")
+    for name, kind, key, status in rows:
+        print(f"{name:<14}{kind:<6}{key:<12}{status}")
+
+    succeeded = sum(1 for row in rows if row[3] == "성공")
+    failed = sum(1 for row in rows if row[3] in ("실패", "세션 만료") or row[3].startswith("오류"))
+    print(f"\n✓ 성공 {succeeded}건, 실패 {failed}건")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="기수 전체 보고서 일괄 생성 및 게시")
+    parser.add_argument('config', help="사용자 설정 파일 (.toml 또는 .yaml)")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--date', help="일일 보고서 날짜 (YYYY-MM-DD, 기본값: 오늘)")
+    group.add_argument('--week', metavar='DATE', help="이 날짜 기준 주간 보고서 (YYYY-MM-DD)")
+    group.add_argument('--backfill', nargs=2, metavar=('START', 'END'),
+                       help="START ~ END (YYYY-MM-DD) 기간의 일일 보고서")
+    parser.add_argument('--hierarchical', action='store_true', help="주간 보고서를 일일 보고서 요약으로 생성")
+    parser.add_argument('--workers', type=int, help="동시에 생성할 보고서 수 (설정 파일 값보다 우선)")
+    parser.add_argument('--force', action='store_true',
+                        help="전송 후 응답을 받지 못한 보고서도 다시 게시 (포털에서 미등록을 확인한 경우)")
+    add_metrics_arguments(parser)
+    args = parser.parse_args()
+
+    try:
+        for value in [args.date, args.week, *(args.backfill or [])]:
+            if value:
+                datetime.strptime(value, '%Y-%m-%d')
+    except ValueError:
+        print("올바른 날짜 형식을 입력해주세요 (YYYY-MM-DD)")
+        return
+
+    config = load_config(args.config)
+    if args.workers:
+        config.workers = args.workers
+    config.force = args.force
+
+    def run():
+        runner = CohortRunner(config)
+        print(f"👥 사용자 {len(config.users)}명 처리 시작 (수집 {config.collect_workers}, 생성 {config.workers}, "
+              f"게시 {config.post_workers} 동시, Gemini 분당 {config.gemini_rpm:g}회)")
+        try:
+            if args.week:
+                rows = runner.run_week(args.week, args.hierarchical)
+            elif args.backfill:
+                rows = runner.run_days(*args.backfill)
+            else:
+                date = args.date or datetime.now().strftime('%Y-%m-%d')
+                rows = runner.run_days(date, date)
+        finally:
+            runner.close()
+
+        print_summary(rows)
+
+    run_instrumented(run, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,399 @@
+"""
+커밋 그래프 캐시 모듈
+HEAD뿐 아니라 모든 브랜치(refs/heads, refs/remotes, refs/tags)에서 도달 가능한 커밋의
+부모 관계, 작성자 ID, 작성/커밋 시각을 압축 배열로 SQLite에 저장합니다.
+참조별 끝 커밋을 기록해 두고 바뀐 참조의 새 커밋만 읽으며,
+작성자/기간 조회는 히스토리를 다시 순회하지 않고 시각 정렬 배열과 작성자 ID로 처리합니다.
+여러 브랜치에서 도달 가능한 커밋도 그래프에는 한 번만 저장되므로 자동으로 중복 제거됩니다.
+"""
+
+import json
+import os
+import sqlite3
+import subprocess
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+
+from commit_index import MAX_TIMESTAMP, read_head
+from git_analyzer import FIELD_SEP, author_matcher, iter_git_output, to_timestamp
+from metrics import metrics
+
+DEFAULT_GRAPH_PATH = os.path.join(
+    os.path.expanduser('~'), '.cache', 'cnu_report', 'commit_graph.sqlite3'
+)
+
+# 그래프에 포함할 참조 (stash, notes 등 작업 브랜치가 아닌 참조는 제외)
+REF_PREFIXES = ('refs/heads/', 'refs/remotes/', 'refs/tags/')
+
+# 그래프 구성용 git log 형식 (해시, 부모 해시들, 작성자, 이메일, 작성 시각, 커밋 시각)
+GRAPH_FORMAT = '%H%x1f%P%x1f%an%x1f%ae%x1f%at%x1f%ct'
+
+# 되감긴 참조 판단 시 커밋 시각 역전(시계 오차)을 허용할 범위(초)
+CLOCK_SKEW = 24 * 60 * 60
+
+# 도달할 수 없게 된 커밋(삭제/강제 푸시된 브랜치)이 이 비율을 넘으면 그래프를 새로 만듦
+COMPACT_RATIO = 0.5
+COMPACT_MIN_COMMITS = 1000
+
+# 저장 형식이 바뀌면 올려서 기존 캐시를 다시 만들도록 함
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS graphs (
+    repo TEXT PRIMARY KEY,
+    refs TEXT NOT NULL,
+    authors TEXT NOT NULL,
+    shas BLOB NOT NULL,
+    parent_offsets BLOB NOT NULL,
+    parents BLOB NOT NULL,
+    author_ids BLOB NOT NULL,
+    author_times BLOB NOT NULL,
+    commit_times BLOB NOT NULL,
+    reachable BLOB NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+def _array(typecode, data=b''):
+    values = array(typecode)
+    values.frombytes(data)
+    return values
+
+
+class RepoGraph:
+    """저장소 하나의 커밋 그래프
+
+    커밋 i의 해시는 shas[20*i:20*i+20], 부모 번호는 parents[parent_offsets[i]:parent_offsets[i+1]]에 있고
+    작성자는 authors[author_ids[i]]입니다.
+    """
+
+    def __init__(self):
+        self.refs = {}
+        self.authors = []
+        self.shas = bytearray()
+        self.parent_offsets = array('i', [0])
+        self.parents = array('i')
+        self.author_ids = array('i')
+        self.author_times = array('q')
+        self.commit_times = array('q')
+        # 현재 참조 중 하나에서라도 도달 가능한 커밋이면 1
+        self.reachable = bytearray()
+        self._positions = None
+        self._author_positions = None
+        self._order = None
+
+    def __len__(self):
+        return len(self.commit_times)
+
+    @classmethod
+    def from_row(cls, row):
+        refs, authors, shas, parent_offsets, parents, author_ids, author_times, commit_times, reachable = row
+        graph = cls()
+        graph.refs = json.loads(refs)
+        graph.authors = [tuple(author) for author in json.loads(authors)]
+        graph.shas = bytearray(shas)
+        graph.parent_offsets = _array('i', parent_offsets)
+        graph.parents = _array('i', parents)
+        graph.author_ids = _array('i', author_ids)
+        graph.author_times = _array('q', author_times)
+        graph.commit_times = _array('q', commit_times)
+        graph.reachable = bytearray(reachable)
+        return graph
+
+    def to_row(self):
+        return (
+            json.dumps(self.refs), json.dumps(self.authors, ensure_ascii=False), bytes(self.shas),
+            self.parent_offsets.tobytes(), self.parents.tobytes(), self.author_ids.tobytes(),
+            self.author_times.tobytes(), self.commit_times.tobytes(), bytes(self.reachable),
+        )
+
+    @property
+    def positions(self):
+        """커밋 해시(16진수) → 번호"""
+        if self._positions is None:
+            shas = self.shas
+            self._positions = {shas[20 * i:20 * i + 20].hex(): i for i in range(len(self))}
+        return self._positions
+
+    @property
+    def order(self):
+        """커밋 시각 순으로 정렬한 커밋 번호 (기간 조회용)"""
+        if self._order is None:
+            self._order = array('i', sorted(range(len(self)), key=self.commit_times.__getitem__))
+        return self._order
+
+    def sha(self, i):
+        return self.shas[20 * i:20 * i + 20].hex()
+
+    def parents_of(self, i):
+        return self.parents[self.parent_offsets[i]:self.parent_offsets[i + 1]]
+
+    def _author_id(self, name, email):
+        if self._author_positions is None:
+            self._author_positions = {author: i for i, author in enumerate(self.authors)}
+        author = (name, email)
+        author_id = self._author_positions.get(author)
+        if author_id is None:
+            author_id = self._author_positions[author] = len(self.authors)
+            self.authors.append(author)
+        return author_id
+
+    def add_commits(self, records):
+        """새 커밋 추가 (부모가 같은 묶음 안에 나중에 나와도 됨)
+
+        Args:
+            records: (해시, 부모 해시 리스트, 작성자, 이메일, 작성 시각, 커밋 시각) 리스트
+
+        Returns:
+            추가한 커밋 수
+        """
+        positions = self.positions
+        new_records = [record for record in records if record[0] not in positions]
+        for record in new_records:
+            positions[record[0]] = len(positions)
+
+        for sha, parent_shas, name, email, author_time, commit_time in new_records:
+            self.shas += bytes.fromhex(sha)
+            # 얕은 복제(shallow) 경계 밖의 부모는 그래프에 없으므로 제외
+            self.parents.extend(positions[parent] for parent in parent_shas if parent in positions)
+            self.parent_offsets.append(len(self.parents))
+            self.author_ids.append(self._author_id(name, email))
+            self.author_times.append(author_time)
+            self.commit_times.append(commit_time)
+
+        self.reachable.extend(bytes(len(new_records)))
+        self._order = None
+        return len(new_records)
+
+    def mark_reachable(self, tips):
+        """tips에서 도달 가능한 커밋 표시 (이미 표시된 커밋에서 멈추므로 전진한 참조는 새 커밋만 순회)"""
+        reachable = self.reachable
+        stack = [tip for tip in tips if not reachable[tip]]
+        while stack:
+            i = stack.pop()
+            if reachable[i]:
+                continue
+            reachable[i] = 1
+            stack.extend(parent for parent in self.parents_of(i) if not reachable[parent])
+
+    def recompute_reachable(self):
+        """현재 참조 전체 기준으로 도달 가능 여부 다시 계산"""
+        positions = self.positions
+        self.reachable = bytearray(len(self))
+        self.mark_reachable([positions[sha] for sha in self.refs.values() if sha in positions])
+
+    def is_ancestor(self, old, new):
+        """old 커밋이 new 커밋의 조상인지 확인 (old보다 충분히 오래된 커밋에서는 탐색 중단)"""
+        limit = self.commit_times[old] - CLOCK_SKEW
+        seen = {new}
+        stack = [new]
+        while stack:
+            i = stack.pop()
+            if i == old:
+                return True
+            for parent in self.parents_of(i):
+                if parent not in seen and self.commit_times[parent] >= limit:
+                    seen.add(parent)
+                    stack.append(parent)
+        return False
+
+    def unreachable_count(self):
+        return len(self) - sum(self.reachable)
+
+    def query(self, since, until, author_ids=None):
+        """기간 내 도달 가능한 커밋 번호를 최신순으로 조회
+
+        Args:
+            since: 시작 시각 (유닉스 시간, 커밋 시각 기준)
+            until: 종료 시각 (유닉스 시간)
+            author_ids: 포함할 작성자 ID 집합 (None이면 전체)
+        """
+        order = self.order
+        key = self.commit_times.__getitem__
+        low = bisect_left(order, since, key=key)
+        high = bisect_right(order, until, key=key)
+
+        return [
+            i for i in reversed(order[low:high])
+            if self.reachable[i] and (author_ids is None or self.author_ids[i] in author_ids)
+        ]
+
+
+class CommitGraph:
+    """저장소별 커밋 그래프 캐시 클래스"""
+
+    def __init__(self, path=None):
+        """
+        Args:
+            path: 캐시 파일 경로 (없으면 COMMIT_GRAPH_PATH 환경변수 또는 기본 캐시 경로)
+        """
+        self.path = path or os.getenv('COMMIT_GRAPH_PATH') or DEFAULT_GRAPH_PATH
+        if self.path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+        self._lock = threading.Lock()
+        # 같은 저장소를 여러 스레드가 동시에 갱신하면 한 번만 읽도록 저장소별 잠금 사용
+        self._repo_locks = {}
+        # 한 번 읽은 그래프는 메모리에 유지 (스케줄러 등 오래 실행되는 프로세스에서 재사용)
+        self._graphs = {}
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+
+        version = self._conn.execute('PRAGMA user_version').fetchone()[0]
+        if version != SCHEMA_VERSION:
+            self._conn.execute('DROP TABLE IF EXISTS graphs')
+            self._conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        """캐시 파일 닫기"""
+        with self._lock:
+            self._conn.close()
+
+    def _repo_lock(self, repo):
+        with self._lock:
+            return self._repo_locks.setdefault(repo, threading.Lock())
+
+    def _load(self, repo):
+        graph = self._graphs.get(repo)
+        if graph is not None:
+            return graph
+
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT refs, authors, shas, parent_offsets, parents, author_ids, author_times, commit_times, '
+                'reachable FROM graphs WHERE repo = ?', (repo,)
+            ).fetchone()
+        graph = RepoGraph.from_row(row) if row else RepoGraph()
+        self._graphs[repo] = graph
+        return graph
+
+    def _save(self, repo, graph):
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO graphs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (repo, *graph.to_row(), datetime.now().timestamp())
+            )
+
+    def read_refs(self, repo_path, timeout=None):
+        """저장소의 브랜치/태그/HEAD가 가리키는 커밋 {참조 이름: 해시}"""
+        cmd = ['git', '-C', repo_path, 'for-each-ref',
+               '--format=%(objecttype) %(objectname) %(*objecttype) %(*objectname) %(refname)',
+               *(prefix.rstrip('/') for prefix in REF_PREFIXES)]
+
+        refs = {}
+        for line in iter_git_output(cmd, timeout=timeout):
+            parts = line.rstrip('\n').split(' ', 4)
+            if len(parts) != 5:
+                continue
+            object_type, sha, peeled_type, peeled_sha, ref = parts
+            # 주석 태그는 가리키는 커밋으로 (커밋이 아닌 객체를 가리키는 참조는 제외)
+            if object_type == 'commit':
+                refs[ref] = sha
+            elif peeled_type == 'commit':
+                refs[ref] = peeled_sha
+
+        head = read_head(repo_path)
+        if not head:
+            with metrics.span('git_subprocess', command='rev-parse'):
+                result = subprocess.run(
+                    ['git', '-C', repo_path, 'rev-parse', '--verify', '-q', 'HEAD^{commit}'],
+                    capture_output=True, text=True, timeout=timeout
+                )
+            head = result.stdout.strip()
+        if head:
+            refs['HEAD'] = head
+
+        return refs
+
+    def _read_commits(self, repo_path, tips, exclude, timeout=None):
+        """tips에서 도달 가능하고 exclude에서는 도달할 수 없는 커밋의 그래프 정보 읽기"""
+        cmd = ['git', '-C', repo_path, 'log', f'--format={GRAPH_FORMAT}', '--stdin']
+        revisions = "".join(f"{sha}\n" for sha in tips) + "".join(f"^{sha}\n" for sha in exclude)
+
+        records = []
+        for line in iter_git_output(cmd, timeout=timeout, input=revisions):
+            parts = line.rstrip('\n').split(FIELD_SEP)
+            if len(parts) != 6:
+                continue
+            sha, parents, name, email, author_time, commit_time = parts
+            records.append((sha, parents.split(), name, email, int(author_time), int(commit_time)))
+        return records
+
+    def update(self, repo_path, timeout=None):
+        """바뀐 참조의 새 커밋만 그래프에 추가
+
+        전진한 참조는 새 커밋만 도달 가능으로 표시하고,
+        삭제되거나 되감긴(강제 푸시, rebase) 참조가 있으면 도달 가능 여부를 전체 다시 계산합니다.
+
+        Returns:
+            새로 추가한 커밋 수
+        """
+        repo = os.path.abspath(repo_path)
+        with self._repo_lock(repo):
+            refs = self.read_refs(repo_path, timeout)
+            graph = self._load(repo)
+            if refs == graph.refs:
+                return 0
+
+            positions = graph.positions
+            new_tips = sorted({sha for sha in refs.values() if sha not in positions})
+            added = 0
+            if new_tips:
+                known_tips = sorted({sha for sha in graph.refs.values() if sha in positions})
+                added = graph.add_commits(self._read_commits(repo_path, new_tips, known_tips, timeout))
+                metrics.increment('commit_graph_commits_added', added)
+
+            changed = {ref for ref in refs.keys() | graph.refs.keys() if refs.get(ref) != graph.refs.get(ref)}
+            rewound = any(
+                ref not in refs or (
+                    ref in graph.refs and graph.refs[ref] in positions
+                    and not graph.is_ancestor(positions[graph.refs[ref]], positions[refs[ref]])
+                )
+                for ref in changed
+            )
+
+            graph.refs = refs
+            if rewound:
+                metrics.increment('commit_graph_recompute')
+                graph.recompute_reachable()
+                if len(graph) >= COMPACT_MIN_COMMITS and graph.unreachable_count() > len(graph) * COMPACT_RATIO:
+                    # 버려진 커밋이 많으면 현재 참조 기준으로 새로 구성
+                    graph = self._graphs[repo] = RepoGraph()
+                    graph.add_commits(self._read_commits(repo_path, sorted(set(refs.values())), [], timeout))
+                    graph.refs = refs
+                    graph.recompute_reachable()
+            else:
+                graph.mark_reachable([positions[refs[ref]] for ref in changed])
+
+            self._save(repo, graph)
+            return added
+
+    def query(self, repo_path, since, until, author=None):
+        """모든 참조에서 도달 가능한 기간 내 커밋 해시 조회 (git log --since/--until과 같이 커밋 시각 기준)
+
+        Args:
+            repo_path: 저장소 경로
+            since: 시작 시각 ('YYYY-MM-DD HH:MM:SS')
+            until: 종료 시각 ('YYYY-MM-DD HH:MM:SS', None이면 제한 없음)
+            author: 작성자 필터 (git --author와 같은 정규식)
+
+        Returns:
+            커밋 시각 최신순 커밋 해시 리스트
+        """
+        repo = os.path.abspath(repo_path)
+        with self._repo_lock(repo):
+            graph = self._load(repo)
+
+            # 작성자 정규식은 커밋마다가 아니라 서로 다른 작성자마다 한 번만 검사
+            author_ids = None
+            if author:
+                matches_author = author_matcher(author)
+                author_ids = {i for i, (name, email) in enumerate(graph.authors) if matches_author(name, email)}
+                if not author_ids:
+                    return []
+
+            until_timestamp = to_timestamp(until) if until else MAX_TIMESTAMP
+            return [graph.sha(i) for i in graph.query(to_timestamp(since), until_timestamp, author_ids)]
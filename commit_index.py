@@ -0,0 +1,259 @@
+"""
+커밋 색인 모듈
+저장소별 커밋 정보를 SQLite에 증분 색인하여 날짜 조회 시 git 히스토리를 다시 순회하지 않도록 합니다.
+"""
+
+import json
+import os
+import sqlite3
+import subprocess
+import threading
+from datetime import datetime
+
+from metrics import metrics
+from git_analyzer import (
+    LOG_FORMAT, Commit, FileChange, author_matcher, iter_git_output, parse_git_log, to_timestamp
+)
+
+# 전체 히스토리 색인 시 한 번에 기록할 커밋 수 (메모리 사용량 제한)
+INSERT_BATCH_SIZE = 1000
+
+DEFAULT_INDEX_PATH = os.path.join(
+    os.path.expanduser('~'), '.cache', 'cnu_report', 'commit_index.sqlite3'
+)
+
+# 종료 시각을 지정하지 않은 조회의 상한
+MAX_TIMESTAMP = 2 ** 62
+
+# 저장 형식이 바뀌면 올려서 기존 색인을 다시 만들도록 함
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS repos (
+    repo TEXT PRIMARY KEY,
+    head TEXT NOT NULL,
+    indexed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS commits (
+    repo TEXT NOT NULL,
+    full_hash TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    author TEXT NOT NULL,
+    email TEXT NOT NULL,
+    date TEXT NOT NULL,
+    refs TEXT NOT NULL,
+    author_time INTEGER NOT NULL,
+    commit_time INTEGER NOT NULL,
+    files TEXT NOT NULL,
+    PRIMARY KEY (repo, full_hash)
+);
+CREATE INDEX IF NOT EXISTS commits_by_time ON commits (repo, commit_time);
+"""
+
+
+def read_head(repo_path):
+    """.git 디렉터리를 직접 읽어 HEAD 커밋 해시 확인 (git 프로세스 실행 없이)
+
+    Returns:
+        HEAD 커밋 해시 (직접 읽을 수 없는 구조면 None)
+    """
+    git_dir = os.path.join(repo_path, '.git')
+    if not os.path.isdir(git_dir):
+        # 워크트리/서브모듈 등은 git rev-parse로 처리
+        return None
+
+    try:
+        with open(os.path.join(git_dir, 'HEAD')) as f:
+            head = f.read().strip()
+
+        if not head.startswith('ref: '):
+            return head
+
+        ref = head[len('ref: '):]
+        ref_path = os.path.join(git_dir, ref)
+        if os.path.exists(ref_path):
+            with open(ref_path) as f:
+                return f.read().strip()
+
+        packed_refs = os.path.join(git_dir, 'packed-refs')
+        if os.path.exists(packed_refs):
+            with open(packed_refs) as f:
+                for line in f:
+                    if line.rstrip('\n').endswith(f' {ref}'):
+                        return line.split(' ', 1)[0]
+    except OSError:
+        pass
+
+    return None
+
+
+class CommitIndex:
+    """저장소별 커밋 증분 색인 클래스"""
+
+    def __init__(self, path=None):
+        """
+        Args:
+            path: 색인 파일 경로 (없으면 COMMIT_INDEX_PATH 환경변수 또는 기본 캐시 경로)
+        """
+        self.path = path or os.getenv('COMMIT_INDEX_PATH') or DEFAULT_INDEX_PATH
+        if self.path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+        # GitAnalyzer가 여러 스레드에서 동시에 사용하므로 연결 하나를 잠금으로 보호
+        self._lock = threading.Lock()
+        # 여러 사용자가 같은 저장소를 동시에 갱신하면 한 번만 읽도록 저장소별 잠금 사용
+        self._repo_locks = {}
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+
+        version = self._conn.execute('PRAGMA user_version').fetchone()[0]
+        if version != SCHEMA_VERSION:
+            self._conn.executescript('DROP TABLE IF EXISTS commits; DROP TABLE IF EXISTS repos;')
+            self._conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        """색인 파일 닫기"""
+        with self._lock:
+            self._conn.close()
+
+    def _resolve_head(self, repo_path, timeout=None):
+        """저장소의 현재 HEAD 해시 확인"""
+        head = read_head(repo_path)
+        if head:
+            return head
+
+        with metrics.span('git_subprocess', command='rev-parse'):
+            result = subprocess.run(
+                ['git', '-C', repo_path, 'rev-parse', '--verify', '-q', 'HEAD'],
+                capture_output=True,
+                text=True,
+                timeout=timeout
+            )
+        # 커밋이 하나도 없는 저장소는 빈 HEAD로 취급
+        return result.stdout.strip()
+
+    def _indexed_head(self, repo):
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT head FROM repos WHERE repo = ?', (repo,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def update(self, repo_path, timeout=None):
+        """저장소 HEAD가 바뀐 경우 마지막 색인 이후의 커밋만 추가 색인
+
+        Args:
+            repo_path: 저장소 경로
+            timeout: git 명령어 제한 시간(초)
+
+        Returns:
+            새로 색인한 커밋 수
+        """
+        repo = os.path.abspath(repo_path)
+        with self._lock:
+            repo_lock = self._repo_locks.setdefault(repo, threading.Lock())
+
+        with repo_lock:
+            return self._update(repo, repo_path, timeout)
+
+    def _update(self, repo, repo_path, timeout=None):
+        head = self._resolve_head(repo_path, timeout)
+        last_head = self._indexed_head(repo)
+
+        if head == last_head:
+            return 0
+
+        revisions = [head] if head else []
+        rebuild = True
+        if head and last_head:
+            # 이전 HEAD가 새 HEAD의 조상이면 그 사이의 커밋만 읽음 (rebase 등으로 히스토리가 바뀌면 전체 재색인)
+            with metrics.span('git_subprocess', command='merge-base'):
+                ancestor = subprocess.run(
+                    ['git', '-C', repo_path, 'merge-base', '--is-ancestor', last_head, head],
+                    capture_output=True,
+                    timeout=timeout
+                )
+            if ancestor.returncode == 0:
+                revisions = [f'{last_head}..{head}']
+                rebuild = False
+
+        if rebuild:
+            with self._lock, self._conn:
+                self._conn.execute('DELETE FROM commits WHERE repo = ?', (repo,))
+
+        # git log 출력을 스트리밍으로 읽으며 일정 개수씩 기록
+        # (중간에 실패하면 HEAD를 기록하지 않으므로 다음 갱신 때 다시 읽음)
+        indexed = 0
+        batch = []
+        if revisions:
+            cmd = ['git', '-C', repo_path, 'log', f'--pretty=format:{LOG_FORMAT}',
+                   '--date=short', '--numstat', *revisions, '--']
+            for c in parse_git_log(iter_git_output(cmd, timeout=timeout)):
+                batch.append((
+                    repo, c.full_hash, c.hash, c.subject, c.author, c.email, c.date, c.refs,
+                    c.timestamp, c.commit_timestamp,
+                    json.dumps([(f.path, f.added, f.deleted) for f in c.files])
+                ))
+                if len(batch) >= INSERT_BATCH_SIZE:
+                    indexed += self._insert(batch)
+                    batch = []
+
+        indexed += self._insert(batch)
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO repos VALUES (?, ?, ?)',
+                (repo, head, datetime.now().timestamp())
+            )
+
+        return indexed
+
+    def _insert(self, rows):
+        with self._lock, self._conn:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO commits VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', rows
+            )
+        return len(rows)
+
+    def query(self, repo_path, since, until, author=None):
+        """색인에서 기간 내 커밋 조회 (git log --since/--until과 같이 커밋 시각 기준)
+
+        Args:
+            repo_path: 저장소 경로
+            since: 시작 시각 ('YYYY-MM-DD HH:MM:SS')
+            until: 종료 시각 ('YYYY-MM-DD HH:MM:SS', None이면 제한 없음)
+            author: 작성자 필터 (git --author와 같은 정규식)
+
+        Returns:
+            git log 순서(최신순)의 Commit 리스트
+        """
+        until_timestamp = to_timestamp(until) if until else MAX_TIMESTAMP
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT hash, subject, author, date, refs, full_hash, email, author_time, commit_time, files '
+                'FROM commits WHERE repo = ? AND commit_time BETWEEN ? AND ? '
+                'ORDER BY commit_time DESC, rowid ASC',
+                (os.path.abspath(repo_path), to_timestamp(since), until_timestamp)
+            ).fetchall()
+
+        matches_author = author_matcher(author)
+
+        commits = []
+        for short, subject, name, date, refs, full_hash, email, author_time, commit_time, files in rows:
+            if not matches_author(name, email):
+                continue
+            commits.append(Commit(
+                hash=short,
+                subject=subject,
+                author=name,
+                timestamp=author_time,
+                refs=refs,
+                files=[FileChange(*f) for f in json.loads(files)],
+                date=date,
+                full_hash=full_hash,
+                email=email,
+                commit_timestamp=commit_time,
+            ))
+
+        return commits
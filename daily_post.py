@@ -1,19 +1,24 @@
-import requests
 import json
-from datetime import datetime
+import argparse
+import threading
+from datetime import datetime, timedelta
 import os
-from gemini_client import GeminiAPI
-from git_analyzer import GitAnalyzer
+from response_cache import ResponseCache
+from git_analyzer import GitAnalyzer, has_commits
+from commit_index import CommitIndex
+from post_ledger import PostLedger
+from prompt_budget import fit_prompt
+from pipeline import Pipeline, Stage, Finished
+from portal_client import PortalClient
+from metrics import metrics, add_arguments as add_metrics_arguments, run_instrumented
 
-# 환경변수에서 설정값 로드
-BASE = os.getenv('BASE_URL', 'https://cnujob.cnu.ac.kr')
-COOKIE = os.getenv('SESSION_COOKIE')
-
-# 필수 환경변수 체크
-if not COOKIE:
-    print("⚠️ SESSION_COOKIE 환경변수가 설정되지 않았습니다.")
-    print("💡 export SESSION_COOKIE='your_cookie_string'")
-    raise ValueError("SESSION_COOKIE가 필요합니다.")
+# 분석 대상 저장소 및 작성자
+REPOSITORIES = [
+    "/Users/iyein/Documents/ai-show-agent",
+    "/Users/iyein/Documents/cleaning-service", 
+    "/Users/iyein/Documents/gmpang-linktree-project"
+]
+AUTHOR = "iyeaaa"
 
 def create_gemini_prompt(commits_data, date):
     """Gemini API용 프롬프트 생성"""
@@ -41,37 +46,25 @@ def create_gemini_prompt(commits_data, date):
 """
     return prompt
 
-def generate_content_with_gemini(date_str):
-    """Git 커밋 기반으로 일일 보고서 생성"""
-    # Git 분석기 초기화
-    repositories = [
-        "/Users/iyein/Documents/ai-show-agent",
-        "/Users/iyein/Documents/cleaning-service", 
-        "/Users/iyein/Documents/gmpang-linktree-project"
-    ]
-    
-    analyzer = GitAnalyzer(repositories)
-    
-    # 커밋 데이터 수집
-    print("🔍 커밋 정보 수집중...")
-    commits_data = analyzer.analyze_commits_for_date(date_str, author="iyeaaa")
-    
-    # 실제 커밋이 있는지 확인
-    lines = commits_data.strip().split('\n')
-    has_actual_commits = any('•' in line for line in lines)
-    
-    if not has_actual_commits:
-        print(f"❌ {date_str}에 해당하는 커밋을 찾을 수 없습니다.")
-        return f"일일 보고서 - {date_str}", f"{date_str} 업무 수행 내용"
-    
+def summarize_commits(gemini, results, date_str):
+    """수집된 커밋으로 일일 보고서 제목과 내용 생성
+
+    Returns:
+        (제목, 내용), Gemini 호출이 실패하거나 응답이 비어 있으면 None
+        (게시하지 않고 다음 실행에서 다시 생성하도록 호출한 쪽에서 처리)
+    """
     try:
-        gemini = GeminiAPI()
-        prompt = create_gemini_prompt(commits_data, date_str)
+        # 커밋 정보를 토큰 예산에 맞춰 압축한 프롬프트 생성 (수집 기준으로 모두 date_str의 커밋)
+        prompt, _ = fit_prompt(
+            lambda commits_data: create_gemini_prompt(commits_data, date_str), results,
+            day_of=lambda commit: date_str
+        )
         
-        summary = gemini.call_api(prompt, max_tokens=1000)
+        summary = gemini.call_api(prompt, max_tokens=1000, use_cache=not os.getenv('GEMINI_NO_CACHE'))
         
         if not summary:
-            return f"일일 보고서 - {date_str}", f"{date_str} 업무 수행 내용"
+            print(f"✗ {date_str} 보고서 생성 실패 (빈 응답)")
+            return None
         
         # 제목과 내용 분리
         lines = summary.strip().split('\n')
@@ -92,39 +85,44 @@ def generate_content_with_gemini(date_str):
         
     except Exception as e:
         print(f"제미나이 API 오류: {e}")
-        return f"일일 보고서 - {date_str}", f"{date_str} 업무 수행 내용"
+        return None
 
-def main():
-    # 사용자로부터 날짜 입력받기
-    date_input = input("날짜를 입력하세요 (YYYY-MM-DD 형식, 예: 2025-09-10): ").strip()
-    
-    # 날짜 형식 검증
-    try:
-        datetime.strptime(date_input, '%Y-%m-%d')
-    except ValueError:
-        print("올바른 날짜 형식을 입력해주세요 (YYYY-MM-DD)")
-        return
+def generate_content_with_gemini(date_str, gemini=None, analyzer=None):
+    """Git 커밋 기반으로 일일 보고서 생성
+
+    Args:
+        date_str: 대상 날짜 ('YYYY-MM-DD')
+        gemini: 재사용할 GeminiAPI (없으면 새로 생성)
+        analyzer: 재사용할 GitAnalyzer (없으면 커밋 색인을 사용하는 분석기 생성)
+
+    Returns:
+        (제목, 내용), 커밋이 없거나 생성에 실패하면 None
+    """
+    # 커밋 색인을 사용해 이미 읽은 히스토리는 다시 순회하지 않음
+    analyzer = analyzer or GitAnalyzer(REPOSITORIES, index=CommitIndex())
     
-    print(f"제미나이 API를 사용하여 {date_input} 날짜의 콘텐츠를 생성중...")
-    subject, contents = generate_content_with_gemini(date_input)
+    # 커밋 데이터 수집
+    print("🔍 커밋 정보 수집중...")
+    results = analyzer.collect_commits_for_date(date_str, author=AUTHOR)
     
-    print(f"생성된 제목: {subject}")
-    print(f"생성된 내용: {contents}...")
+    # 실제 커밋이 있는지 확인
+    if not has_commits(results):
+        print(f"❌ {date_str}에 해당하는 커밋을 찾을 수 없습니다.")
+        return None
     
-    # 세션 설정
-    s = requests.Session()
-    s.headers.update({
-        "Origin": BASE,
-        "Referer": f"{BASE}/student/report/studentBoardDayAdd",
-        "User-Agent": "Mozilla/5.0",
-    })
+    try:
+        # 같은 날짜를 다시 실행하면 (예: 게시 실패 후 재시도) 캐시된 응답을 재사용
+        if gemini is None:
+            from gemini_client import GeminiAPI
+            gemini = GeminiAPI(cache=ResponseCache())
+    except Exception as e:
+        print(f"제미나이 API 오류: {e}")
+        return None
     
-    # 쿠키 설정
-    for kv in COOKIE.split("; "):
-        k, v = kv.split("=", 1)
-        s.cookies.set(k, v, domain="cnujob.cnu.ac.kr")
+    return summarize_commits(gemini, results, date_str)
 
-    # 환경변수에서 사용자 정보 로드
+def load_student_info():
+    """환경변수에서 사용자 정보 로드"""
     seq_stu = os.getenv('STUDENT_SEQ')
     seq_corp = os.getenv('CORP_SEQ')
     seq_class = os.getenv('CLASS_SEQ')
@@ -145,23 +143,41 @@ def main():
         print(f"⚠️ 다음 환경변수들이 설정되지 않았습니다: {', '.join(missing_vars)}")
         print("💡 .env.example 파일을 참고하여 환경변수를 설정해주세요.")
         raise ValueError("필수 환경변수가 누락되었습니다.")
-
-    # 세션 데이터
-    data = {
+    
+    return {
         "seqStu": seq_stu,
         "seqCorp": seq_corp, 
         "seqClass": seq_class,
         "seqLect": seq_lect,
         "id": student_id,
+    }
+
+def post_report(client, student_info, date_str, subject, contents, ledger=None):
+    """일일 보고서 게시 (ledger가 있으면 전송 전후로 기록)
+
+    Args:
+        client: PortalClient
+
+    Returns:
+        insertResult 값 (실패시 0)
+    """
+    # 세션 데이터
+    data = {
+        **student_info,
         "bName": "Day",
         "subject": subject,
         "contents": contents,
         "cntn": contents,
-        "day": date_input,
+        "day": date_str,
     }
 
+    if ledger is not None:
+        ledger.mark_pending(student_info["id"], "Day", date_str, subject, contents)
+
     # 게시물 전송
-    r = s.post(f"{BASE}/student/report/studentBoardAddProc", data=data, timeout=20)
+    with metrics.span('portal_post', kind="Day") as labels:
+        r = client.post("/student/report/studentBoardAddProc", data, referer_path="/student/report/studentBoardDayAdd")
+        labels['status'] = r.status_code
     print(f"Status Code: {r.status_code}")
     print(f"URL: {r.url}")
 
@@ -178,6 +194,226 @@ def main():
     except json.JSONDecodeError:
         print("✗ JSON 응답 파싱 실패")
         print(f"Raw response: {r.text[:500]}")
+        insert_result = 0
+
+    if ledger is not None:
+        ledger.record(student_info["id"], "Day", date_str, subject, contents, insert_result)
+
+    return insert_result
+
+def day_collector(analyzer, author, days):
+    """날짜 하나의 커밋을 돌려주는 수집 함수 생성
+
+    날짜마다 git log를 따로 실행하지 않도록 같은 주의 날짜들은 처음 요청될 때 한 번에 수집합니다.
+    (기간 전체를 먼저 수집하면 그동안 생성/게시 단계가 놀게 되므로 주 단위로 나눔)
+
+    Args:
+        analyzer: GitAnalyzer
+        author: 작성자 필터
+        days: 수집할 날짜 리스트 ('YYYY-MM-DD', 오름차순)
+
+    Returns:
+        날짜를 받아 저장소 목록 순서의 RepoCommits 리스트를 반환하는 함수 (스레드 안전)
+    """
+    def week_of(day):
+        return datetime.strptime(day, '%Y-%m-%d').isocalendar()[:2]
+
+    weeks = {}
+    for day in days:
+        weeks.setdefault(week_of(day), []).append(day)
+
+    collected = {}
+    lock = threading.Lock()
+
+    def collect(day):
+        week = week_of(day)
+        with lock:
+            if week not in collected:
+                week_days = weeks[week]
+                collected[week] = analyzer.collect_commits_by_day(
+                    week_days[0], week_days[-1], author=author, days=week_days
+                )
+            return collected[week][day]
+
+    return collect
+
+def backfill(start_date, end_date, include_weekends=False, max_workers=4, force=False):
+    """기간 내 일일 보고서를 한 번에 생성하고 게시
+
+    커밋 수집 → 보고서 생성 → 게시를 단계별 파이프라인으로 실행해,
+    앞 날짜의 보고서를 생성/게시하는 동안 다음 날짜의 커밋을 수집합니다.
+
+    Args:
+        start_date: 시작일 ('YYYY-MM-DD')
+        end_date: 종료일 ('YYYY-MM-DD')
+        include_weekends: 주말도 포함할지 여부 (기본은 평일만)
+        max_workers: 동시에 생성할 보고서 수 (Gemini 호출은 공유 속도 제한기를 따름)
+        force: 전송 후 응답을 받지 못한 날짜도 다시 게시 (포털에서 등록되지 않은 것을 확인한 경우)
+    """
+    start = datetime.strptime(start_date, '%Y-%m-%d')
+    end = datetime.strptime(end_date, '%Y-%m-%d')
+    days = [
+        (start + timedelta(days=i)).strftime('%Y-%m-%d')
+        for i in range((end - start).days + 1)
+        if include_weekends or (start + timedelta(days=i)).weekday() < 5
+    ]
+    
+    if not days:
+        print("❌ 대상 날짜가 없습니다.")
+        return
+    
+    # 입력값 문제와 세션 만료는 생성 작업 전에 확인
+    student_info = load_student_info()
+    client = PortalClient(key=student_info["id"])
+    if not client.preflight():
+        client.close()
+        return
+    ledger = PostLedger()
+    
+    import requests
+    from gemini_client import GeminiAPI
+    gemini = GeminiAPI(cache=ResponseCache(), pool_size=max_workers)
+    analyzer = GitAnalyzer(REPOSITORIES, index=CommitIndex())
+    collect_day = day_collector(analyzer, AUTHOR, days)
+    commit_counts = {}
+    insert_results = {}
+    
+    def collect(day):
+        results = collect_day(day)
+        commit_counts[day] = sum(len(result.commits) for result in results)
+        if not has_commits(results):
+            return Finished("커밋 없음")
+        # 이미 등록된 날짜는 생성/게시하지 않음 (실패했던 날짜만 다시 보냄)
+        if ledger.check(student_info["id"], "Day", day, force):
+            return Finished("이미 등록")
+        return day, results
+    
+    def generate(item):
+        day, results = item
+        report = summarize_commits(gemini, results, day)
+        # 생성에 실패한 날짜는 게시하지 않고 다음 실행에서 다시 생성
+        if report is None:
+            return Finished("생성 실패")
+        return (day, *report)
+    
+    def post(item):
+        day, subject, contents = item
+        print(f"\n📤 {day} 게시중... ({subject})")
+        try:
+            insert_results[day] = post_report(client, student_info, day, subject, contents, ledger)
+        except requests.exceptions.RequestException as e:
+            print(f"✗ 게시 요청 실패: {e}")
+            return "실패"
+        return "성공" if insert_results[day] > 0 else "실패"
+    
+    # 하나의 세션으로 날짜순으로 게시하고, 생성만 동시에 실행
+    print(f"🔍 {start_date} ~ {end_date} 보고서 {len(days)}개 처리중...")
+    pipeline = Pipeline([
+        Stage('collect', collect),
+        Stage('generate', generate, workers=max_workers),
+        Stage('post', post, ordered=True),
+    ], name='backfill')
+    try:
+        statuses = dict(zip(days, pipeline.run(days)))
+    finally:
+        client.close()
+    pipeline.print_stats()
+    
+    # 결과 요약
+    print("\n📋 백필 결과")
+    print("=" * 40)
+    print(f"{'날짜':<12}{'커밋':>6}  {'상태':<8}Insert Result")
+    for day in days:
+        status = statuses[day]
+        if isinstance(status, Exception):
+            status = "오류"
+        print(f"{day:<12}{commit_counts.get(day, '-'):>6}  {status:<8}{insert_results.get(day, '-')}")
+    
+    attempted = sum(1 for status in statuses.values() if status not in ("커밋 없음", "이미 등록"))
+    succeeded = sum(1 for status in statuses.values() if status == "성공")
+    print(f"\n✓ {succeeded}/{attempted}개 보고서 등록 완료")
+
+def main():
+    parser = argparse.ArgumentParser(description="일일 보고서 생성 및 게시")
+    parser.add_argument('--backfill', nargs=2, metavar=('START', 'END'),
+                        help="START ~ END (YYYY-MM-DD) 기간의 보고서를 한 번에 게시")
+    parser.add_argument('--include-weekends', action='store_true', help="백필 시 주말 포함")
+    parser.add_argument('--workers', type=int, default=4, help="백필 시 동시 생성 수 (기본 4)")
+    parser.add_argument('--force', action='store_true',
+                        help="전송 후 응답을 받지 못한 보고서도 다시 게시 (포털에서 미등록을 확인한 경우)")
+    add_metrics_arguments(parser)
+    args = parser.parse_args()
+    
+    run_instrumented(lambda: run(args), args)
+
+def run(args):
+    """명령행 인자에 따라 백필 또는 단일 날짜 보고서 게시"""
+    if args.backfill:
+        try:
+            for value in args.backfill:
+                datetime.strptime(value, '%Y-%m-%d')
+        except ValueError:
+            print("올바른 날짜 형식을 입력해주세요 (YYYY-MM-DD)")
+            return
+        backfill(*args.backfill, include_weekends=args.include_weekends, max_workers=args.workers,
+                 force=args.force)
+        return
+    
+    # 사용자로부터 날짜 입력받기
+    date_input = input("날짜를 입력하세요 (YYYY-MM-DD 형식, 예: 2025-09-10): ").strip()
+    
+    # 날짜 형식 검증
+    try:
+        datetime.strptime(date_input, '%Y-%m-%d')
+    except ValueError:
+        print("올바른 날짜 형식을 입력해주세요 (YYYY-MM-DD)")
+        return
+    
+    post_daily(date_input, force=args.force)
+
+def post_daily(date_str, dry_run=False, force=False):
+    """날짜 하나의 일일 보고서 생성 후 게시
+
+    Args:
+        date_str: 대상 날짜 ('YYYY-MM-DD')
+        dry_run: True면 생성 결과만 출력하고 게시하지 않음
+        force: 전송 후 응답을 받지 못한 보고서도 다시 게시
+    """
+    if dry_run:
+        report = generate_content_with_gemini(date_str)
+        if report is None:
+            print(f"✗ {date_str} 보고서를 생성하지 못했습니다.")
+            return
+        subject, contents = report
+        print(f"생성된 제목: {subject}")
+        print(f"생성된 내용: {contents}")
+        return
+    
+    # 환경변수에서 사용자 정보 로드
+    student_info = load_student_info()
+    
+    # 이미 등록된 날짜면 생성/게시 없이 종료
+    ledger = PostLedger()
+    if ledger.check(student_info["id"], "Day", date_str, force):
+        return
+    
+    with PortalClient(key=student_info["id"]) as client:
+        # 세션이 만료됐으면 Gemini를 호출하기 전에 종료
+        if not client.preflight():
+            return
+        
+        print(f"제미나이 API를 사용하여 {date_str} 날짜의 콘텐츠를 생성중...")
+        report = generate_content_with_gemini(date_str)
+        # 생성에 실패하면 게시하지도, 게시 기록에 남기지도 않음 (다음 실행에서 다시 생성)
+        if report is None:
+            print(f"✗ {date_str} 보고서가 생성되지 않아 게시하지 않습니다.")
+            return
+        subject, contents = report
+        
+        print(f"생성된 제목: {subject}")
+        print(f"생성된 내용: {contents}...")
+        
+        post_report(client, student_info, date_str, subject, contents, ledger)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,307 @@
+"""
+변경 내용 요약(diff digest) 모듈
+커밋 제목과 파일 이름만으로는 보고서 내용이 빈약하므로, 저장소별 git log -p 한 번으로
+파일별 변경 라인 일부와 변경된 함수 이름, 변경량을 추출합니다.
+파일별 바이트 상한과 날짜별 바이트 예산을 두어 추출 비용과 프롬프트 크기를 제한하고,
+바이너리/잠금 파일/생성된 파일은 건너뜁니다.
+"""
+
+import os
+import re
+from dataclasses import dataclass, field
+from fnmatch import translate
+from typing import List
+
+from git_analyzer import RECORD_SEP, iter_git_output
+
+# 파일 하나에서 보관할 변경 라인 최대 바이트 (DIFF_DIGEST_FILE_BYTES 환경변수로 조정)
+DEFAULT_FILE_BYTES = 1500
+
+# 하루치 변경 내용 요약 전체의 최대 바이트 (DIFF_DIGEST_DAY_BYTES 환경변수로 조정)
+DEFAULT_DAY_BYTES = 6000
+
+# 파일당 기록할 최대 함수 수
+MAX_FUNCTIONS = 8
+
+# 예산이 이보다 적게 남으면 변경 라인 없이 함수 이름만 기록
+MIN_EXCERPT_BYTES = 200
+
+# 내용이 보고서에 의미 없는 파일 (파일 이름 패턴)
+LOCKFILE_PATTERNS = (
+    'package-lock.json', 'yarn.lock', 'pnpm-lock.yaml', 'poetry.lock', 'Pipfile.lock', 'uv.lock',
+    'Cargo.lock', 'go.sum', 'composer.lock', 'Gemfile.lock', '*.lock',
+)
+GENERATED_PATTERNS = (
+    '*.min.js', '*.min.css', '*.map', '*_pb2.py', '*_pb2_grpc.py', '*.pb.go', '*.generated.*', '*.g.dart',
+    '*.snap', '*.svg', '*.ipynb',
+)
+GENERATED_DIRS = {'node_modules', 'vendor', 'dist', 'build', '.next', '__snapshots__', 'migrations'}
+
+# 함수/클래스 정의 라인에서 이름 추출 (Python, JS/TS, Go, Rust, Kotlin, Swift 등)
+DEFINITION_PATTERN = re.compile(
+    r'\s*(?:export\s+)?(?:default\s+)?(?:public\s+|private\s+|protected\s+|static\s+|pub\s+)*(?:'
+    r'(?:async\s+)?(?:def|class|function|func|fn|fun|interface|struct|enum|trait)\s+(?:\([^)]*\)\s*)?([A-Za-z_$][\w$]*)'
+    r'|(?:const|let|var)\s+([A-Za-z_$][\w$]*)\s*=\s*(?:async\s*)?(?:function\b|\([^)]*\)\s*=>))'
+)
+
+# 파일 이름 패턴을 하나의 정규식으로 (파일마다 패턴을 하나씩 비교하지 않도록)
+_SKIPPED_NAME = re.compile('|'.join(translate(pattern) for pattern in (*LOCKFILE_PATTERNS, *GENERATED_PATTERNS)))
+
+
+@dataclass(slots=True)
+class FileDigest:
+    """커밋에서 변경된 파일 하나의 요약"""
+    path: str
+    added: int = 0
+    deleted: int = 0
+    functions: List[str] = field(default_factory=list)
+    excerpt: str = ''
+    truncated: bool = False
+
+    @property
+    def churn(self):
+        return self.added + self.deleted
+
+    def render(self):
+        """프롬프트용 문자열"""
+        line = f"{self.path} (+{self.added}/-{self.deleted})"
+        if self.functions:
+            line += " 함수: " + ", ".join(self.functions)
+        if self.excerpt:
+            line += "\n" + self.excerpt + ("\n…" if self.truncated else "")
+        return line
+
+
+def get_file_bytes() -> int:
+    return int(os.getenv('DIFF_DIGEST_FILE_BYTES', DEFAULT_FILE_BYTES))
+
+
+def get_day_bytes() -> int:
+    return int(os.getenv('DIFF_DIGEST_DAY_BYTES', DEFAULT_DAY_BYTES))
+
+
+def is_skipped_path(path, extra_patterns=None):
+    """잠금 파일/생성된 파일 등 요약에서 제외할 경로인지 확인
+
+    Args:
+        path: 저장소 기준 경로
+        extra_patterns: 추가 제외 패턴을 합친 정규식 (_extra_patterns 결과)
+    """
+    parts = path.split('/')
+    if any(part in GENERATED_DIRS for part in parts[:-1]):
+        return True
+    if _SKIPPED_NAME.match(parts[-1]):
+        return True
+    return bool(extra_patterns and (extra_patterns.match(parts[-1]) or extra_patterns.match(path)))
+
+
+def _extra_patterns():
+    """DIFF_DIGEST_EXCLUDE 환경변수의 추가 제외 패턴 (쉼표 구분 glob)을 합친 정규식 (없으면 None)"""
+    patterns = [p.strip() for p in os.getenv('DIFF_DIGEST_EXCLUDE', '').split(',') if p.strip()]
+    return re.compile('|'.join(translate(pattern) for pattern in patterns)) if patterns else None
+
+
+def _unquote_path(value):
+    """diff 헤더의 경로에서 a/, b/ 접두어와 C 문자열 인용 제거"""
+    value = value.rstrip('\t')
+    if value.startswith('"') and value.endswith('"'):
+        raw = value[1:-1].encode('latin-1', errors='replace').decode('unicode_escape').encode('latin-1')
+        value = raw.decode('utf-8', errors='replace')
+    return value[2:] if value.startswith(('a/', 'b/')) else value
+
+
+def _definition_name(text):
+    match = DEFINITION_PATTERN.match(text)
+    return (match.group(1) or match.group(2)) if match else None
+
+
+class _FileBuilder:
+    """패치 스트림에서 파일 하나의 요약을 상한 안에서 누적"""
+
+    def __init__(self, file_bytes):
+        self.file_bytes = file_bytes
+        self.old_path = None
+        self.new_path = None
+        self.binary = False
+        self.skipped = False
+        self.in_hunk = False
+        self.added = 0
+        self.deleted = 0
+        self.functions = []
+        self.lines = []
+        self.size = 0
+        self.truncated = False
+
+    def add_function(self, name):
+        if name and name not in self.functions and len(self.functions) < MAX_FUNCTIONS:
+            self.functions.append(name)
+
+    def add_line(self, line):
+        # 상한을 넘으면 더 이상 보관하지 않고 변경량만 셈 (변경 라인이 이어지도록 이후 라인도 버림)
+        if self.truncated:
+            return
+        size = len(line.encode('utf-8', errors='replace')) + 1
+        if self.size + size > self.file_bytes:
+            self.truncated = True
+            return
+        self.lines.append(line)
+        self.size += size
+
+    @property
+    def path(self):
+        return self.new_path if self.new_path not in (None, '/dev/null') else self.old_path
+
+    def build(self):
+        path = self.path
+        if self.binary or self.skipped or not path or not (self.added or self.deleted):
+            return None
+        return FileDigest(path, self.added, self.deleted, self.functions, "\n".join(self.lines), self.truncated)
+
+
+def parse_patch(lines, file_bytes=None, extra_patterns=None):
+    """git log -p --format=%x1e%H 출력을 커밋별 파일 요약으로 변환
+
+    Args:
+        lines: git log 출력 라인 이터러블 (스트리밍 입력)
+        file_bytes: 파일당 보관할 변경 라인 최대 바이트
+        extra_patterns: 추가로 제외할 경로 패턴
+
+    Yields:
+        (커밋 해시, FileDigest 리스트)
+    """
+    file_bytes = file_bytes if file_bytes is not None else get_file_bytes()
+    extra_patterns = extra_patterns if extra_patterns is not None else _extra_patterns()
+
+    commit_hash = None
+    digests = []
+    current = None
+
+    def finish_file():
+        if current is not None:
+            digest = current.build()
+            if digest is not None:
+                digests.append(digest)
+
+    for line in lines:
+        # 대부분의 라인은 hunk 안의 변경 라인이므로 가장 먼저 짧은 경로로 처리
+        first = line[:1]
+        if (first == '+' or first == '-') and current is not None and current.in_hunk:
+            if current.skipped:
+                continue
+            line = line.rstrip('\n')
+            if first == '+':
+                current.added += 1
+            else:
+                current.deleted += 1
+            if len(current.functions) < MAX_FUNCTIONS:
+                current.add_function(_definition_name(line[1:]))
+            current.add_line(line)
+            continue
+
+        line = line.rstrip('\n')
+        if first == RECORD_SEP:
+            finish_file()
+            current = None
+            if commit_hash is not None:
+                yield commit_hash, digests
+            commit_hash = line[1:].strip()
+            digests = []
+        elif line.startswith('diff --git '):
+            finish_file()
+            current = _FileBuilder(file_bytes)
+        elif current is None:
+            continue
+        elif not current.in_hunk:
+            if line.startswith('--- '):
+                current.old_path = _unquote_path(line[4:])
+            elif line.startswith('+++ '):
+                current.new_path = _unquote_path(line[4:])
+            elif line.startswith('Binary files ') or line == 'GIT binary patch':
+                current.binary = True
+            elif first == '@':
+                current.in_hunk = True
+                # 제외할 파일이면 이후 라인은 파싱하지 않고 건너뜀
+                current.skipped = not current.path or is_skipped_path(current.path, extra_patterns)
+                if not current.skipped:
+                    _start_hunk(current, line)
+        elif first == '@' and not current.skipped:
+            _start_hunk(current, line)
+
+    finish_file()
+    if commit_hash is not None:
+        yield commit_hash, digests
+
+
+def _start_hunk(current, line):
+    """hunk 헤더 '@@ -a,b +c,d @@ 함수 문맥'에서 함수 이름 기록"""
+    header, _, context = line[2:].partition('@@')
+    context = context.strip()
+    if context:
+        current.add_function(_definition_name(context))
+    current.add_line(f"@@{header}@@")
+
+
+def read_repo_digests(repo_path, hashes, timeout=None, file_bytes=None):
+    """저장소의 여러 커밋 변경 내용을 git log -p 한 번으로 요약
+
+    Returns:
+        {커밋 해시: FileDigest 리스트}
+    """
+    if not hashes:
+        return {}
+
+    # 문맥 라인은 요약에 쓰지 않으므로 -U0으로 출력량을 줄임 (hunk 헤더의 함수 문맥은 유지됨)
+    cmd = ['git', '-C', repo_path, 'log', '--no-walk=unsorted', '--stdin', f'--format={RECORD_SEP}%H',
+           '-p', '-U0', '--no-color', '--no-ext-diff']
+    revisions = "".join(f"{commit_hash}\n" for commit_hash in hashes)
+    return dict(parse_patch(iter_git_output(cmd, timeout=timeout, input=revisions), file_bytes))
+
+
+def apply_day_budget(digests, day_bytes=None):
+    """하루치 파일 요약 전체가 예산 안에 들어가도록 줄임
+
+    먼저 변경량이 큰 파일부터 경로/변경량/함수 이름을 넣고, 남은 예산을 같은 순서로 변경 라인에 배분합니다.
+    (큰 파일 하나가 예산을 모두 차지해 다른 작업이 빠지지 않도록 하기 위함)
+
+    Args:
+        digests: 같은 날짜의 FileDigest 리스트 (변경 라인은 제자리에서 줄임)
+        day_bytes: 날짜별 최대 바이트
+
+    Returns:
+        예산에 포함된 FileDigest 리스트 (입력 순서 유지)
+    """
+    remaining = day_bytes if day_bytes is not None else get_day_bytes()
+    ordered = sorted(digests, key=lambda d: d.churn, reverse=True)
+
+    excerpts = {}
+    kept = []
+    for digest in ordered:
+        excerpts[id(digest)] = (digest.excerpt, digest.truncated)
+        digest.excerpt, digest.truncated = '', False
+        size = len(digest.render().encode('utf-8')) + 1
+        if size <= remaining:
+            remaining -= size
+            kept.append(digest)
+
+    for digest in kept:
+        excerpt, truncated = excerpts[id(digest)]
+        if not excerpt:
+            continue
+        header_size = len(digest.render().encode('utf-8'))
+        digest.excerpt, digest.truncated = excerpt, truncated
+        size = len(digest.render().encode('utf-8')) - header_size
+        if size <= remaining:
+            remaining -= size
+            continue
+
+        # 남은 예산만큼 앞부분 라인만 보관
+        room = remaining - len("\n\n…".encode('utf-8'))
+        trimmed = excerpt.encode('utf-8')[:max(room, 0)].decode('utf-8', errors='ignore').rsplit('\n', 1)[0]
+        if room < MIN_EXCERPT_BYTES or not trimmed:
+            digest.excerpt, digest.truncated = '', False
+            continue
+        digest.excerpt, digest.truncated = trimmed, True
+        remaining -= len(digest.render().encode('utf-8')) - header_size
+
+    kept_ids = {id(digest) for digest in kept}
+    return [digest for digest in digests if id(digest) in kept_ids]
@@ -5,17 +5,37 @@ Google Gemini API 통신 모듈
 
 import os
 import json
+import random
+import asyncio
 import requests
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from functools import partial
+from requests.adapters import HTTPAdapter
+from typing import Iterator, List, Optional
 import time
+from rate_limiter import get_shared_rate_limiter
+from metrics import metrics
+
+# 재시도하면 성공할 수 있는 HTTP 상태 코드 (그 외 4xx는 요청 자체의 문제이므로 재시도하지 않음)
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
 
 class GeminiAPI:
     """Google Gemini API 클래스"""
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, pool_size: int = 10,
+                 connect_timeout: float = 10, read_timeout: float = 120, cache=None,
+                 rate_limiter=None, backoff_base: float = 2.0, max_backoff: float = 60.0):
         """
         Args:
             api_key: Google Gemini API 키 (없으면 환경변수에서 읽음)
+            pool_size: 재사용할 HTTP 연결 수 (동시 요청 수에 맞춰 설정)
+            connect_timeout: 연결 제한 시간(초)
+            read_timeout: 응답 대기 제한 시간(초)
+            cache: 응답을 재사용할 ResponseCache (None이면 캐시 사용 안 함)
+            rate_limiter: 요청 전 토큰을 얻을 TokenBucket (None이면 프로세스 공유 제한기 사용)
+            backoff_base: 재시도 대기 시간의 기준값(초), 시도마다 2배씩 증가
+            max_backoff: 재시도 대기 시간 상한(초)
         """
         self.api_key = api_key or os.getenv('GEMINI_API_KEY')
         
@@ -31,10 +51,127 @@ class GeminiAPI:
             print("⚠️ API 키 형식이 올바르지 않습니다.")
             print("💡 Google AI Studio에서 발급받은 API 키를 사용하세요.")
 
-        self.base_url = "https://generativelanguage.googleapis.com/v1beta"
+        self.base_url = os.getenv('GEMINI_BASE_URL', "https://generativelanguage.googleapis.com/v1beta")
         self.model = "gemini-2.5-flash-lite"
+        self.timeout = (connect_timeout, read_timeout)
+        self.cache = cache
+        self.rate_limiter = rate_limiter or get_shared_rate_limiter()
+        self.backoff_base = backoff_base
+        self.max_backoff = max_backoff
+
+        # 요청마다 TCP/TLS 연결을 새로 맺지 않도록 keep-alive 연결 풀을 가진 세션 사용
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({'Content-Type': 'application/json'})
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """연결 풀 정리"""
+        self.session.close()
+
+    def _build_request(self, prompt: str, max_tokens: int, stream: bool = False):
+        """generateContent (stream이면 SSE streamGenerateContent) 요청 URL과 본문 생성"""
+        if stream:
+            url = f"{self.base_url}/models/{self.model}:streamGenerateContent?alt=sse&key={self.api_key}"
+        else:
+            url = f"{self.base_url}/models/{self.model}:generateContent?key={self.api_key}"
+
+        data = {
+            "contents": [{
+                "parts": [{
+                    "text": prompt
+                }]
+            }],
+            "generationConfig": {
+                "temperature": 0.7,
+                "topK": 40,
+                "topP": 0.95,
+                "maxOutputTokens": max_tokens,
+            }
+        }
+
+        return url, data
+
+    @staticmethod
+    def _retry_after(response) -> Optional[float]:
+        """서버가 알려준 재시도 대기 시간(초) 확인 (Retry-After 헤더 또는 RetryInfo.retryDelay)"""
+        header = response.headers.get('Retry-After')
+        if header:
+            try:
+                return max(0.0, float(header))
+            except ValueError:
+                try:
+                    return max(0.0, parsedate_to_datetime(header).timestamp() - time.time())
+                except (TypeError, ValueError):
+                    pass
+
+        try:
+            details = response.json().get('error', {}).get('details', [])
+        except ValueError:
+            return None
+
+        for detail in details:
+            delay = str(detail.get('retryDelay', ''))
+            if delay.endswith('s'):
+                try:
+                    return float(delay[:-1])
+                except ValueError:
+                    pass
+
+        return None
+
+    def _backoff_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """지수 백오프 + 지터 대기 시간 계산 (서버 힌트가 있으면 그 이상 대기)"""
+        delay = random.uniform(0, min(self.max_backoff, self.backoff_base * (2 ** attempt)))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def _check_response(self, response, attempt: int) -> bool:
+        """응답 상태 확인 (재시도 가능한 오류는 예외 발생, 재시도해도 소용없는 요청 오류는 False)"""
+        if response.status_code in RETRYABLE_STATUS_CODES:
+            retry_after = self._retry_after(response)
+            if response.status_code == 429:
+                # 할당량 초과는 다른 호출도 같이 멈추도록 공유 제한기를 일시 정지
+                self.rate_limiter.pause(self._backoff_delay(attempt, retry_after))
+            error = requests.exceptions.HTTPError(
+                f"{response.status_code} 오류 (재시도 가능)", response=response
+            )
+            error.retry_after = retry_after
+            raise error
 
-    def call_api(self, prompt: str, max_tokens: int = 1000, max_retries: int = 3) -> Optional[str]:
+        if 400 <= response.status_code < 500:
+            print(f"❌ Gemini API 요청 오류 ({response.status_code}), 재시도하지 않습니다.")
+            print(f"   응답: {response.text[:500]}")
+            return False
+
+        response.raise_for_status()
+        return True
+
+    def _cache_key(self, data: dict, prompt: str) -> Optional[str]:
+        if self.cache is None:
+            return None
+        return self.cache.make_key(self.model, data['generationConfig'], prompt)
+
+    @staticmethod
+    def _extract_text(result: dict) -> Optional[str]:
+        """generateContent 응답에서 텍스트 추출"""
+        if 'candidates' in result and len(result['candidates']) > 0:
+            candidate = result['candidates'][0]
+            if 'content' in candidate and 'parts' in candidate['content']:
+                return candidate['content']['parts'][0]['text']
+
+        return None
+
+    def call_api(self, prompt: str, max_tokens: int = 1000, max_retries: int = 3,
+                 use_cache: bool = True) -> Optional[str]:
         """
         Gemini API 호출 (재시도 기능 포함)
 
@@ -42,68 +179,177 @@ class GeminiAPI:
             prompt: API에 전송할 프롬프트
             max_tokens: 최대 토큰 수
             max_retries: 최대 재시도 횟수
+            use_cache: False면 캐시를 건너뛰고 항상 API 호출 (결과는 캐시에 갱신)
 
         Returns:
             API 응답 텍스트 (실패시 None)
         """
+        url, data = self._build_request(prompt, max_tokens)
+
+        cache_key = self._cache_key(data, prompt)
+        if cache_key is not None and use_cache:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                print("💾 캐시된 Gemini 응답을 사용합니다.")
+                metrics.increment('gemini_cache_hits')
+                return cached
+
         for attempt in range(max_retries):
+            metrics.observe('gemini_rate_limit_wait', self.rate_limiter.acquire())
+
             try:
-                url = f"{self.base_url}/models/{self.model}:generateContent?key={self.api_key}"
-
-                headers = {
-                    'Content-Type': 'application/json'
-                }
-
-                data = {
-                    "contents": [{
-                        "parts": [{
-                            "text": prompt
-                        }]
-                    }],
-                    "generationConfig": {
-                        "temperature": 0.7,
-                        "topK": 40,
-                        "topP": 0.95,
-                        "maxOutputTokens": max_tokens,
-                    }
-                }
-
-                response = requests.post(url, headers=headers, data=json.dumps(data))
-                response.raise_for_status()
-
-                result = response.json()
-
-                if 'candidates' in result and len(result['candidates']) > 0:
-                    candidate = result['candidates'][0]
-                    if 'content' in candidate and 'parts' in candidate['content']:
-                        return candidate['content']['parts'][0]['text']
+                with metrics.span('gemini_attempt', mode='generate') as labels:
+                    response = self.session.post(url, data=json.dumps(data), timeout=self.timeout)
+                    labels['status'] = response.status_code
+                if not self._check_response(response, attempt):
+                    return None
+
+                text = self._extract_text(response.json())
+                if text is not None:
+                    if cache_key is not None:
+                        self.cache.set(cache_key, text)
+                    return text
 
                 print("❌ Gemini API 응답에서 콘텐츠를 찾을 수 없습니다.")
                 return None
 
-            # 재시도 로직
-            except requests.exceptions.RequestException as e:
+            # 재시도 로직 (네트워크 오류, 408/429/5xx, 잘못된 응답)
+            except Exception as e:
                 if attempt < max_retries - 1:
-                    wait_time = (attempt + 1) * 2  # 점진적 대기 시간
-                    print(f"⚠️ 시도 {attempt + 1}/{max_retries} 실패, {wait_time}초 후 재시도...")
+                    wait_time = self._backoff_delay(attempt, getattr(e, 'retry_after', None))
+                    print(f"⚠️ 시도 {attempt + 1}/{max_retries} 실패, {wait_time:.1f}초 후 재시도...")
                     print(f"   오류: {str(e)}")
+                    metrics.increment('gemini_retries')
+                    metrics.observe('gemini_backoff_sleep', wait_time)
                     time.sleep(wait_time)
                     continue
                 else:
                     print(f"❌ 최대 재시도 횟수 ({max_retries})를 초과했습니다.")
                     print(f"   마지막 오류: {str(e)}")
                     return None
+
+    def stream_api(self, prompt: str, max_tokens: int = 1000, max_retries: int = 3,
+                   use_cache: bool = True) -> Iterator[str]:
+        """
+        streamGenerateContent(SSE)로 Gemini API 호출, 생성되는 대로 텍스트 조각 반환
+
+        첫 조각을 받기 전의 실패만 재시도합니다 (이미 출력한 내용이 중복되지 않도록).
+
+        Args:
+            prompt: API에 전송할 프롬프트
+            max_tokens: 최대 토큰 수
+            max_retries: 최대 재시도 횟수
+            use_cache: False면 캐시를 건너뛰고 항상 API 호출 (완성된 결과는 캐시에 갱신)
+
+        Yields:
+            응답 텍스트 조각 (실패시 아무것도 반환하지 않음)
+        """
+        url, data = self._build_request(prompt, max_tokens, stream=True)
+
+        cache_key = self._cache_key(data, prompt)
+        if cache_key is not None and use_cache:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                print("💾 캐시된 Gemini 응답을 사용합니다.")
+                metrics.increment('gemini_cache_hits')
+                yield cached
+                return
+
+        for attempt in range(max_retries):
+            metrics.observe('gemini_rate_limit_wait', self.rate_limiter.acquire())
+            chunks = []
+
+            try:
+                # 스트리밍 시간에는 호출한 쪽이 조각을 처리하는 시간도 포함됨
+                started = time.perf_counter()
+                with metrics.span('gemini_attempt', mode='stream') as labels:
+                    with self.session.post(url, data=json.dumps(data), timeout=self.timeout,
+                                           stream=True) as response:
+                        labels['status'] = response.status_code
+                        if not self._check_response(response, attempt):
+                            return
+
+                        # SSE 이벤트: "data: {generateContent 응답 조각}" (chunk_size=None으로 도착 즉시 처리)
+                        # text/event-stream에 charset이 없으면 requests가 ISO-8859-1로 디코딩하므로 바이트로 받아 UTF-8로 해석
+                        for line in response.iter_lines(chunk_size=None):
+                            if not line or not line.startswith(b'data:'):
+                                continue
+
+                            text = self._extract_text(json.loads(line[len(b'data:'):].decode('utf-8')))
+                            if text:
+                                if not chunks:
+                                    metrics.observe('gemini_first_chunk', time.perf_counter() - started)
+                                chunks.append(text)
+                                yield text
+
+                if not chunks:
+                    print("❌ Gemini API 응답에서 콘텐츠를 찾을 수 없습니다.")
+                    return
+
+                if cache_key is not None:
+                    self.cache.set(cache_key, ''.join(chunks))
+                return
+
             except Exception as e:
+                if chunks:
+                    print(f"\n❌ 응답 수신 중 오류가 발생했습니다: {str(e)}")
+                    return
                 if attempt < max_retries - 1:
-                    wait_time = (attempt + 1) * 2
-                    print(f"⚠️ 시도 {attempt + 1}/{max_retries} 실패, {wait_time}초 후 재시도...")
+                    wait_time = self._backoff_delay(attempt, getattr(e, 'retry_after', None))
+                    print(f"⚠️ 시도 {attempt + 1}/{max_retries} 실패, {wait_time:.1f}초 후 재시도...")
                     print(f"   오류: {str(e)}")
+                    metrics.increment('gemini_retries')
+                    metrics.observe('gemini_backoff_sleep', wait_time)
                     time.sleep(wait_time)
                     continue
                 else:
                     print(f"❌ 최대 재시도 횟수 ({max_retries})를 초과했습니다.")
                     print(f"   마지막 오류: {str(e)}")
-                    return None
+                    return
+
+class AsyncGeminiAPI:
+    """asyncio용 Gemini API 클래스
+
+    요청/응답 처리는 GeminiAPI를 그대로 사용하고, 연결 풀 크기만큼의 작업 스레드에서
+    요청을 실행하므로 여러 generateContent 호출이 재사용 연결 위에서 동시에 진행됩니다.
+    """
+
+    def __init__(self, api_key: Optional[str] = None, max_concurrency: int = 8, **kwargs):
+        """
+        Args:
+            api_key: Google Gemini API 키 (없으면 환경변수에서 읽음)
+            max_concurrency: 동시에 진행할 최대 요청 수 (연결 풀 크기와 동일하게 사용)
+            **kwargs: GeminiAPI에 전달할 추가 설정 (connect_timeout, read_timeout 등)
+        """
+        self.api = GeminiAPI(api_key, pool_size=max_concurrency, **kwargs)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """작업 스레드와 연결 풀 정리"""
+        self._executor.shutdown(wait=True)
+        self.api.close()
+
+    async def call_api(self, prompt: str, max_tokens: int = 1000, max_retries: int = 3,
+                       use_cache: bool = True) -> Optional[str]:
+        """GeminiAPI.call_api의 비동기 버전"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, partial(self.api.call_api, prompt, max_tokens, max_retries, use_cache)
+        )
+
+    async def call_many(self, prompts: List[str], max_tokens: int = 1000,
+                        max_retries: int = 3, use_cache: bool = True) -> List[Optional[str]]:
+        """여러 프롬프트를 동시에 호출 (결과는 입력 순서 유지)"""
+        return await asyncio.gather(
+            *(self.call_api(prompt, max_tokens, max_retries, use_cache) for prompt in prompts)
+        )
+
 
 def test_gemini_api(api_key: str = None):
     """Gemini API 테스트 함수"""
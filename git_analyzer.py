@@ -4,227 +4,603 @@ Git 저장소 분석 모듈
 """
 
 import os
+import re
 import subprocess
-from datetime import datetime
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from zoneinfo import ZoneInfo
+
+from metrics import metrics
+
+# git log 출력에서 커밋 경계와 필드를 구분하기 위한 제어 문자
+# (커밋 메시지에 '|'가 포함되어도 안전하게 분리할 수 있음)
+RECORD_SEP = '\x1e'
+FIELD_SEP = '\x1f'
+LOG_FORMAT = '%x1e%h%x1f%s%x1f%an%x1f%ad%x1f%D%x1f%H%x1f%ae%x1f%at%x1f%ct'
+
+# 커밋을 날짜에 배정할 때 사용할 수 있는 시각 (commit: 커밋 시각, author: 작성 시각)
+DATE_FIELDS = ('commit', 'author')
+
+# 커밋 조회 방식 (cli: git log 실행, objects: .git 디렉터리를 직접 읽고 실패 시 cli로 대체)
+BACKENDS = ('cli', 'objects')
+
+
+@dataclass(slots=True)
+class FileChange:
+    """커밋에서 변경된 파일 하나의 통계 (바이너리 파일은 라인 수가 None)"""
+    path: str
+    added: Optional[int]
+    deleted: Optional[int]
+
+
+@dataclass(slots=True)
+class Commit:
+    """커밋 레코드"""
+    hash: str
+    subject: str
+    author: str
+    timestamp: int
+    refs: str = ''
+    files: List[FileChange] = field(default_factory=list)
+    date: str = ''
+    full_hash: str = ''
+    email: str = ''
+    commit_timestamp: int = 0
+    # 변경 내용 요약 (diff_digest 단계를 켠 경우에만 채워지는 FileDigest 리스트)
+    digest: list = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class RepoCommits:
+    """저장소 하나의 커밋 수집 결과 (실패 시 error에 사유 저장)"""
+    repo_path: str
+    commits: List[Commit] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def name(self):
+        return os.path.basename(self.repo_path)
+
+
+def _parse_line_count(value):
+    """--numstat 라인 수 파싱 (바이너리 파일의 '-'는 None)"""
+    return None if value == '-' else int(value)
+
+
+def parse_git_log(lines):
+    """git log (LOG_FORMAT + --numstat) 출력을 커밋 레코드로 변환
+
+    Args:
+        lines: git log 출력 라인 이터러블 (스트리밍 입력도 가능)
+
+    Yields:
+        Commit (files에는 해당 커밋의 FileChange 목록)
+    """
+    commit = None
+
+    for line in lines:
+        line = line.rstrip('\n')
+
+        if line.startswith(RECORD_SEP):
+            if commit is not None:
+                yield commit
+
+            parts = line[1:].split(FIELD_SEP)
+            if len(parts) < 9:
+                commit = None
+                continue
+
+            commit = Commit(
+                hash=parts[0],
+                subject=parts[1],
+                author=parts[2],
+                date=parts[3],
+                refs=parts[4],
+                full_hash=parts[5],
+                email=parts[6],
+                timestamp=int(parts[7]),
+                commit_timestamp=int(parts[8]),
+            )
+        elif commit is not None and line.strip():
+            # --numstat: "추가<TAB>삭제<TAB>경로" (바이너리 파일은 '-')
+            stat = line.split('\t', 2)
+            if len(stat) == 3:
+                commit.files.append(
+                    FileChange(stat[2], _parse_line_count(stat[0]), _parse_line_count(stat[1]))
+                )
+
+    if commit is not None:
+        yield commit
+
+
+def _write_input(stream, data):
+    try:
+        stream.write(data)
+        stream.close()
+    except (BrokenPipeError, ValueError):
+        pass
+
+
+def iter_git_output(cmd, timeout=None, input=None):
+    """git 명령어 출력을 전부 메모리에 올리지 않고 한 줄씩 생성
+
+    Args:
+        cmd: 실행할 명령어 리스트
+        timeout: 전체 실행 제한 시간(초), 초과 시 프로세스를 종료하고 TimeoutExpired 발생
+        input: 표준 입력으로 보낼 문자열 (예: --stdin으로 받을 커밋 목록)
+
+    Yields:
+        출력 라인 (줄바꿈 포함)
+    """
+    # 'git -C <경로> <하위 명령어>' 형식이면 하위 명령어를 계측 레이블로 사용
+    command = cmd[3] if len(cmd) > 3 and cmd[1] == '-C' else cmd[1] if len(cmd) > 1 else cmd[0]
+
+    # stderr는 파이프 버퍼가 가득 차 교착되지 않도록 임시 파일로 받음
+    with metrics.span('git_subprocess', command=command), tempfile.TemporaryFile() as stderr:
+        # 커밋 메시지나 diff에 UTF-8이 아닌 바이트가 있어도 중단되지 않도록 대체 문자로 읽음
+        process = subprocess.Popen(
+            cmd, stdin=subprocess.PIPE if input is not None else None,
+            stdout=subprocess.PIPE, stderr=stderr, text=True, encoding='utf-8', errors='replace'
+        )
+        if input is not None:
+            # 출력을 읽는 동안 입력을 보내야 양쪽 파이프가 가득 차도 교착되지 않음
+            threading.Thread(target=_write_input, args=(process.stdin, input), daemon=True).start()
+
+        timer = None
+        timed_out = threading.Event()
+
+        if timeout is not None:
+            def kill():
+                timed_out.set()
+                process.kill()
+
+            timer = threading.Timer(timeout, kill)
+            timer.daemon = True
+            timer.start()
+
+        try:
+            yield from process.stdout
+            process.wait()
+        finally:
+            # 소비자가 중간에 멈춘 경우에도 프로세스와 타이머를 정리
+            if timer is not None:
+                timer.cancel()
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            process.stdout.close()
+
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(cmd, timeout)
+
+        if process.returncode != 0:
+            stderr.seek(0)
+            raise subprocess.CalledProcessError(
+                process.returncode, cmd, stderr=stderr.read().decode(errors='replace')
+            )
+
+
+def to_timestamp(date_string):
+    """'YYYY-MM-DD HH:MM:SS' 문자열을 로컬 시간대 기준 유닉스 시간으로 변환 (git --since/--until과 동일)"""
+    return int(datetime.strptime(date_string, '%Y-%m-%d %H:%M:%S').timestamp())
+
+
+def author_matcher(author):
+    """git log --author와 같이 "이름 <이메일>"에 대해 정규식 검색하는 함수 생성"""
+    if not author:
+        return lambda name, email: True
+
+    try:
+        pattern = re.compile(author)
+        return lambda name, email: pattern.search(f"{name} <{email}>") is not None
+    except re.error:
+        return lambda name, email: author in f"{name} <{email}>"
+
+
+def has_commits(results):
+    """수집 결과에 실제 커밋이 하나라도 있는지 확인"""
+    return any(result.commits for result in results)
+
+
+def format_repo_commits(result, show_date=False, empty_message="해당 날짜에 커밋이 없습니다."):
+    """저장소 하나의 수집 결과를 보고서용 문자열로 변환"""
+    if result.error:
+        return f"❌ {result.name}: {result.error}"
+
+    if not result.commits:
+        return f"📁 {result.name}: {empty_message}"
+
+    lines = [f"\n📁 {result.name}:"]
+
+    for commit in result.commits:
+        if show_date:
+            lines.append(f"  • {commit.hash}: {commit.subject} (by {commit.author}, {commit.date})")
+        else:
+            lines.append(f"  • {commit.hash}: {commit.subject} (by {commit.author})")
+
+        # 해당 커밋에서 변경된 파일 목록
+        file_changes = [change.path for change in commit.files]
+        if file_changes:
+            files_line = f"    변경된 파일 ({len(file_changes)}개): {', '.join(file_changes[:5])}"
+            if len(file_changes) > 5:
+                files_line += f" 외 {len(file_changes) - 5}개"
+            lines.append(files_line)
+
+    return "\n".join(lines) + "\n"
+
+
+def render_commits(results, show_date=False, empty_message="해당 날짜에 커밋이 없습니다."):
+    """여러 저장소의 수집 결과를 하나의 보고서용 문자열로 변환"""
+    return "\n".join(
+        format_repo_commits(result, show_date, empty_message) for result in results
+    )
+
 
 class GitAnalyzer:
     """Git 저장소 분석 클래스"""
     
-    def __init__(self, repositories):
+    def __init__(self, repositories, max_workers=None, timeout=60, index=None,
+                 date_field=None, timezone=None, backend=None, all_refs=None, graph=None, diff_digest=None):
         """
         Args:
             repositories: 분석할 저장소 경로 리스트
+            max_workers: 동시에 분석할 저장소 수 (None이면 저장소 수와 CPU 수 기준 자동, 1이면 순차 실행)
+            timeout: 저장소별 git 명령어 제한 시간(초), None이면 제한 없음
+            index: 커밋 조회에 사용할 CommitIndex (None이면 매번 git log 실행)
+            date_field: 커밋을 날짜에 배정할 기준 시각 'commit' 또는 'author'
+                (없으면 COMMIT_DATE_FIELD 환경변수, 기본 'commit' — git log --since/--until과 동일)
+            timezone: 날짜 경계를 계산할 시간대 이름 (예: 'Asia/Seoul', 없으면 REPORT_TIMEZONE 환경변수 또는 로컬 시간대)
+            backend: 색인이 없을 때의 조회 방식 'cli' 또는 'objects' (없으면 GIT_BACKEND 환경변수, 기본 'cli')
+            all_refs: HEAD뿐 아니라 모든 브랜치/태그의 커밋 수집 (없으면 GIT_ALL_REFS 환경변수, 기본 False)
+            graph: 모든 참조 조회에 사용할 CommitGraph (all_refs인데 없으면 기본 캐시 경로로 생성)
+            diff_digest: 수집한 커밋에 변경 내용 요약 추가 (없으면 DIFF_DIGEST 환경변수, 기본 False)
         """
         self.repositories = repositories
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.index = index
+        self.date_field = date_field or os.getenv('COMMIT_DATE_FIELD', 'commit')
+        if self.date_field not in DATE_FIELDS:
+            raise ValueError(f"date_field는 {', '.join(DATE_FIELDS)} 중 하나여야 합니다: {self.date_field}")
+        timezone = timezone or os.getenv('REPORT_TIMEZONE')
+        self.timezone = ZoneInfo(timezone) if timezone else None
+        self.backend = backend or os.getenv('GIT_BACKEND', 'cli')
+        if self.backend not in BACKENDS:
+            raise ValueError(f"backend는 {', '.join(BACKENDS)} 중 하나여야 합니다: {self.backend}")
+        # objects 방식에서 저장소별로 열어 둔 GitRepository (팩 파일 mmap과 객체 캐시 재사용)
+        self._object_repos = {}
+        self._object_repos_lock = threading.Lock()
+
+        if all_refs is None:
+            all_refs = os.getenv('GIT_ALL_REFS', '').lower() in ('1', 'true', 'yes')
+        if graph is None and all_refs:
+            from commit_graph import CommitGraph
+            graph = CommitGraph()
+        self.graph = graph
+
+        if diff_digest is None:
+            diff_digest = os.getenv('DIFF_DIGEST', '').lower() in ('1', 'true', 'yes')
+        self.diff_digest = diff_digest
     
     def is_git_repository(self, path):
         """Git 저장소인지 확인"""
         return os.path.exists(os.path.join(path, '.git'))
     
-    def get_commits_for_date(self, repo_path, date, author=None):
-        """특정 날짜의 커밋 정보 추출"""
-        if not self.is_git_repository(repo_path):
-            return f"❌ {os.path.basename(repo_path)}: Git 저장소가 아닙니다."
-        
+    def _run_git_log(self, repo_path, since, until, author=None):
+        """커밋 메타데이터와 파일 통계를 git log 한 번으로 수집
+
+        레코드 구분자로 시작하는 --pretty 헤더 뒤에 --numstat 결과가 이어지므로
+        저장소 히스토리를 한 번만 순회하면서 커밋별 파일 통계를 얻을 수 있습니다.
+        출력은 스트리밍으로 파싱하므로 기간이 길어도 메모리 사용량이 커밋 하나 분량으로 유지됩니다.
+        """
+        cmd = [
+            'git', '-C', repo_path, 'log',
+            '--since', since,
+            f'--pretty=format:{LOG_FORMAT}',
+            '--date=short',
+            '--numstat'
+        ]
+
+        if until:
+            cmd.extend(['--until', until])
+
+        # 작성자 필터 추가
+        if author:
+            cmd.extend(['--author', author])
+
+        yield from parse_git_log(iter_git_output(cmd, timeout=self.timeout))
+
+    def _run_git_no_walk(self, repo_path, hashes):
+        """주어진 커밋들의 레코드를 목록 순서대로 git log 한 번으로 수집"""
+        cmd = [
+            'git', '-C', repo_path, 'log', '--no-walk=unsorted', '--stdin',
+            f'--pretty=format:{LOG_FORMAT}',
+            '--date=short',
+            '--numstat'
+        ]
+        revisions = "".join(f"{commit_hash}\n" for commit_hash in hashes)
+        yield from parse_git_log(iter_git_output(cmd, timeout=self.timeout, input=revisions))
+
+    def _commit_records(self, repo_path, hashes):
+        """커밋 해시 목록의 레코드 (objects 방식이면 직접 읽고, 실패하면 git 명령어로 대체)"""
+        if not hashes:
+            return []
+
+        if self.backend == 'objects':
+            from git_objects import GitObjectError
+
+            try:
+                return list(self._object_repository(repo_path).commit_records(hashes))
+            except (GitObjectError, OSError, ValueError, IndexError) as e:
+                metrics.increment('git_objects_fallback')
+                print(f"⚠️ {os.path.basename(repo_path)}: 객체 직접 읽기 실패, git 명령어로 대체합니다 ({e})")
+
+        return list(self._run_git_no_walk(repo_path, hashes))
+
+    def _object_repository(self, repo_path):
+        """저장소별 GitRepository (처음 요청할 때 열고 이후 재사용)"""
+        from git_objects import GitRepository
+
+        with self._object_repos_lock:
+            repo = self._object_repos.get(repo_path)
+            if repo is None:
+                repo = self._object_repos[repo_path] = GitRepository(repo_path)
+            return repo
+
+    def _read_objects_log(self, repo_path, since, until, author=None):
+        """git 프로세스 없이 객체를 직접 읽어 커밋 레코드 수집 (지원하지 않는 저장소면 None)"""
+        from git_objects import GitObjectError
+
         try:
-            # Git log 명령어 구성
-            cmd = [
-                'git', '-C', repo_path, 'log',
-                '--since', f'{date} 00:00:00',
-                '--until', f'{date} 23:59:59',
-                '--pretty=format:%h|%s|%an|%ad|%D',
-                '--date=short'
-            ]
-            
-            # 작성자 필터 추가
-            if author:
-                cmd.extend(['--author', author])
-            
-            # Git 명령어 실행
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            
-            commits = result.stdout.strip()
-            if not commits:
-                return f"📁 {os.path.basename(repo_path)}: 해당 날짜에 커밋이 없습니다."
-            
-            # 커밋 정보 포맷팅
+            with metrics.span('git_objects', repo=os.path.basename(repo_path)):
+                repo = self._object_repository(repo_path)
+                return list(repo.iter_log(
+                    since=to_timestamp(since), until=to_timestamp(until) if until else None, author=author
+                ))
+        except (GitObjectError, OSError, ValueError, IndexError) as e:
+            metrics.increment('git_objects_fallback')
+            print(f"⚠️ {os.path.basename(repo_path)}: 객체 직접 읽기 실패, git 명령어로 대체합니다 ({e})")
+            return None
+
+    def iter_commits(self, repo_path, since, until, author=None):
+        """저장소의 기간 내 커밋 레코드를 최신순으로 생성
+
+        모든 참조 조회(graph)이면 그래프를, 색인이 있으면 색인을 증분 갱신한 뒤 조회합니다.
+
+        Args:
+            repo_path: 저장소 경로
+            since: 시작 시각 ('YYYY-MM-DD HH:MM:SS')
+            until: 종료 시각 ('YYYY-MM-DD HH:MM:SS', None이면 제한 없음)
+            author: 작성자 필터
+
+        Yields:
+            Commit
+        """
+        if self.graph is not None:
+            # 모든 브랜치 조회: 그래프에서 기간/작성자로 고른 커밋만 상세 정보를 읽음
             repo_name = os.path.basename(repo_path)
-            formatted_commits = f"\n📁 {repo_name}:\n"
-            
-            for line in commits.split('\n'):
-                if line.strip():
-                    parts = line.split('|')
-                    if len(parts) >= 4:
-                        hash_short = parts[0]
-                        message = parts[1]
-                        author_name = parts[2]
-                        date_str = parts[3]
-                        formatted_commits += f"  • {hash_short}: {message} (by {author_name})\n"
-            
-            # 변경된 파일 통계 추가
-            stats_cmd = [
-                'git', '-C', repo_path, 'log',
-                '--since', f'{date} 00:00:00',
-                '--until', f'{date} 23:59:59',
-                '--stat', '--oneline'
-            ]
-            
-            if author:
-                stats_cmd.extend(['--author', author])
-            
-            stats_result = subprocess.run(
-                stats_cmd,
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            
-            if stats_result.stdout.strip():
-                # 변경된 파일 수 계산
-                lines = stats_result.stdout.strip().split('\n')
-                file_changes = []
-                for line in lines:
-                    if '|' in line and ('+' in line or '-' in line):
-                        filename = line.split('|')[0].strip()
-                        if filename and not filename.startswith(' '):
-                            file_changes.append(filename)
-                
-                if file_changes:
-                    formatted_commits += f"    변경된 파일 ({len(file_changes)}개): {', '.join(file_changes[:5])}"
-                    if len(file_changes) > 5:
-                        formatted_commits += f" 외 {len(file_changes) - 5}개"
-                    formatted_commits += "\n"
-            
-            return formatted_commits
-            
+            with metrics.span('graph_update', repo=repo_name):
+                self.graph.update(repo_path, timeout=self.timeout)
+            with metrics.span('graph_query', repo=repo_name):
+                hashes = self.graph.query(repo_path, since, until, author)
+            yield from self._commit_records(repo_path, hashes)
+            return
+
+        if self.index is not None:
+            repo_name = os.path.basename(repo_path)
+            with metrics.span('index_update', repo=repo_name):
+                self.index.update(repo_path, timeout=self.timeout)
+            with metrics.span('index_query', repo=repo_name):
+                commits = self.index.query(repo_path, since, until, author)
+            yield from commits
+            return
+
+        if self.backend == 'objects':
+            commits = self._read_objects_log(repo_path, since, until, author)
+            if commits is not None:
+                yield from commits
+                return
+
+        yield from self._run_git_log(repo_path, since, until, author)
+
+    def collect_repo_commits(self, repo_path, since, until, author=None):
+        """저장소 하나의 커밋 수집 (오류는 예외 대신 RepoCommits.error로 반환)"""
+        if not os.path.exists(repo_path):
+            return RepoCommits(repo_path, error="경로가 존재하지 않습니다.")
+
+        if not self.is_git_repository(repo_path):
+            return RepoCommits(repo_path, error="Git 저장소가 아닙니다.")
+
+        try:
+            with metrics.span('git_collect', repo=os.path.basename(repo_path)):
+                return RepoCommits(repo_path, list(self.iter_commits(repo_path, since, until, author)))
+        except subprocess.TimeoutExpired:
+            return RepoCommits(repo_path, error=f"Git 명령어 시간 초과 ({self.timeout}초)")
         except subprocess.CalledProcessError as e:
-            return f"❌ {os.path.basename(repo_path)}: Git 명령어 실행 실패 - {str(e)}"
+            return RepoCommits(repo_path, error=f"Git 명령어 실행 실패 - {str(e)}")
         except Exception as e:
-            return f"❌ {os.path.basename(repo_path)}: 오류 발생 - {str(e)}"
+            return RepoCommits(repo_path, error=f"오류 발생 - {str(e)}")
+
+    def _day_start(self, date_string, days=0):
+        """설정된 시간대에서 해당 날짜(+days일)가 시작하는 시각 (시간대 정보 포함)"""
+        day = datetime.strptime(date_string, '%Y-%m-%d') + timedelta(days=days)
+        return day.replace(tzinfo=self.timezone) if self.timezone else day.astimezone()
+
+    def commit_day(self, commit):
+        """설정된 기준 시각과 시간대로 커밋이 속한 날짜 ('YYYY-MM-DD')"""
+        timestamp = commit.timestamp if self.date_field == 'author' else commit.commit_timestamp
+        return datetime.fromtimestamp(timestamp, self.timezone).strftime('%Y-%m-%d')
+
+    def collect_repo_range(self, repo_path, start_date, end_date, author=None):
+        """저장소 하나의 start_date ~ end_date (설정된 시간대 기준) 커밋을 히스토리 한 번 순회로 수집
+
+        작성 시각 기준이면 작성 후 나중에 커밋된 경우(rebase, cherry-pick 등)도 포함하도록
+        종료 시각 없이 조회한 뒤 작성 시각으로 거릅니다.
+        """
+        # git --since/--until과 색인은 로컬 시각 문자열을 받으므로 설정된 시간대의 경계를 로컬 시각으로 변환
+        start = self._day_start(start_date)
+        end = self._day_start(end_date, days=1) - timedelta(seconds=1)
+        since = start.astimezone().strftime('%Y-%m-%d %H:%M:%S')
+        until = None if self.date_field == 'author' else end.astimezone().strftime('%Y-%m-%d %H:%M:%S')
+
+        result = self.collect_repo_commits(repo_path, since, until, author)
+        if self.date_field == 'author':
+            start_timestamp, end_timestamp = int(start.timestamp()), int(end.timestamp())
+            result.commits = [
+                commit for commit in result.commits
+                if start_timestamp <= commit.timestamp <= end_timestamp
+            ]
+        return result
+
+    def get_commits_for_date(self, repo_path, date, author=None):
+        """특정 날짜의 커밋 정보 추출"""
+        return format_repo_commits(self.collect_repo_range(repo_path, date, date, author))
     
     def get_commits_for_date_range(self, repo_path, start_date, end_date, author=None):
         """특정 날짜 범위의 커밋 정보 추출"""
-        if not self.is_git_repository(repo_path):
-            return f"❌ {os.path.basename(repo_path)}: Git 저장소가 아닙니다."
-        
-        try:
-            # Git log 명령어 구성
-            cmd = [
-                'git', '-C', repo_path, 'log',
-                '--since', f'{start_date} 00:00:00',
-                '--until', f'{end_date} 23:59:59',
-                '--pretty=format:%h|%s|%an|%ad|%D',
-                '--date=short'
-            ]
-            
-            # 작성자 필터 추가
-            if author:
-                cmd.extend(['--author', author])
-            
-            # Git 명령어 실행
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            
-            commits = result.stdout.strip()
-            if not commits:
-                return f"📁 {os.path.basename(repo_path)}: 해당 기간에 커밋이 없습니다."
-            
-            # 커밋 정보 포맷팅
-            repo_name = os.path.basename(repo_path)
-            formatted_commits = f"\n📁 {repo_name}:\n"
-            
-            for line in commits.split('\n'):
-                if line.strip():
-                    parts = line.split('|')
-                    if len(parts) >= 4:
-                        hash_short = parts[0]
-                        message = parts[1]
-                        author_name = parts[2]
-                        date_str = parts[3]
-                        formatted_commits += f"  • {hash_short}: {message} (by {author_name}, {date_str})\n"
-            
-            # 변경된 파일 통계 추가
-            stats_cmd = [
-                'git', '-C', repo_path, 'log',
-                '--since', f'{start_date} 00:00:00',
-                '--until', f'{end_date} 23:59:59',
-                '--stat', '--oneline'
-            ]
-            
-            if author:
-                stats_cmd.extend(['--author', author])
-            
-            stats_result = subprocess.run(
-                stats_cmd,
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            
-            if stats_result.stdout.strip():
-                # 변경된 파일 수 계산
-                lines = stats_result.stdout.strip().split('\n')
-                file_changes = []
-                for line in lines:
-                    if '|' in line and ('+' in line or '-' in line):
-                        filename = line.split('|')[0].strip()
-                        if filename and not filename.startswith(' '):
-                            file_changes.append(filename)
-                
-                if file_changes:
-                    formatted_commits += f"    변경된 파일 ({len(file_changes)}개): {', '.join(file_changes[:5])}"
-                    if len(file_changes) > 5:
-                        formatted_commits += f" 외 {len(file_changes) - 5}개"
-                    formatted_commits += "\n"
-            
-            return formatted_commits
-            
-        except subprocess.CalledProcessError as e:
-            return f"❌ {os.path.basename(repo_path)}: Git 명령어 실행 실패 - {str(e)}"
-        except Exception as e:
-            return f"❌ {os.path.basename(repo_path)}: 오류 발생 - {str(e)}"
+        result = self.collect_repo_range(repo_path, start_date, end_date, author)
+        return format_repo_commits(result, show_date=True, empty_message="해당 기간에 커밋이 없습니다.")
+
+    def _analyze_repositories(self, analyze_repo, items=None):
+        """모든 저장소(또는 items)에 분석 함수를 동시에 적용 (결과는 목록 순서 유지)"""
+        items = self.repositories if items is None else items
+        if self.max_workers == 1 or len(items) <= 1:
+            return [analyze_repo(item) for item in items]
+
+        # git 명령어는 I/O 대기 위주이므로 스레드 풀로 충분히 병렬화됨
+        # (느린 저장소는 self.timeout에서 끊기므로 다른 저장소 결과를 막지 않음)
+        max_workers = self.max_workers or min(len(items), (os.cpu_count() or 1) + 4)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(analyze_repo, items))
+
+    def collect_commits_for_date(self, date, author=None):
+        """모든 저장소의 특정 날짜 커밋 레코드 수집
+
+        Returns:
+            저장소 목록 순서의 RepoCommits 리스트
+        """
+        print(f"📊 분석 대상 저장소: {len(self.repositories)}개")
+
+        results = self._analyze_repositories(
+            lambda repo_path: self.collect_repo_range(repo_path, date, date, author)
+        )
+        if self.diff_digest:
+            self.attach_diff_digests(results)
+        return results
+
+    def collect_commits_for_date_range(self, start_date, end_date, author=None):
+        """모든 저장소의 특정 날짜 범위 커밋 레코드 수집
+
+        Returns:
+            저장소 목록 순서의 RepoCommits 리스트
+        """
+        print(f"📊 분석 대상 저장소: {len(self.repositories)}개")
+        print(f"📅 분석 기간: {start_date} ~ {end_date}")
+
+        results = self._analyze_repositories(
+            lambda repo_path: self.collect_repo_range(repo_path, start_date, end_date, author)
+        )
+        if self.diff_digest:
+            self.attach_diff_digests(results)
+        return results
+
+    def attach_diff_digests(self, results, day_bytes=None):
+        """수집한 커밋에 변경 내용 요약(FileDigest)을 채움
+
+        저장소마다 git log -p를 한 번만 실행하고, 날짜(설정된 기준 시각/시간대)별로
+        모든 저장소의 요약을 합쳐 바이트 예산 안으로 줄입니다.
+
+        Args:
+            results: 저장소 목록 순서의 RepoCommits 리스트 (Commit.digest를 제자리에서 채움)
+            day_bytes: 날짜별 최대 바이트 (없으면 DIFF_DIGEST_DAY_BYTES 환경변수 또는 기본값)
+        """
+        from diff_digest import apply_day_budget, read_repo_digests
+
+        def read_digests(result):
+            hashes = [commit.full_hash for commit in result.commits]
+            if not hashes:
+                return {}
+            try:
+                with metrics.span('diff_digest', repo=result.name):
+                    return read_repo_digests(result.repo_path, hashes, timeout=self.timeout)
+            except (subprocess.TimeoutExpired, subprocess.CalledProcessError) as e:
+                # 요약은 부가 정보이므로 실패해도 커밋 정보만으로 계속 진행
+                print(f"⚠️ {result.name}: 변경 내용 요약 실패 ({e})")
+                return {}
+
+        per_repo = self._analyze_repositories(read_digests, results)
+
+        by_day = {}
+        for result, digests in zip(results, per_repo):
+            for commit in result.commits:
+                commit.digest = digests.get(commit.full_hash, [])
+                by_day.setdefault(self.commit_day(commit), []).append(commit)
+
+        for commits in by_day.values():
+            kept = {id(digest) for digest in apply_day_budget(
+                [digest for commit in commits for digest in commit.digest], day_bytes
+            )}
+            for commit in commits:
+                commit.digest = [digest for digest in commit.digest if id(digest) in kept]
+
+    def split_by_day(self, results, days):
+        """기간 수집 결과를 설정된 기준 시각/시간대에 따라 날짜별 결과로 분리
+
+        Args:
+            results: 저장소 목록 순서의 RepoCommits 리스트
+            days: 나눌 날짜 ('YYYY-MM-DD') 리스트 (그 외 날짜의 커밋은 제외)
+
+        Returns:
+            {날짜: 저장소 목록 순서의 RepoCommits 리스트}
+        """
+        by_day = {day: [] for day in days}
+
+        for result in results:
+            day_commits = {day: [] for day in days}
+            for commit in result.commits:
+                day = self.commit_day(commit)
+                if day in day_commits:
+                    day_commits[day].append(commit)
+
+            for day in days:
+                by_day[day].append(RepoCommits(result.repo_path, day_commits[day], result.error))
+
+        return by_day
+
+    def collect_commits_by_day(self, start_date, end_date, author=None, days=None) -> Dict[str, List[RepoCommits]]:
+        """여러 날짜의 커밋을 저장소별 히스토리 한 번 순회로 수집해 날짜별로 분리
+
+        날짜마다 git log를 따로 실행하면 매번 HEAD부터 최근 히스토리를 다시 순회하므로,
+        기간 전체를 한 번에 읽은 뒤 메모리에서 날짜별로 나눕니다.
+
+        Args:
+            start_date: 시작일 ('YYYY-MM-DD')
+            end_date: 종료일 ('YYYY-MM-DD')
+            author: 작성자 필터
+            days: 결과에 포함할 날짜 리스트 (없으면 기간 내 모든 날짜)
+
+        Returns:
+            {날짜: 저장소 목록 순서의 RepoCommits 리스트}
+        """
+        if days is None:
+            start = datetime.strptime(start_date, '%Y-%m-%d')
+            end = datetime.strptime(end_date, '%Y-%m-%d')
+            days = [(start + timedelta(days=i)).strftime('%Y-%m-%d') for i in range((end - start).days + 1)]
+
+        return self.split_by_day(self.collect_commits_for_date_range(start_date, end_date, author), days)
 
     def analyze_commits_for_date(self, date, author=None):
         """모든 저장소의 특정 날짜 커밋 분석"""
-        all_commits = []
-        
-        print(f"📊 분석 대상 저장소: {len(self.repositories)}개")
-        
-        for repo_path in self.repositories:
-            if not os.path.exists(repo_path):
-                all_commits.append(f"❌ {os.path.basename(repo_path)}: 경로가 존재하지 않습니다.")
-                continue
-            
-            commits = self.get_commits_for_date(repo_path, date, author)
-            all_commits.append(commits)
-        
-        return "\n".join(all_commits)
+        return render_commits(self.collect_commits_for_date(date, author))
     
     def analyze_commits_for_date_range(self, start_date, end_date, author=None):
         """모든 저장소의 특정 날짜 범위 커밋 분석"""
-        all_commits = []
-        
-        print(f"📊 분석 대상 저장소: {len(self.repositories)}개")
-        print(f"📅 분석 기간: {start_date} ~ {end_date}")
-        
-        for repo_path in self.repositories:
-            if not os.path.exists(repo_path):
-                all_commits.append(f"❌ {os.path.basename(repo_path)}: 경로가 존재하지 않습니다.")
-                continue
-            
-            commits = self.get_commits_for_date_range(repo_path, start_date, end_date, author)
-            all_commits.append(commits)
-        
-        return "\n".join(all_commits)
+        results = self.collect_commits_for_date_range(start_date, end_date, author)
+        return render_commits(results, show_date=True, empty_message="해당 기간에 커밋이 없습니다.")
     
     def get_repository_status(self):
         """저장소 상태 확인"""
@@ -0,0 +1,1013 @@
+"""
+Git 객체 직접 읽기 모듈
+git 프로세스를 실행하지 않고 .git 디렉터리의 참조, loose 객체, 팩 파일(.idx v2 + mmap)을 직접 읽어
+git log --numstat과 같은 커밋 레코드(Commit)를 만듭니다.
+
+지원하지 않는 저장소 구조(SHA-256 저장소, 다른 팩 인덱스 버전 등)나 손상된 객체를 만나면
+GitObjectError를 발생시키므로 호출하는 쪽에서 git CLI로 대체합니다.
+라인 수는 xdiff와 같은 전처리 후 Myers 최소 편집 거리로 계산합니다.
+rename은 내용이 완전히 같은 경우를 직접 감지하고, 그 외에 짝이 없는 삭제/추가 파일이 남은 커밋
+(이름과 내용이 함께 바뀌었을 수 있는 경우)만 git diff-tree -M으로 계산해 git log와 같은 결과를 냅니다.
+"""
+
+import heapq
+import mmap
+import os
+import struct
+import subprocess
+import threading
+import zlib
+from collections import Counter, OrderedDict
+from datetime import datetime, timedelta, timezone
+
+from git_analyzer import Commit, FileChange, author_matcher, iter_git_output
+from metrics import metrics
+
+OBJ_COMMIT = 1
+OBJ_TREE = 2
+OBJ_BLOB = 3
+OBJ_TAG = 4
+OBJ_OFS_DELTA = 6
+OBJ_REF_DELTA = 7
+
+TYPE_NAMES = {OBJ_COMMIT: b'commit', OBJ_TREE: b'tree', OBJ_BLOB: b'blob', OBJ_TAG: b'tag'}
+TYPE_IDS = {name: type_id for type_id, name in TYPE_NAMES.items()}
+
+# git diff와 같이 앞부분 8000바이트에 NUL이 있으면 바이너리로 취급
+BINARY_CHECK_BYTES = 8000
+
+# 델타 기준 객체 등을 재사용하기 위한 캐시 크기 (바이트)
+OBJECT_CACHE_BYTES = 32 * 1024 * 1024
+
+# 파싱한 커밋/트리와 커밋별 변경 파일 통계를 보관할 개수
+PARSED_CACHE_SIZE = 16384
+
+# xdiff(git diff 구현)의 라인 전처리 상수
+MAX_EQLIMIT = 1024
+SIMSCAN_WINDOW = 100
+KPDIS_RUN = 4
+
+TREE_MODE = b'40000'
+
+GITLINK_MODE = b'160000'
+
+# 경로 인용 시 이름 있는 이스케이프로 표시하는 문자 (그 외 제어/ASCII 외 문자는 8진수)
+C_ESCAPES = {0x07: '\\a', 0x08: '\\b', 0x09: '\\t', 0x0a: '\\n', 0x0b: '\\v', 0x0c: '\\f', 0x0d: '\\r',
+             0x22: '\\"', 0x5c: '\\\\'}
+
+
+class GitObjectError(Exception):
+    """저장소를 직접 읽을 수 없는 경우 (git CLI로 대체해야 함)"""
+
+
+def _git_dir(repo_path):
+    """작업 트리 경로에서 .git 디렉터리 찾기 ('gitdir: ...' 파일 형식의 worktree/submodule 포함)"""
+    git_path = os.path.join(repo_path, '.git')
+    if os.path.isdir(git_path):
+        return git_path
+
+    if os.path.isfile(git_path):
+        with open(git_path) as f:
+            content = f.read().strip()
+        if content.startswith('gitdir: '):
+            return os.path.normpath(os.path.join(repo_path, content[len('gitdir: '):]))
+
+    raise GitObjectError(f"Git 저장소가 아닙니다: {repo_path}")
+
+
+class PackFile:
+    """팩 파일 하나 (.idx v2 인덱스와 .pack 데이터를 mmap으로 읽음)"""
+
+    def __init__(self, idx_path):
+        self.idx_path = idx_path
+        self.pack_path = idx_path[:-len('.idx')] + '.pack'
+
+        with open(idx_path, 'rb') as f:
+            self.idx = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        with open(self.pack_path, 'rb') as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self.idx[:8] != b'\xfftOc\x00\x00\x00\x02':
+            self.close()
+            raise GitObjectError(f"지원하지 않는 팩 인덱스 형식입니다: {idx_path}")
+        if self.data[:4] != b'PACK':
+            self.close()
+            raise GitObjectError(f"올바른 팩 파일이 아닙니다: {self.pack_path}")
+
+        self.fanout = struct.unpack_from('>256I', self.idx, 8)
+        self.count = self.fanout[255]
+        self._names_at = 8 + 256 * 4
+        self._offsets_at = self._names_at + 24 * self.count  # 해시(20) + CRC(4)
+        self._large_offsets_at = self._offsets_at + 4 * self.count
+
+    def close(self):
+        self.idx.close()
+        self.data.close()
+
+    def _name(self, position):
+        start = self._names_at + 20 * position
+        return self.idx[start:start + 20]
+
+    def find(self, sha):
+        """20바이트 객체 해시의 팩 내 위치 (없으면 None)"""
+        first = sha[0]
+        low = self.fanout[first - 1] if first else 0
+        high = self.fanout[first]
+
+        while low < high:
+            middle = (low + high) // 2
+            name = self._name(middle)
+            if name < sha:
+                low = middle + 1
+            elif name > sha:
+                high = middle
+            else:
+                offset, = struct.unpack_from('>I', self.idx, self._offsets_at + 4 * middle)
+                if offset & 0x80000000:
+                    # 2GB 이상 위치는 별도 8바이트 테이블에 있음
+                    offset, = struct.unpack_from(
+                        '>Q', self.idx, self._large_offsets_at + 8 * (offset & 0x7fffffff)
+                    )
+                return offset
+
+        return None
+
+
+def _inflate(data, offset, size):
+    """offset부터 zlib 압축된 size 바이트 데이터 풀기 (압축 길이를 모르므로 조금씩 읽음)"""
+    decompressor = zlib.decompressobj()
+    chunk = max(size + 64, 512)
+    output = []
+    length = 0
+    while not decompressor.eof:
+        if offset >= len(data):
+            raise GitObjectError("팩 데이터가 잘렸습니다.")
+        part = decompressor.decompress(data[offset:offset + chunk])
+        output.append(part)
+        length += len(part)
+        offset += chunk
+    result = b''.join(output)
+    if length != size:
+        raise GitObjectError("팩 객체 크기가 맞지 않습니다.")
+    return result
+
+
+def _delta_size(delta, position):
+    """델타 헤더의 가변 길이 정수 읽기"""
+    size = 0
+    shift = 0
+    while True:
+        byte = delta[position]
+        position += 1
+        size |= (byte & 0x7f) << shift
+        shift += 7
+        if not byte & 0x80:
+            return size, position
+
+
+def apply_delta(base, delta):
+    """git 델타(복사/삽입 명령)를 기준 객체에 적용"""
+    source_size, position = _delta_size(delta, 0)
+    target_size, position = _delta_size(delta, position)
+    if source_size != len(base):
+        raise GitObjectError("델타 기준 객체 크기가 맞지 않습니다.")
+
+    parts = []
+    end = len(delta)
+    while position < end:
+        opcode = delta[position]
+        position += 1
+        if opcode & 0x80:
+            # 기준 객체에서 복사: 비트가 켜진 바이트만 offset/size에 포함
+            copy_offset = 0
+            for i in range(4):
+                if opcode & (1 << i):
+                    copy_offset |= delta[position] << (8 * i)
+                    position += 1
+            copy_size = 0
+            for i in range(3):
+                if opcode & (1 << (4 + i)):
+                    copy_size |= delta[position] << (8 * i)
+                    position += 1
+            parts.append(base[copy_offset:copy_offset + (copy_size or 0x10000)])
+        elif opcode:
+            parts.append(delta[position:position + opcode])
+            position += opcode
+        else:
+            raise GitObjectError("잘못된 델타 명령입니다.")
+
+    result = b''.join(parts)
+    if len(result) != target_size:
+        raise GitObjectError("델타 적용 결과 크기가 맞지 않습니다.")
+    return result
+
+
+class CommitObject:
+    """파싱된 커밋 객체"""
+
+    __slots__ = ('sha', 'tree', 'parents', 'author', 'email', 'author_time', 'author_offset',
+                 'commit_time', 'subject')
+
+    def __init__(self, sha, raw):
+        self.sha = sha
+        self.parents = []
+        self.tree = None
+        self.author = self.email = ''
+        self.author_time = self.commit_time = self.author_offset = 0
+
+        header, _, message = raw.partition(b'\n\n')
+        for line in header.split(b'\n'):
+            # 여러 줄 헤더(gpgsig 등)의 이어지는 줄은 공백으로 시작
+            if line.startswith(b' '):
+                continue
+            key, _, value = line.partition(b' ')
+            if key == b'tree':
+                self.tree = value.decode()
+            elif key == b'parent':
+                self.parents.append(value.decode())
+            elif key == b'author':
+                self.author, self.email, self.author_time, self.author_offset = _parse_signature(value)
+            elif key == b'committer':
+                _, _, self.commit_time, _ = _parse_signature(value)
+
+        # git %s: 메시지 첫 문단을 한 줄로 합친 제목
+        paragraph = message.lstrip(b'\n').split(b'\n\n', 1)[0]
+        self.subject = ' '.join(
+            line.strip() for line in paragraph.decode('utf-8', errors='replace').split('\n') if line.strip()
+        )
+
+
+def _parse_signature(value):
+    """'이름 <이메일> 시각 시간대' 헤더 값 파싱
+
+    Returns:
+        (이름, 이메일, 유닉스 시간, 시간대 오프셋(분))
+    """
+    name, _, rest = value.partition(b' <')
+    email, _, when = rest.partition(b'> ')
+    parts = when.split()
+    timestamp = int(parts[0]) if parts else 0
+    offset = 0
+    if len(parts) > 1 and len(parts[1]) == 5:
+        tz = parts[1]
+        offset = int(tz[1:3]) * 60 + int(tz[3:5])
+        if tz[:1] == b'-':
+            offset = -offset
+    return (name.decode('utf-8', errors='replace'), email.decode('utf-8', errors='replace'),
+            timestamp, offset)
+
+
+def _tree_entries(raw):
+    """트리 객체를 {이름: (모드, 해시)}로 변환"""
+    entries = {}
+    position = 0
+    end = len(raw)
+    while position < end:
+        space = raw.index(b' ', position)
+        nul = raw.index(b'\0', space)
+        mode = raw[position:space]
+        name = raw[space + 1:nul].decode('utf-8', errors='surrogateescape')
+        entries[name] = (mode, raw[nul + 1:nul + 21].hex())
+        position = nul + 21
+    return entries
+
+
+def _split_lines(data):
+    """git과 같이 '\n'으로만 라인 분리 (마지막 줄바꿈 유무도 구분)"""
+    if not data:
+        return []
+    lines = data.split(b'\n')
+    last = lines.pop()
+    lines = [line + b'\n' for line in lines]
+    if last:
+        lines.append(last)
+    return lines
+
+
+def _bogo_sqrt(n):
+    """xdiff의 xdl_bogosqrt (대략적인 제곱근)"""
+    result = 1
+    while n > 0:
+        result <<= 1
+        n >>= 2
+    return result
+
+
+def _keep_multimatch(dis, i, start, end):
+    """xdiff의 xdl_clean_mmatch 반대: 여러 번 나오는 라인 i를 비교 대상에 남길지 여부
+
+    앞뒤가 짝이 없는 라인(0)과 여러 번 나오는 라인(2)으로 둘러싸여 있으면 버림
+    """
+    start = max(start, i - SIMSCAN_WINDOW)
+    end = min(end, i + SIMSCAN_WINDOW)
+
+    no_match_before, multi_before = 0, 1
+    r = 1
+    while i - r >= start:
+        if dis[i - r] == 0:
+            no_match_before += 1
+        elif dis[i - r] == 2:
+            multi_before += 1
+        else:
+            break
+        r += 1
+    if no_match_before == 0:
+        return True
+
+    no_match_after, multi_after = 0, 1
+    r = 1
+    while i + r <= end:
+        if dis[i + r] == 0:
+            no_match_after += 1
+        elif dis[i + r] == 2:
+            multi_after += 1
+        else:
+            break
+        r += 1
+    if no_match_after == 0:
+        return True
+
+    no_match = no_match_before + no_match_after
+    multi = multi_before + multi_after
+    return not multi * KPDIS_RUN < multi + no_match
+
+
+def _cleanup_records(lines, other_counts, start, end):
+    """xdiff의 xdl_cleanup_records: 상대 파일에 짝이 없는 라인을 미리 변경으로 처리
+
+    Returns:
+        (비교에 남길 라인 리스트, 바로 변경으로 처리한 라인 수)
+    """
+    limit = min(_bogo_sqrt(len(lines)), MAX_EQLIMIT)
+    lines = lines[start:end]
+    dis = []
+    for line in lines:
+        count = other_counts.get(line, 0)
+        dis.append(0 if count == 0 else 2 if count >= limit else 1)
+
+    last = len(lines) - 1
+    kept = [
+        line for i, line in enumerate(lines)
+        if dis[i] == 1 or (dis[i] == 2 and _keep_multimatch(dis, i, 0, last))
+    ]
+    return kept, len(lines) - len(kept)
+
+
+def _line_counts(old, new):
+    """두 blob 내용의 추가/삭제 라인 수 (바이너리면 (None, None))
+
+    git diff(xdiff)와 같이 공통 앞/뒷부분을 자르고, 상대 파일에 짝이 없는 라인을 미리 변경으로 처리한 뒤
+    남은 라인의 최소 편집 거리를 구합니다.
+    """
+    if b'\0' in old[:BINARY_CHECK_BYTES] or b'\0' in new[:BINARY_CHECK_BYTES]:
+        return None, None
+
+    old_lines = _split_lines(old)
+    new_lines = _split_lines(new)
+
+    # 라인별 등장 횟수는 자르기 전 전체 파일 기준 (xdiff 분류기와 동일)
+    if not old_lines or not new_lines:
+        return len(new_lines), len(old_lines)
+    old_counts, new_counts = Counter(old_lines), Counter(new_lines)
+
+    start = 0
+    limit = min(len(old_lines), len(new_lines))
+    while start < limit and old_lines[start] == new_lines[start]:
+        start += 1
+    old_end, new_end = len(old_lines), len(new_lines)
+    while old_end > start and new_end > start and old_lines[old_end - 1] == new_lines[new_end - 1]:
+        old_end -= 1
+        new_end -= 1
+
+    old_kept, deleted = _cleanup_records(old_lines, new_counts, start, old_end)
+    new_kept, added = _cleanup_records(new_lines, old_counts, start, new_end)
+
+    # 최소 편집 스크립트에서는 추가 - 삭제 = 새 라인 수 - 이전 라인 수이므로 편집 거리만 구하면 됨
+    distance = _edit_distance(old_kept, new_kept)
+    growth = len(new_kept) - len(old_kept)
+    return added + (distance + growth) // 2, deleted + (distance - growth) // 2
+
+
+def _edit_distance(old_lines, new_lines):
+    """Myers 알고리즘으로 라인 단위 최소 편집 거리(추가 + 삭제 수) 계산"""
+    ids = {}
+    old = [ids.setdefault(line, len(ids)) for line in old_lines]
+    new = [ids.setdefault(line, len(ids)) for line in new_lines]
+    n, m = len(old), len(new)
+    if not n or not m:
+        return n + m
+
+    furthest = {1: 0}
+    for distance in range(n + m + 1):
+        for k in range(-distance, distance + 1, 2):
+            if k == -distance or (k != distance and furthest[k - 1] < furthest[k + 1]):
+                x = furthest[k + 1]
+            else:
+                x = furthest[k - 1] + 1
+            y = x - k
+            while x < n and y < m and old[x] == new[y]:
+                x += 1
+                y += 1
+            if x >= n and y >= m:
+                return distance
+            furthest[k] = x
+    return n + m
+
+
+def _tree_sort_key(name, mode):
+    # git은 트리를 "이름/"으로 취급해 정렬
+    return name + '/' if mode == TREE_MODE else name
+
+
+def _quote_path(path):
+    """git의 core.quotePath 기본 동작과 같이 특수 문자나 ASCII 외 문자가 있는 경로를 C 문자열 형식으로 인용"""
+    raw = path.encode('utf-8', errors='surrogateescape')
+    if not any(byte < 0x20 or byte >= 0x7f or byte in b'"\\' for byte in raw):
+        return path
+
+    quoted = []
+    for byte in raw:
+        if byte in C_ESCAPES:
+            quoted.append(C_ESCAPES[byte])
+        elif byte < 0x20 or byte >= 0x7f:
+            quoted.append(f"\\{byte:03o}")
+        else:
+            quoted.append(chr(byte))
+    return '"' + ''.join(quoted) + '"'
+
+
+def _rename_path(old, new):
+    """git의 이름 변경 표시 형식 (예: 'src/{a.py => b.py}', 'a.py => b.py')"""
+    if _quote_path(old) != old or _quote_path(new) != new:
+        return f"{_quote_path(old)} => {_quote_path(new)}"
+
+    # 공통 앞부분/뒷부분은 '/' 경계까지만 묶음
+    prefix = 0
+    for i, (a, b) in enumerate(zip(old, new)):
+        if a != b:
+            break
+        if a == '/':
+            prefix = i + 1
+
+    suffix = 0
+    i, j = len(old) - 1, len(new) - 1
+    floor = prefix - 1 if prefix else 0
+    while i >= floor and j >= floor and old[i] == new[j]:
+        if old[i] == '/':
+            suffix = len(old) - i
+        i -= 1
+        j -= 1
+
+    old_middle = old[prefix:max(len(old) - suffix, prefix)]
+    new_middle = new[prefix:max(len(new) - suffix, prefix)]
+    if prefix + suffix:
+        return f"{old[:prefix]}{{{old_middle} => {new_middle}}}{old[len(old) - suffix:]}"
+    return f"{old_middle} => {new_middle}"
+
+
+def _has_rename_candidates(changes, renames):
+    """완전 일치 rename으로 묶이지 않은 삭제 파일과 추가 파일이 함께 남아 있는지 (유사도 기반 rename 후보)"""
+    sources = set(renames.values())
+    deleted = added = False
+    for path, old_entry, new_entry in changes:
+        if new_entry is None:
+            deleted = deleted or (old_entry[0] != GITLINK_MODE and path not in sources)
+        elif old_entry is None:
+            added = added or (new_entry[0] != GITLINK_MODE and path not in renames)
+    return deleted and added
+
+
+def _exact_renames(changes):
+    """내용이 같은 삭제/추가 파일 짝 찾기 (git의 완전 일치 rename 감지, 같은 파일 이름을 우선)
+
+    Returns:
+        {새 경로: 이전 경로}
+    """
+    deleted = {}
+    for path, old_entry, new_entry in changes:
+        if new_entry is None and old_entry[0] != GITLINK_MODE:
+            deleted.setdefault(old_entry[1], []).append(path)
+
+    renames = {}
+    if not deleted:
+        return renames
+
+    for path, old_entry, new_entry in changes:
+        if old_entry is not None or new_entry[0] == GITLINK_MODE:
+            continue
+        sources = deleted.get(new_entry[1])
+        if not sources:
+            continue
+        basename = path.rsplit('/', 1)[-1]
+        source = next((source for source in sources if source.rsplit('/', 1)[-1] == basename), sources[0])
+        sources.remove(source)
+        renames[path] = source
+
+    return renames
+
+
+class GitRepository:
+    """.git 디렉터리를 직접 읽는 저장소 클래스 (스레드 안전)"""
+
+    def __init__(self, repo_path):
+        """
+        Args:
+            repo_path: 작업 트리 경로
+        """
+        self.repo_path = repo_path
+        self.git_dir = _git_dir(repo_path)
+
+        # worktree는 객체와 참조 대부분을 공통 디렉터리에 둠
+        self.common_dir = self.git_dir
+        commondir_file = os.path.join(self.git_dir, 'commondir')
+        if os.path.exists(commondir_file):
+            with open(commondir_file) as f:
+                self.common_dir = os.path.normpath(os.path.join(self.git_dir, f.read().strip()))
+
+        self._check_format()
+
+        self.object_dirs = [os.path.join(self.common_dir, 'objects')]
+        alternates = os.path.join(self.object_dirs[0], 'info', 'alternates')
+        if os.path.exists(alternates):
+            with open(alternates) as f:
+                for line in f:
+                    line = line.strip()
+                    if line and not line.startswith('#'):
+                        self.object_dirs.append(os.path.normpath(os.path.join(self.object_dirs[0], line)))
+
+        self.shallow = set()
+        shallow_file = os.path.join(self.common_dir, 'shallow')
+        if os.path.exists(shallow_file):
+            with open(shallow_file) as f:
+                self.shallow = {line.strip() for line in f if line.strip()}
+
+        self._lock = threading.RLock()
+        self._cache = OrderedDict()
+        self._cache_bytes = 0
+        self._commits = OrderedDict()
+        self._trees = OrderedDict()
+        self._numstats = OrderedDict()
+        self._packs = []
+        self._pack_state = None
+        self.refresh()
+
+    def _check_format(self):
+        """SHA-1 저장소만 지원 (extensions.objectFormat = sha256이면 대체)"""
+        config = os.path.join(self.common_dir, 'config')
+        if os.path.exists(config):
+            with open(config, errors='replace') as f:
+                text = f.read().lower().replace(' ', '')
+            if 'objectformat=sha256' in text:
+                raise GitObjectError("SHA-256 저장소는 지원하지 않습니다.")
+
+    def _pack_dirs(self):
+        return [os.path.join(objects, 'pack') for objects in self.object_dirs]
+
+    def refresh(self):
+        """팩 파일 목록이 바뀌었으면 다시 열기 (gc, fetch 이후 등)"""
+        state = []
+        for pack_dir in self._pack_dirs():
+            try:
+                state.append((pack_dir, os.stat(pack_dir).st_mtime_ns))
+            except FileNotFoundError:
+                pass
+
+        with self._lock:
+            if state == self._pack_state:
+                return
+
+            for pack in self._packs:
+                pack.close()
+            self._packs = []
+            for pack_dir, _ in state:
+                for name in sorted(os.listdir(pack_dir)):
+                    if name.endswith('.idx') and os.path.exists(os.path.join(pack_dir, name[:-4] + '.pack')):
+                        self._packs.append(PackFile(os.path.join(pack_dir, name)))
+            self._pack_state = state
+            self._cache.clear()
+            self._cache_bytes = 0
+
+    def close(self):
+        with self._lock:
+            for pack in self._packs:
+                pack.close()
+            self._packs = []
+            self._pack_state = None
+
+    def _cache_get(self, key):
+        entry = self._cache.get(key)
+        if entry is not None:
+            self._cache.move_to_end(key)
+        return entry
+
+    def _cache_put(self, key, type_id, data):
+        self._cache[key] = (type_id, data)
+        self._cache_bytes += len(data)
+        while self._cache_bytes > OBJECT_CACHE_BYTES and len(self._cache) > 1:
+            _, (_, evicted) = self._cache.popitem(last=False)
+            self._cache_bytes -= len(evicted)
+
+    def _read_pack_object(self, pack, offset):
+        """팩 안의 객체 읽기 (델타 체인은 기준 객체까지 따라간 뒤 차례로 적용)"""
+        deltas = []
+        data = pack.data
+
+        while True:
+            cached = self._cache_get((pack.pack_path, offset))
+            if cached is not None:
+                type_id, result = cached
+                break
+
+            byte = data[offset]
+            type_id = (byte >> 4) & 7
+            size = byte & 0x0f
+            shift = 4
+            position = offset + 1
+            while byte & 0x80:
+                byte = data[position]
+                position += 1
+                size |= (byte & 0x7f) << shift
+                shift += 7
+
+            if type_id == OBJ_OFS_DELTA:
+                byte = data[position]
+                position += 1
+                base_distance = byte & 0x7f
+                while byte & 0x80:
+                    byte = data[position]
+                    position += 1
+                    base_distance = ((base_distance + 1) << 7) | (byte & 0x7f)
+                deltas.append((offset, _inflate(data, position, size)))
+                offset -= base_distance
+            elif type_id == OBJ_REF_DELTA:
+                base_sha = data[position:position + 20]
+                deltas.append((offset, _inflate(data, position + 20, size)))
+                type_id, result = self._read_raw(base_sha)
+                break
+            elif type_id in TYPE_NAMES:
+                result = _inflate(data, position, size)
+                self._cache_put((pack.pack_path, offset), type_id, result)
+                break
+            else:
+                raise GitObjectError(f"알 수 없는 팩 객체 형식입니다: {type_id}")
+
+        for delta_offset, delta in reversed(deltas):
+            result = apply_delta(result, delta)
+            self._cache_put((pack.pack_path, delta_offset), type_id, result)
+
+        return type_id, result
+
+    def _read_loose(self, sha_hex):
+        for objects in self.object_dirs:
+            path = os.path.join(objects, sha_hex[:2], sha_hex[2:])
+            try:
+                with open(path, 'rb') as f:
+                    raw = zlib.decompress(f.read())
+            except FileNotFoundError:
+                continue
+            except zlib.error:
+                raise GitObjectError(f"손상된 객체입니다: {sha_hex}")
+
+            header, _, body = raw.partition(b'\0')
+            type_name, _, size = header.partition(b' ')
+            if type_name not in TYPE_IDS or int(size) != len(body):
+                raise GitObjectError(f"손상된 객체입니다: {sha_hex}")
+            return TYPE_IDS[type_name], body
+
+        return None
+
+    def _read_raw(self, sha):
+        """20바이트 해시로 객체 읽기
+
+        Returns:
+            (객체 형식 번호, 내용)
+        """
+        with self._lock:
+            for pack in self._packs:
+                offset = pack.find(sha)
+                if offset is not None:
+                    return self._read_pack_object(pack, offset)
+
+        loose = self._read_loose(sha.hex())
+        if loose is None:
+            raise GitObjectError(f"객체를 찾을 수 없습니다: {sha.hex()}")
+        return loose
+
+    def read_object(self, sha_hex):
+        """16진수 해시로 객체 읽기
+
+        Returns:
+            (객체 형식 이름, 내용)
+        """
+        type_id, data = self._read_raw(bytes.fromhex(sha_hex))
+        return TYPE_NAMES[type_id].decode(), data
+
+    def _memo(self, cache, key, compute):
+        """객체 해시로 계산 결과 캐시 (객체 내용은 바뀌지 않으므로 무효화가 필요 없음)"""
+        with self._lock:
+            value = cache.get(key)
+            if value is not None:
+                cache.move_to_end(key)
+                return value
+
+        value = compute()
+        with self._lock:
+            cache[key] = value
+            if len(cache) > PARSED_CACHE_SIZE:
+                cache.popitem(last=False)
+        return value
+
+    def read_commit(self, sha_hex):
+        def parse():
+            type_name, data = self.read_object(sha_hex)
+            if type_name != 'commit':
+                raise GitObjectError(f"커밋 객체가 아닙니다: {sha_hex}")
+            return CommitObject(sha_hex, data)
+
+        return self._memo(self._commits, sha_hex, parse)
+
+    def read_tree(self, sha_hex):
+        """트리 항목 {이름: (모드, 해시)} (부모/자식 커밋 비교에서 같은 트리를 다시 파싱하지 않도록 캐시)"""
+        def parse():
+            type_name, data = self.read_object(sha_hex)
+            if type_name != 'tree':
+                raise GitObjectError(f"트리 객체가 아닙니다: {sha_hex}")
+            return _tree_entries(data)
+
+        return self._memo(self._trees, sha_hex, parse)
+
+    def commit_files(self, commit):
+        """커밋의 변경 파일 목록 (git log --numstat과 같이 병합 커밋은 빈 목록)"""
+        if len(commit.parents) > 1:
+            return []
+
+        def diff():
+            parent_tree = self.read_commit(commit.parents[0]).tree if commit.parents else None
+            return tuple(self.file_changes(parent_tree, commit.tree))
+
+        return list(self._memo(self._numstats, commit.sha, diff))
+
+    def _peel(self, sha_hex):
+        """태그 객체를 가리키면 최종 대상 객체 해시로 변환"""
+        for _ in range(10):
+            type_name, data = self.read_object(sha_hex)
+            if type_name != 'tag':
+                return sha_hex
+            sha_hex = data.split(b'\n', 1)[0].split(b' ', 1)[1].decode()
+        return sha_hex
+
+    def refs(self):
+        """모든 참조 {이름: 가리키는 커밋 해시} (태그는 대상 커밋으로 변환)"""
+        refs = {}
+        packed = os.path.join(self.common_dir, 'packed-refs')
+        if os.path.exists(packed):
+            with open(packed) as f:
+                last = None
+                for line in f:
+                    line = line.rstrip('\n')
+                    if not line or line.startswith('#'):
+                        continue
+                    if line.startswith('^') and last:
+                        refs[last] = line[1:]
+                        continue
+                    sha, _, name = line.partition(' ')
+                    refs[name] = sha
+                    last = name
+
+        symbolic = {}
+        refs_dir = os.path.join(self.common_dir, 'refs')
+        for root, _, files in os.walk(refs_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                ref = os.path.relpath(path, self.common_dir).replace(os.sep, '/')
+                try:
+                    with open(path) as f:
+                        value = f.read().strip()
+                except OSError:
+                    continue
+                if value.startswith('ref: '):
+                    symbolic[ref] = value[len('ref: '):]
+                elif len(value) == 40:
+                    refs[ref] = self._peel(value) if ref.startswith('refs/tags/') else value
+
+        # refs/remotes/origin/HEAD 같은 심볼릭 참조는 대상 참조의 커밋으로
+        for ref, target in symbolic.items():
+            if target in refs:
+                refs[ref] = refs[target]
+
+        return refs
+
+    def resolve_ref(self, ref):
+        """참조 이름을 커밋 해시로 변환 (심볼릭 참조는 따라감, 없으면 None)"""
+        for _ in range(10):
+            if ref == 'HEAD':
+                path = os.path.join(self.git_dir, 'HEAD')
+            else:
+                path = os.path.join(self.common_dir, ref)
+            if os.path.exists(path):
+                with open(path) as f:
+                    value = f.read().strip()
+                if value.startswith('ref: '):
+                    ref = value[len('ref: '):]
+                    continue
+                return value
+            return self.refs().get(ref)
+        return None
+
+    def head_ref(self):
+        """HEAD가 가리키는 브랜치 참조 이름 (분리된 HEAD면 None)"""
+        with open(os.path.join(self.git_dir, 'HEAD')) as f:
+            value = f.read().strip()
+        return value[len('ref: '):] if value.startswith('ref: ') else None
+
+    def decorations(self):
+        """커밋 해시별 git log %D 형식 참조 목록
+
+        git은 참조 이름 순으로 읽은 장식을 목록 앞에 추가하므로 역순으로 표시되고, HEAD가 가장 앞에 옵니다.
+        """
+        head = self.resolve_ref('HEAD')
+        head_ref = self.head_ref()
+
+        names = {}
+        for ref, sha in sorted(self.refs().items(), reverse=True):
+            if ref == head_ref:
+                continue
+            if ref.startswith('refs/heads/'):
+                label = ref[len('refs/heads/'):]
+            elif ref.startswith('refs/remotes/'):
+                label = ref[len('refs/remotes/'):]
+            elif ref.startswith('refs/tags/'):
+                label = f"tag: {ref[len('refs/tags/'):]}"
+            else:
+                continue
+            names.setdefault(sha, []).append(label)
+
+        if head:
+            label = f"HEAD -> {head_ref[len('refs/heads/'):]}" if head_ref else 'HEAD'
+            names.setdefault(head, []).insert(0, label)
+
+        return {sha: ', '.join(labels) for sha, labels in names.items()}
+
+    def abbrev_length(self):
+        """git의 core.abbrev=auto와 같이 객체 수에 따라 정한 짧은 해시 길이"""
+        count = sum(pack.count for pack in self._packs)
+        # loose 객체 수는 git과 같이 한 디렉터리만 세어 추정
+        sample = os.path.join(self.object_dirs[0], '17')
+        if os.path.isdir(sample):
+            count += len(os.listdir(sample)) * 256
+        return max(7, (count.bit_length() + 1) // 2)
+
+    def _blob(self, sha_hex):
+        return self.read_object(sha_hex)[1] if sha_hex else b''
+
+    def diff_trees(self, old_tree, new_tree, prefix=''):
+        """두 트리에서 바뀐 파일 목록 (git diff-tree -r 순서)
+
+        Returns:
+            (경로, 이전 항목, 새 항목) 리스트 (항목은 (모드, 해시), 없으면 None)
+        """
+        # git은 디렉터리를 "이름/"으로 정렬하므로 같은 이름의 파일과 디렉터리는 별개 항목
+        old = {_tree_sort_key(name, entry[0]): (name, entry)
+               for name, entry in (self.read_tree(old_tree) if old_tree else {}).items()}
+        new = {_tree_sort_key(name, entry[0]): (name, entry)
+               for name, entry in (self.read_tree(new_tree) if new_tree else {}).items()}
+
+        changes = []
+        for key in sorted(old.keys() | new.keys()):
+            name, old_entry = old.get(key, (None, None))
+            name, new_entry = new.get(key, (name, None))
+            if old_entry == new_entry:
+                continue
+
+            path = prefix + name
+            if key.endswith('/'):
+                changes.extend(self.diff_trees(
+                    old_entry[1] if old_entry else None, new_entry[1] if new_entry else None, path + '/'
+                ))
+            else:
+                changes.append((path, old_entry, new_entry))
+
+        return changes
+
+    def _file_change(self, path, old_entry, new_entry):
+        old_mode, old_sha = old_entry or (None, None)
+        new_mode, new_sha = new_entry or (None, None)
+
+        # 서브모듈은 가리키는 커밋만 바뀌므로 git과 같이 1줄 변경으로 기록
+        if GITLINK_MODE in (old_mode, new_mode):
+            return FileChange(path, 1 if new_entry else 0, 1 if old_entry else 0)
+
+        if old_sha == new_sha:
+            return FileChange(path, 0, 0)
+
+        added, deleted = _line_counts(self._blob(old_sha), self._blob(new_sha))
+        return FileChange(path, added, deleted)
+
+    def _diff_tree_numstat(self, old_tree, new_tree):
+        """git diff-tree -M --numstat으로 두 트리의 변경 파일 통계 계산 (유사도 기반 rename 포함)"""
+        metrics.increment('git_objects_rename_diff')
+        cmd = ['git', '-C', self.repo_path, 'diff-tree', '-r', '-M', '--numstat', old_tree, new_tree]
+        result = []
+        try:
+            for line in iter_git_output(cmd):
+                stat = line.rstrip('\n').split('\t', 2)
+                if len(stat) == 3:
+                    added, deleted = (None if value == '-' else int(value) for value in stat[:2])
+                    result.append(FileChange(stat[2], added, deleted))
+        except (subprocess.SubprocessError, OSError) as e:
+            raise GitObjectError(f"git diff-tree 실행 실패: {e}")
+        return result
+
+    def file_changes(self, old_tree, new_tree):
+        """두 트리의 git log --numstat 형식 변경 파일 통계 (이름 변경은 하나로 묶음)
+
+        내용이 같은 이름 변경은 직접 묶고, 짝이 없는 삭제/추가 파일이 남으면 이름과 내용이 함께 바뀐
+        경우일 수 있으므로 그 커밋만 git diff-tree -M으로 계산합니다 (git log 결과, 응답 캐시 키와 일치).
+        """
+        changes = self.diff_trees(old_tree, new_tree)
+        renames = _exact_renames(changes)
+        if old_tree and _has_rename_candidates(changes, renames):
+            return self._diff_tree_numstat(old_tree, new_tree)
+
+        result = []
+        for path, old_entry, new_entry in changes:
+            if old_entry is None and path in renames:
+                source = renames[path]
+                result.append(FileChange(_rename_path(source, path), 0, 0))
+            elif new_entry is None and path in renames.values():
+                continue
+            else:
+                result.append(self._file_change(_quote_path(path), old_entry, new_entry))
+        return result
+
+    def iter_log(self, since=None, until=None, author=None, start=None):
+        """git log --numstat과 같은 순서(커밋 시각 최신순)로 커밋 레코드 생성
+
+        Args:
+            since: 이 시각(유닉스 시간)보다 오래된 커밋에서 순회 중단
+            until: 이 시각보다 나중에 커밋된 것은 제외 (부모는 계속 순회)
+            author: 작성자 필터 (git --author와 같은 정규식)
+            start: 시작 커밋 해시 (없으면 HEAD)
+
+        Yields:
+            Commit
+        """
+        self.refresh()
+        start = start or self.resolve_ref('HEAD')
+        if not start:
+            return
+
+        matches_author = author_matcher(author)
+        abbrev = self.abbrev_length()
+        decorations = self.decorations()
+
+        seen = {start}
+        sequence = 0
+        first = self.read_commit(start)
+        queue = [(-first.commit_time, sequence, first)]
+
+        while queue:
+            _, _, commit = heapq.heappop(queue)
+
+            # 최신순으로 꺼내므로 since보다 오래된 커밋부터는 조상도 모두 범위 밖 (git --since와 동일)
+            if since is not None and commit.commit_time < since:
+                continue
+
+            if commit.sha not in self.shallow:
+                for parent in commit.parents:
+                    if parent not in seen:
+                        seen.add(parent)
+                        sequence += 1
+                        parent_commit = self.read_commit(parent)
+                        heapq.heappush(queue, (-parent_commit.commit_time, sequence, parent_commit))
+
+            if until is not None and commit.commit_time > until:
+                continue
+            if not matches_author(commit.author, commit.email):
+                continue
+
+            yield self._record(commit, abbrev, decorations)
+
+    def _record(self, commit, abbrev, decorations):
+        """파싱된 커밋을 git log 형식 커밋 레코드로 변환"""
+        author_zone = timezone(timedelta(minutes=commit.author_offset))
+        return Commit(
+            hash=commit.sha[:abbrev],
+            subject=commit.subject,
+            author=commit.author,
+            timestamp=commit.author_time,
+            refs=decorations.get(commit.sha, ''),
+            files=self.commit_files(commit),
+            date=datetime.fromtimestamp(commit.author_time, author_zone).strftime('%Y-%m-%d'),
+            full_hash=commit.sha,
+            email=commit.email,
+            commit_timestamp=commit.commit_time,
+        )
+
+    def commit_records(self, shas):
+        """주어진 커밋들의 레코드를 목록 순서대로 생성 (git log --no-walk=unsorted와 같음)"""
+        self.refresh()
+        abbrev = self.abbrev_length()
+        decorations = self.decorations()
+        for sha in shas:
+            yield self._record(self.read_commit(sha), abbrev, decorations)
@@ -6,9 +6,12 @@ GitHub 일일 커밋 분석 프로그램
 
 import sys
 import os
+import argparse
 from datetime import datetime
-from git_analyzer import GitAnalyzer
-from gemini_client import GeminiAPI
+from git_analyzer import GitAnalyzer, has_commits, render_commits
+from commit_index import CommitIndex
+from prompt_budget import fit_prompt
+from metrics import add_arguments as add_metrics_arguments, run_instrumented
 
 def validate_date(date_string):
     """날짜 형식 검증 (YYYY-MM-DD)"""
@@ -52,11 +55,24 @@ def create_gemini_prompt(commits_data, date):
 
 def main():
     """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="GitHub 일일 커밋 분석기")
+    add_metrics_arguments(parser)
+    args = parser.parse_args()
+    
+    run_instrumented(analyze, args)
+
+def analyze(target_date=None, commits_only=False):
+    """커밋 분석 및 보고서 생성
+
+    Args:
+        target_date: 분석할 날짜 ('YYYY-MM-DD', 없으면 입력받음)
+        commits_only: True면 Gemini 보고서 없이 커밋 정보만 출력
+    """
     print("🔍 GitHub 일일 커밋 분석기")
     print("=" * 40)
     
     # 사용자 입력 받기
-    target_date = get_user_input()
+    target_date = target_date or get_user_input()
     print(f"\n📅 {target_date} 날짜의 커밋을 분석중...")
     
     # Git 분석기 초기화
@@ -66,38 +82,48 @@ def main():
         "/Users/iyein/Documents/gmpang-linktree-project"
     ]
     
-    analyzer = GitAnalyzer(repositories)
+    # 커밋 색인을 사용해 이미 읽은 히스토리는 다시 순회하지 않음
+    analyzer = GitAnalyzer(repositories, index=CommitIndex())
     
     # 커밋 데이터 수집
     print("🔍 커밋 정보 수집중...")
-    commits_data = analyzer.analyze_commits_for_date(target_date, author="iyeaaa")
-    
-    # 실제 커밋이 있는지 확인 (모든 저장소에서 "해당 날짜에 커밋이 없습니다"인지 체크)
-    lines = commits_data.strip().split('\n')
-    has_actual_commits = any('•' in line for line in lines)
+    results = analyzer.collect_commits_for_date(target_date, author="iyeaaa")
     
-    if not has_actual_commits:
+    # 실제 커밋이 있는지 확인
+    if not has_commits(results):
         print(f"❌ {target_date}에 해당하는 커밋을 찾을 수 없습니다.")
         print("다른 날짜를 시도해보세요.")
         return
     
+    commits_data = render_commits(results)
+    
     print("📝 커밋 정보:")
     print(commits_data)
     print("\n" + "=" * 40)
     
+    if commits_only:
+        return
+    
     # Gemini API로 요약 생성
     print("🤖 Gemini AI로 보고서 생성중...")
     try:
+        # requests를 포함해 불러오는 데 시간이 걸리므로 보고서를 만들 때만 불러옴
+        from gemini_client import GeminiAPI
         gemini = GeminiAPI()
-        prompt = create_gemini_prompt(commits_data, target_date)
+        # 커밋 정보를 토큰 예산에 맞춰 압축한 프롬프트 생성
+        prompt, _ = fit_prompt(lambda data: create_gemini_prompt(data, target_date), results,
+                               day_of=analyzer.commit_day)
         
-        summary = gemini.call_api(prompt, max_tokens=1000)
+        # 생성되는 대로 바로 출력
+        print("\n📋 생성된 보고서:")
+        print("=" * 40)
+        chunks = []
+        for chunk in gemini.stream_api(prompt, max_tokens=1000):
+            print(chunk, end='', flush=True)
+            chunks.append(chunk)
+        print()
         
-        if summary:
-            print("\n📋 생성된 보고서:")
-            print("=" * 40)
-            print(summary)
-        else:
+        if not chunks:
             print("❌ 보고서 생성에 실패했습니다.")
             
     except Exception as e:
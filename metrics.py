@@ -0,0 +1,180 @@
+"""
+성능 계측 모듈
+git 명령어, Gemini 호출, 포털 게시 등 단계별 소요 시간과 횟수를 기록하고
+실행이 끝나면 JSON 또는 Prometheus 텍스트 형식으로 내보냅니다.
+"""
+
+import cProfile
+import io
+import json
+import pstats
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+
+class MetricsRegistry:
+    """단계별 소요 시간(span)과 카운터를 모으는 스레드 안전 저장소"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.spans = []
+        self.counters = {}
+
+    def reset(self):
+        """기록 초기화"""
+        with self._lock:
+            self.spans = []
+            self.counters = {}
+
+    @contextmanager
+    def span(self, name, **labels):
+        """블록 실행 시간 기록 (블록 안에서 반환된 labels 딕셔너리에 레이블 추가 가능)
+
+        예:
+            with metrics.span('gemini_attempt', attempt=1) as labels:
+                labels['status'] = response.status_code
+        """
+        started_at = time.time()
+        start = time.perf_counter()
+        ok = False
+        try:
+            yield labels
+            ok = True
+        finally:
+            self.observe(name, time.perf_counter() - start, started_at=started_at, ok=ok, **labels)
+
+    def observe(self, name, seconds, started_at=None, ok=True, **labels):
+        """이미 측정한 소요 시간 기록 (예: 재시도 대기 시간)"""
+        record = {
+            'name': name,
+            'labels': {key: str(value) for key, value in labels.items()},
+            'start': started_at if started_at is not None else time.time() - seconds,
+            'seconds': seconds,
+            'ok': ok,
+        }
+        with self._lock:
+            self.spans.append(record)
+
+    def increment(self, name, value=1, **labels):
+        """카운터 증가"""
+        key = (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def summary(self):
+        """단계(이름+레이블)별 횟수/합계/최대 소요 시간 집계"""
+        with self._lock:
+            spans = list(self.spans)
+
+        totals = {}
+        for record in spans:
+            key = (record['name'], tuple(sorted(record['labels'].items())))
+            entry = totals.setdefault(key, {'count': 0, 'seconds': 0.0, 'max': 0.0, 'errors': 0})
+            entry['count'] += 1
+            entry['seconds'] += record['seconds']
+            entry['max'] = max(entry['max'], record['seconds'])
+            entry['errors'] += 0 if record['ok'] else 1
+
+        return totals
+
+    def to_json(self):
+        """JSON Lines 형식 (span 하나당 한 줄, 마지막에 카운터)"""
+        with self._lock:
+            spans = list(self.spans)
+            counters = dict(self.counters)
+
+        lines = [json.dumps({'type': 'span', **record}, ensure_ascii=False) for record in spans]
+        for (name, labels), value in sorted(counters.items()):
+            lines.append(json.dumps(
+                {'type': 'counter', 'name': name, 'labels': dict(labels), 'value': value},
+                ensure_ascii=False
+            ))
+        return "\n".join(lines) + "\n"
+
+    def to_prometheus(self, prefix='cnu_report'):
+        """Prometheus 텍스트 노출 형식"""
+        def metric_name(name):
+            return f"{prefix}_{re.sub(r'[^a-zA-Z0-9_]', '_', name)}"
+
+        def format_labels(labels):
+            if not labels:
+                return ""
+            escaped = (
+                key + '="' + value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+                for key, value in labels
+            )
+            return "{" + ",".join(escaped) + "}"
+
+        lines = []
+        seen = set()
+        for (name, labels), entry in sorted(self.summary().items()):
+            base = metric_name(name) + "_seconds"
+            if base not in seen:
+                lines.append(f"# TYPE {base} summary")
+                seen.add(base)
+            lines.append(f"{base}_sum{format_labels(labels)} {entry['seconds']:.6f}")
+            lines.append(f"{base}_count{format_labels(labels)} {entry['count']}")
+            lines.append(f"{metric_name(name)}_max_seconds{format_labels(labels)} {entry['max']:.6f}")
+
+        with self._lock:
+            counters = dict(self.counters)
+        for (name, labels), value in sorted(counters.items()):
+            counter = metric_name(name) + "_total"
+            if counter not in seen:
+                lines.append(f"# TYPE {counter} counter")
+                seen.add(counter)
+            lines.append(f"{counter}{format_labels(labels)} {value}")
+
+        return "\n".join(lines) + "\n"
+
+    def dump(self, fmt, path=None):
+        """기록 내보내기
+
+        Args:
+            fmt: 'json' 또는 'prometheus'
+            path: 저장할 파일 경로 (없으면 표준 에러로 출력)
+        """
+        output = self.to_json() if fmt == 'json' else self.to_prometheus()
+        if path:
+            with open(path, 'w') as f:
+                f.write(output)
+            print(f"📈 계측 결과 저장: {path}")
+        else:
+            sys.stderr.write(output)
+
+
+# 프로세스 전체에서 공유하는 기본 저장소
+metrics = MetricsRegistry()
+
+
+def add_arguments(parser):
+    """계측 관련 명령행 옵션 추가"""
+    parser.add_argument('--metrics', choices=['json', 'prometheus'],
+                        help="실행 후 단계별 계측 결과 출력 형식")
+    parser.add_argument('--metrics-output', metavar='FILE', help="계측 결과 저장 파일 (기본: 표준 에러)")
+    parser.add_argument('--profile', nargs='?', const='-', metavar='FILE',
+                        help="cProfile로 실행 (FILE을 주면 pstats 파일로 저장, 없으면 상위 함수 출력)")
+
+
+def run_instrumented(func, args):
+    """명령행 옵션에 따라 cProfile/계측 결과 출력을 적용해 함수 실행"""
+    profiler = cProfile.Profile() if getattr(args, 'profile', None) else None
+    try:
+        if profiler is not None:
+            return profiler.runcall(func)
+        return func()
+    finally:
+        if profiler is not None:
+            if args.profile == '-':
+                stream = io.StringIO()
+                pstats.Stats(profiler, stream=stream).sort_stats('cumulative').print_stats(25)
+                sys.stderr.write(stream.getvalue())
+            else:
+                profiler.dump_stats(args.profile)
+                print(f"🔬 프로파일 저장: {args.profile}")
+
+        if getattr(args, 'metrics', None):
+            metrics.dump(args.metrics, args.metrics_output)
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+오프라인 부하 테스트용 모의 서버
+Gemini generateContent/streamGenerateContent와 포털 보고서 등록(studentBoardAddProc)을 흉내 냅니다.
+지연 시간, 오류 비율, 429 응답을 설정할 수 있고, 같은 시드면 요청 순번별 결과가 항상 같습니다.
+포털 요청의 쿠키 값에 'expired'가 들어 있으면 만료된 세션처럼 로그인 페이지로 이동시키고,
+포털 페이지를 열 때마다 JSESSIONID를 새 값으로 갱신합니다.
+
+사용 예:
+    python mock_server.py --port 8080 --latency 0.5 --error-rate 0.05 --rate-limit-rate 0.1
+    GEMINI_BASE_URL=http://127.0.0.1:8080/v1beta BASE_URL=http://127.0.0.1:8080 python daily_post.py ...
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+@dataclass
+class MockConfig:
+    """모의 서버 동작 설정"""
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after: float = 1.0
+    stream_chunks: int = 5
+    seed: int = 0
+
+
+class MockState:
+    """요청 순번과 처리 통계 (스레드 간 공유)"""
+
+    def __init__(self, config):
+        self.config = config
+        self._lock = threading.Lock()
+        self._requests = 0
+        self.stats = {'requests': 0, 'generate': 0, 'stream': 0, 'posts': 0, 'errors': 0, 'rate_limited': 0}
+
+    def next_random(self):
+        """요청 순번과 시드로 정해지는 난수 생성기 (동시 요청이 있어도 순번별 결과는 고정)"""
+        with self._lock:
+            self._requests += 1
+            number = self._requests
+        return random.Random(f"{self.config.seed}:{number}")
+
+    def count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+
+def _report_text(prompt, length=8):
+    """프롬프트의 제목 형식 지시("# ..." 형식으로 시작)를 따르는 가짜 보고서"""
+    match = re.search(r'"# ([^"]+)" 형식', prompt)
+    title = match.group(1) if match else "보고서"
+    body = [f"모의 응답 문장 {i + 1}번입니다." for i in range(length)]
+    return f"# {title}\n" + "\n".join(body)
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    """Gemini/포털 모의 요청 처리기"""
+
+    protocol_version = 'HTTP/1.1'
+    state: MockState = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _write_chunk(self, data):
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def _inject_failure(self, rng):
+        """설정된 지연을 적용하고, 확률에 따라 429/503 응답 (응답했으면 True)"""
+        config = self.state.config
+        delay = config.latency + (rng.uniform(-config.jitter, config.jitter) if config.jitter else 0)
+        if delay > 0:
+            time.sleep(delay)
+
+        roll = rng.random()
+        if roll < config.rate_limit_rate:
+            self.state.count('rate_limited')
+            self._send_json(429, {
+                'error': {
+                    'code': 429,
+                    'status': 'RESOURCE_EXHAUSTED',
+                    'details': [{'retryDelay': f"{config.retry_after:g}s"}],
+                }
+            }, headers={'Retry-After': f"{config.retry_after:g}"})
+            return True
+
+        if roll < config.rate_limit_rate + config.error_rate:
+            self.state.count('errors')
+            self._send_json(503, {'error': {'code': 503, 'status': 'UNAVAILABLE'}})
+            return True
+
+        return False
+
+    def _session_expired(self):
+        """만료된 세션이면 로그인 페이지로 이동 응답 (응답했으면 True)"""
+        if 'expired' not in self.headers.get('Cookie', ''):
+            return False
+        self.send_response(302)
+        self.send_header('Location', '/login')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+        return True
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == '/__stats':
+            self._send_json(200, {'config': asdict(self.state.config), 'stats': self.state.stats})
+            return
+        if self._session_expired():
+            return
+
+        # 포털 페이지는 로그인된 것처럼 빈 페이지 반환 (실제 포털처럼 세션 쿠키 갱신)
+        body = b"<html><body>mock portal</body></html>"
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Set-Cookie', f"JSESSIONID=mock-{random.getrandbits(32):08x}; Path=/")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        length = int(self.headers.get('Content-Length', 0))
+        raw = self.rfile.read(length)
+        self.state.count('requests')
+        rng = self.state.next_random()
+
+        if path.endswith(':generateContent') or path.endswith(':streamGenerateContent'):
+            if self._inject_failure(rng):
+                return
+
+            try:
+                prompt = json.loads(raw)['contents'][0]['parts'][0]['text']
+            except (ValueError, KeyError, IndexError):
+                self._send_json(400, {'error': {'code': 400, 'status': 'INVALID_ARGUMENT'}})
+                return
+
+            text = _report_text(prompt)
+            if path.endswith(':generateContent'):
+                self.state.count('generate')
+                self._send_json(200, {'candidates': [{'content': {'parts': [{'text': text}]}}]})
+                return
+
+            # SSE 스트리밍 응답 (chunked 전송으로 조각마다 바로 전달)
+            self.state.count('stream')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            size = max(1, len(text) // max(1, self.state.config.stream_chunks))
+            for i in range(0, len(text), size):
+                event = {'candidates': [{'content': {'parts': [{'text': text[i:i + size]}]}}]}
+                self._write_chunk(f"data: {json.dumps(event, ensure_ascii=False)}\r\n\r\n".encode('utf-8'))
+            self._write_chunk(b'data: {"candidates": [{"finishReason": "STOP"}]}\r\n\r\n')
+            self.wfile.write(b"0\r\n\r\n")
+            return
+
+        if path == '/student/report/studentBoardAddProc':
+            if self._session_expired() or self._inject_failure(rng):
+                return
+
+            form = parse_qs(raw.decode('utf-8'))
+            if not form.get('subject'):
+                self._send_json(200, {'insertResult': 0})
+                return
+
+            self.state.count('posts')
+            self._send_json(200, {'insertResult': 1})
+            return
+
+        self._send_json(404, {'error': {'code': 404, 'status': 'NOT_FOUND'}})
+
+
+def start_mock_server(host='127.0.0.1', port=0, config=None):
+    """모의 서버를 백그라운드 스레드에서 시작
+
+    Args:
+        host: 바인드 주소
+        port: 포트 (0이면 빈 포트 자동 선택)
+        config: MockConfig (없으면 기본값)
+
+    Returns:
+        (서버, 기본 URL) — 종료는 server.shutdown()
+    """
+    handler = type('BoundMockHandler', (MockHandler,), {'state': MockState(config or MockConfig())})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gemini/포털 모의 서버")
+    parser.add_argument('--host', default='127.0.0.1', help="바인드 주소")
+    parser.add_argument('--port', type=int, default=8080, help="포트")
+    parser.add_argument('--latency', type=float, default=0.0, help="응답 지연(초)")
+    parser.add_argument('--jitter', type=float, default=0.0, help="지연 편차(초, ±)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="503 응답 비율 (0~1)")
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help="429 응답 비율 (0~1)")
+    parser.add_argument('--retry-after', type=float, default=1.0, help="429 응답의 Retry-After(초)")
+    parser.add_argument('--stream-chunks', type=int, default=5, help="스트리밍 응답 조각 수")
+    parser.add_argument('--seed', type=int, default=0, help="난수 시드 (같으면 요청 순번별 결과 동일)")
+    args = parser.parse_args()
+
+    config = MockConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+        stream_chunks=args.stream_chunks,
+        seed=args.seed,
+    )
+    server, base_url = start_mock_server(args.host, args.port, config)
+
+    print(f"🧪 모의 서버 실행중: {base_url}")
+    print(f"   GEMINI_BASE_URL={base_url}/v1beta")
+    print(f"   BASE_URL={base_url}")
+    print(f"   통계: {base_url}/__stats")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+        print("\n👋 모의 서버를 종료합니다.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+"""
+단계별 파이프라인 실행 모듈
+커밋 수집(git) → 보고서 생성(Gemini) → 게시(포털)처럼 성격이 다른 단계를 크기가 제한된 큐로 연결해
+여러 보고서를 처리할 때 한 단계가 기다리는 동안 다른 단계가 계속 일하도록 합니다.
+단계마다 동시 실행 수를 따로 정하고, 다음 단계가 밀리면 앞 단계가 큐에서 멈춰(배압) 메모리와
+요청 수가 한없이 늘어나지 않게 합니다. 실행이 끝나면 단계별 처리량을 출력합니다.
+"""
+
+import queue
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from metrics import metrics
+
+# 단계 작업자에게 더 이상 입력이 없음을 알리는 값
+_STOP = object()
+
+# 앞 단계에서 끝난 항목 (순서를 지키는 단계가 기다리지 않도록 자리만 채움)
+_SKIPPED = object()
+
+
+@dataclass
+class Stage:
+    """파이프라인 단계 하나
+
+    func는 앞 단계의 결과를 받아 다음 단계로 넘길 값을 반환합니다.
+    Finished(값)을 반환하면 남은 단계를 건너뛰고 그 값을 최종 결과로 사용합니다.
+    """
+    name: str
+    func: Callable
+    workers: int = 1
+    queue_size: Optional[int] = None  # 입력 큐 크기 (기본: 동시 실행 수의 2배)
+    ordered: bool = False  # True면 입력 순서대로 꺼내 처리 (예: 날짜순 게시)
+    # ordered 단계에서 이 함수의 값이 같은 항목은 한 번에 하나씩 입력 순서대로 처리
+    # (예: 사용자별로는 날짜순으로 하나씩, 다른 사용자끼리는 동시에 게시)
+    key: Optional[Callable] = None
+
+
+class Finished:
+    """남은 단계를 건너뛰고 바로 최종 결과로 보낼 값 (예: '이미 등록', '커밋 없음')"""
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+
+@dataclass
+class StageStats:
+    """단계별 처리 통계"""
+    name: str
+    workers: int
+    processed: int = 0
+    errors: int = 0
+    busy: float = 0.0  # 작업 함수 실행 시간 합계
+    blocked: float = 0.0  # 다음 단계 큐가 가득 차 기다린 시간 합계 (배압)
+    first_start: Optional[float] = None
+    last_end: Optional[float] = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def elapsed(self):
+        if self.first_start is None:
+            return 0.0
+        return self.last_end - self.first_start
+
+    @property
+    def throughput(self):
+        """단계가 일한 구간 동안의 초당 처리 수"""
+        return self.processed / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def utilization(self):
+        """작업자들이 실제로 일한 시간 비율"""
+        capacity = self.elapsed * self.workers
+        return self.busy / capacity if capacity > 0 else 0.0
+
+    def record(self, start, end, ok):
+        with self._lock:
+            self.processed += 1
+            self.errors += 0 if ok else 1
+            self.busy += end - start
+            self.first_start = start if self.first_start is None else min(self.first_start, start)
+            self.last_end = end if self.last_end is None else max(self.last_end, end)
+
+    def add_blocked(self, seconds):
+        with self._lock:
+            self.blocked += seconds
+
+
+class _Serializer:
+    """같은 키의 항목을 한 번에 하나씩, 큐에 들어간 순서대로 처리하게 하는 차례표
+
+    큐에 넣는 시점(번호 순서)에 키별 차례를 등록하므로, 차례가 된 항목은 항상 뒤 항목보다
+    먼저 큐에서 꺼내져 기다리지 않고 처리됩니다.
+    """
+
+    def __init__(self, key):
+        self.key = key
+        self.turns = {}
+        self._cond = threading.Condition()
+
+    def register(self, index, item):
+        with self._cond:
+            self.turns.setdefault(self.key(item), deque()).append(index)
+
+    def wait_turn(self, index, item):
+        key = self.key(item)
+        with self._cond:
+            while self.turns[key][0] != index:
+                self._cond.wait()
+
+    def done(self, index, item):
+        key = self.key(item)
+        with self._cond:
+            self.turns[key].popleft()
+            if not self.turns[key]:
+                del self.turns[key]
+            self._cond.notify_all()
+
+
+class _Reorder:
+    """순서를 지키는 단계의 입력을 항목 번호 순서대로 큐에 넣는 버퍼
+
+    앞 항목이 늦어지는 동안 뒤 항목이 한없이 쌓이지 않도록, 기다리는 항목이 limit개를 넘을
+    번호의 항목은 파이프라인에 들어가기 전에 멈춰 세웁니다 (wait_for_room).
+    """
+
+    def __init__(self, target, limit, serializer=None):
+        self.target = target
+        self.limit = limit
+        self.serializer = serializer
+        self.pending = {}
+        self.next_index = 0
+        self._cond = threading.Condition()
+
+    def wait_for_room(self, index):
+        """index번 항목이 도착해도 기다리는 항목이 limit개를 넘지 않을 때까지 대기
+
+        작업자가 아니라 입력 쪽에서 멈추므로, 다음 차례 항목이 작업자 뒤의 큐에 갇혀
+        서로 기다리는 일이 없습니다.
+        """
+        with self._cond:
+            while index - self.next_index > self.limit:
+                self._cond.wait()
+
+    def put(self, index, item):
+        with self._cond:
+            self.pending[index] = item
+            advanced = False
+            while self.next_index in self.pending:
+                ready = self.pending.pop(self.next_index)
+                if ready is not _SKIPPED:
+                    if self.serializer is not None:
+                        self.serializer.register(self.next_index, ready)
+                    self.target.put((self.next_index, ready))
+                self.next_index += 1
+                advanced = True
+            if advanced:
+                self._cond.notify_all()
+
+
+class Pipeline:
+    """크기가 제한된 큐로 단계를 연결해 항목들을 동시에 처리하는 클래스"""
+
+    def __init__(self, stages, name='pipeline'):
+        """
+        Args:
+            stages: Stage 리스트 (실행 순서)
+            name: 통계 출력과 계측에 쓸 이름
+        """
+        if not stages:
+            raise ValueError("단계가 하나 이상 필요합니다.")
+        for stage in stages:
+            if stage.key is not None and not stage.ordered:
+                raise ValueError(f"{stage.name}: key는 ordered 단계에서만 사용할 수 있습니다.")
+        self.stages = stages
+        self.name = name
+        self.stats = [StageStats(stage.name, stage.workers) for stage in stages]
+        self.elapsed = 0.0
+
+    def run(self, items):
+        """모든 항목을 파이프라인으로 처리
+
+        단계에서 예외가 나면 그 항목은 남은 단계를 건너뛰고 예외 객체가 결과가 됩니다.
+
+        Args:
+            items: 첫 단계에 넣을 항목 이터러블
+
+        Returns:
+            입력 순서대로 정렬된 최종 결과 리스트
+        """
+        items = list(items)
+        results = [None] * len(items)
+        queues = [queue.Queue(maxsize=stage.queue_size or stage.workers * 2) for stage in self.stages]
+        # 순서를 지키는 단계의 대기 버퍼는 입력 큐 크기로 제한 (앞 단계 작업자가 모두 일할 수 있는 만큼은 허용)
+        serializers = [_Serializer(stage.key) if stage.key is not None else None for stage in self.stages]
+        reorders = [
+            _Reorder(q, max(q.maxsize, sum(earlier.workers for earlier in self.stages[:position])),
+                     serializers[position]) if stage.ordered else None
+            for position, (stage, q) in enumerate(zip(self.stages, queues))
+        ]
+        remaining = [stage.workers for stage in self.stages]
+        remaining_lock = threading.Lock()
+
+        def send(position, index, item):
+            """position번째 단계로 항목 전달 (가득 차 있으면 자리가 날 때까지 대기)"""
+            if reorders[position] is not None:
+                reorders[position].put(index, item)
+            elif item is not _SKIPPED:
+                queues[position].put((index, item))
+
+        def skip_downstream(position, index):
+            # 뒤쪽의 순서를 지키는 단계들이 이 항목을 기다리지 않도록 알림
+            for later in range(position + 1, len(self.stages)):
+                if reorders[later] is not None:
+                    reorders[later].put(index, _SKIPPED)
+
+        def worker(position):
+            stage = self.stages[position]
+            stats = self.stats[position]
+            serializer = serializers[position]
+            is_last = position == len(self.stages) - 1
+
+            while True:
+                entry = queues[position].get()
+                if entry is _STOP:
+                    break
+
+                index, item = entry
+                if serializer is not None:
+                    serializer.wait_turn(index, item)
+                start = time.perf_counter()
+                try:
+                    value = stage.func(item)
+                    ok = True
+                except Exception as e:
+                    print(f"❌ [{stage.name}] 처리 중 오류: {e}")
+                    value = Finished(e)
+                    ok = False
+                end = time.perf_counter()
+                if serializer is not None:
+                    serializer.done(index, item)
+                stats.record(start, end, ok)
+                metrics.observe('pipeline_stage', end - start, ok=ok, pipeline=self.name, stage=stage.name)
+
+                if isinstance(value, Finished):
+                    results[index] = value.value
+                    skip_downstream(position, index)
+                elif is_last:
+                    results[index] = value
+                else:
+                    wait_start = time.perf_counter()
+                    send(position + 1, index, value)
+                    stats.add_blocked(time.perf_counter() - wait_start)
+
+            # 마지막으로 끝난 작업자가 다음 단계 작업자들을 종료
+            with remaining_lock:
+                remaining[position] -= 1
+                done = remaining[position] == 0
+            if done and not is_last:
+                for _ in range(self.stages[position + 1].workers):
+                    queues[position + 1].put(_STOP)
+
+        threads = [
+            threading.Thread(target=worker, args=(position,), name=f"{self.name}-{stage.name}-{n}", daemon=True)
+            for position, stage in enumerate(self.stages)
+            for n in range(stage.workers)
+        ]
+
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+
+        # 첫 단계 큐도 크기가 제한되어 있으므로 입력도 처리 속도에 맞춰 들어감
+        # (순서를 지키는 단계가 앞 항목을 기다리는 중이면 그 버퍼에 자리가 날 때까지 멈춤)
+        for index, item in enumerate(items):
+            for reorder in reorders:
+                if reorder is not None:
+                    reorder.wait_for_room(index)
+            send(0, index, item)
+        for _ in range(self.stages[0].workers):
+            queues[0].put(_STOP)
+
+        for thread in threads:
+            thread.join()
+        self.elapsed = time.perf_counter() - started
+
+        for stats in self.stats:
+            metrics.observe('pipeline_backpressure', stats.blocked, pipeline=self.name, stage=stats.name)
+
+        return results
+
+    def print_stats(self):
+        """단계별 처리량 출력"""
+        print(f"\n⏱️ 단계별 처리량 ({self.name}, 전체 {self.elapsed:.1f}초)")
+        print(f"{'단계':<12}{'동시':>4}{'처리':>6}{'오류':>6}{'처리량':>10}{'사용률':>8}{'배압 대기':>10}")
+        for stats in self.stats:
+            print(f"{stats.name:<12}{stats.workers:>4}{stats.processed:>6}{stats.errors:>6}"
+                  f"{stats.throughput:>8.2f}/s{stats.utilization:>8.0%}{stats.blocked:>9.1f}s")
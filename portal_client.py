@@ -0,0 +1,229 @@
+"""
+포털 세션 모듈
+SESSION_COOKIE를 한 번 받아 쿠키 저장소(JSON 파일)에 보관하고, 서버가 새로 내려준 쿠키도 함께 저장해
+다음 실행에서 재사용합니다. 연결 풀을 가진 세션 하나로 요청을 보내며,
+보고서를 생성하기 전에 가벼운 사전 확인(preflight)으로 세션 만료를 먼저 알아내
+Gemini 호출을 헛되이 쓰지 않도록 합니다.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Optional
+from urllib.parse import urljoin, urlparse
+
+from metrics import metrics
+
+DEFAULT_BASE_URL = 'https://cnujob.cnu.ac.kr'
+
+DEFAULT_COOKIE_JAR_PATH = os.path.join(
+    os.path.expanduser('~'), '.cache', 'cnu_report', 'portal_cookies.json'
+)
+
+# 사전 확인에 사용할 페이지 (로그인 상태에서만 열리는 일일 보고서 작성 화면)
+PREFLIGHT_PATH = '/student/report/studentBoardDayAdd'
+
+# 사전 확인 결과를 재사용할 시간(초) — 스케줄러처럼 같은 세션으로 여러 번 게시할 때 매번 확인하지 않음
+PREFLIGHT_TTL = int(os.getenv('PORTAL_PREFLIGHT_TTL', 300))
+
+# 여러 클라이언트(기수 일괄 실행의 사용자별 세션)가 같은 저장 파일을 고쳐 쓰므로 프로세스 전체에서 하나의 잠금 사용
+_jar_lock = threading.Lock()
+
+
+def get_base_url() -> str:
+    return os.getenv('BASE_URL', DEFAULT_BASE_URL).rstrip('/')
+
+
+def get_cookie_jar_path() -> str:
+    return os.getenv('PORTAL_COOKIE_JAR') or DEFAULT_COOKIE_JAR_PATH
+
+
+def parse_cookie_string(cookie):
+    """"키=값; 키=값" 형식 쿠키 문자열을 (키, 값) 리스트로 변환 (공백/빈 항목 허용)"""
+    pairs = []
+    for part in cookie.split(';'):
+        name, sep, value = part.strip().partition('=')
+        if sep and name:
+            pairs.append((name.strip(), value.strip()))
+    return pairs
+
+
+def _cookie_source(cookie):
+    """저장된 쿠키가 어떤 SESSION_COOKIE 값에서 시작됐는지 구분하는 해시 (원문은 저장하지 않음)"""
+    return hashlib.sha256(cookie.encode('utf-8')).hexdigest() if cookie else None
+
+
+def _read_jar(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def has_saved_session(key=None, path=None) -> bool:
+    """저장된 포털 쿠키가 있는지 확인 (SESSION_COOKIE 없이도 게시할 수 있는지 판단)"""
+    entry = _read_jar(path or get_cookie_jar_path()).get(key or 'default')
+    return bool(entry and entry.get('cookies'))
+
+
+class PortalClient:
+    """쿠키를 파일에 보관하고 연결을 재사용하는 포털 클라이언트"""
+
+    def __init__(self, cookie: Optional[str] = None, key: Optional[str] = None,
+                 base_url: Optional[str] = None, jar_path: Optional[str] = None,
+                 pool_size: int = 4, timeout: float = 20):
+        """
+        Args:
+            cookie: "키=값; 키=값" 형식의 세션 쿠키 (없으면 SESSION_COOKIE 환경변수, 그래도 없으면 저장된 쿠키)
+            key: 쿠키 저장소에서 이 세션을 구분할 이름 (보통 학번, 여러 사용자가 같은 파일을 씀)
+            base_url: 포털 주소 (없으면 BASE_URL 환경변수)
+            jar_path: 쿠키 저장 파일 경로 (없으면 PORTAL_COOKIE_JAR 환경변수 또는 기본 캐시 경로)
+            pool_size: 재사용할 HTTP 연결 수 (동시 게시 수에 맞춰 설정)
+            timeout: 요청 제한 시간(초)
+        """
+        self.base_url = (base_url or get_base_url()).rstrip('/')
+        # 쿠키 도메인은 포털 주소에서 가져옴 (BASE_URL을 바꾸면 쿠키도 그 주소로 전송)
+        self.domain = urlparse(self.base_url).hostname
+        self.key = key or 'default'
+        self.jar_path = jar_path or get_cookie_jar_path()
+        self.timeout = timeout
+        self._verified_at = None
+
+        cookie = cookie or os.getenv('SESSION_COOKIE')
+        self._source = _cookie_source(cookie)
+
+        # requests는 불러오는 데 시간이 걸리므로 실제로 포털에 접속할 때만 불러옴
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            "Origin": self.base_url,
+            "Referer": self.url(PREFLIGHT_PATH),
+            "User-Agent": "Mozilla/5.0",
+        })
+
+        if not self._load_saved(cookie):
+            if not cookie:
+                print("⚠️ SESSION_COOKIE 환경변수가 설정되지 않았고 저장된 포털 쿠키도 없습니다.")
+                print("💡 export SESSION_COOKIE='your_cookie_string'")
+                raise ValueError("SESSION_COOKIE가 필요합니다.")
+            for name, value in parse_cookie_string(cookie):
+                self.session.cookies.set(name, value, domain=self.domain, path='/')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """쿠키 저장 후 연결 풀 정리"""
+        self.save()
+        self.session.close()
+
+    def url(self, path):
+        return urljoin(self.base_url + '/', path.lstrip('/'))
+
+    def _load_saved(self, cookie):
+        """저장된 쿠키 불러오기
+
+        SESSION_COOKIE가 저장 당시와 다르면 (새로 로그인해 값을 바꾼 경우) 저장된 쿠키 대신 새 값을 사용합니다.
+
+        Returns:
+            저장된 쿠키를 사용했으면 True
+        """
+        entry = _read_jar(self.jar_path).get(self.key)
+        if not entry or entry.get('domain') != self.domain:
+            return False
+        if cookie and entry.get('source') != self._source:
+            return False
+
+        now = time.time()
+        cookies = [c for c in entry.get('cookies', []) if not c.get('expires') or c['expires'] > now]
+        for c in cookies:
+            self.session.cookies.set(
+                c['name'], c['value'], domain=c.get('domain') or self.domain, path=c.get('path') or '/',
+                expires=c.get('expires'), secure=bool(c.get('secure')),
+            )
+        return bool(cookies)
+
+    def save(self):
+        """현재 쿠키(서버가 갱신한 값 포함)를 저장 파일에 기록 (다른 key의 기록은 유지)"""
+        cookies = [
+            {
+                'name': c.name, 'value': c.value, 'domain': c.domain, 'path': c.path,
+                'expires': c.expires, 'secure': c.secure,
+            }
+            for c in self.session.cookies
+        ]
+
+        with _jar_lock:
+            os.makedirs(os.path.dirname(os.path.abspath(self.jar_path)), exist_ok=True)
+            jar = _read_jar(self.jar_path)
+            jar[self.key] = {
+                'domain': self.domain,
+                'source': self._source,
+                'saved_at': time.time(),
+                'cookies': cookies,
+            }
+
+            # 쓰는 도중 중단되어도 기존 파일이 깨지지 않도록 임시 파일에 쓴 뒤 교체 (세션 정보이므로 본인만 읽기)
+            tmp_path = f"{self.jar_path}.{os.getpid()}.tmp"
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(jar, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.jar_path)
+
+    def preflight(self, max_age=PREFLIGHT_TTL) -> bool:
+        """로그인이 필요한 페이지를 가볍게 열어 세션이 살아 있는지 확인
+
+        로그인 페이지로 이동시키거나(3xx) 401/403을 반환하면 만료된 것으로 봅니다.
+        성공한 결과는 max_age초 동안 재사용합니다.
+
+        Returns:
+            세션이 유효하면 True (만료/접속 실패는 안내를 출력하고 False)
+        """
+        import requests
+
+        if self._verified_at is not None and time.monotonic() - self._verified_at < max_age:
+            return True
+
+        try:
+            with metrics.span('portal_preflight') as labels:
+                r = self.session.get(self.url(PREFLIGHT_PATH), timeout=self.timeout, allow_redirects=False)
+                labels['status'] = r.status_code
+        except requests.exceptions.RequestException as e:
+            print(f"✗ 포털 접속 실패: {e}")
+            return False
+
+        expired = r.is_redirect or r.status_code in (401, 403)
+        if expired:
+            print(f"⚠️ 포털 세션이 만료되었습니다 ({self.key}, 상태 코드 {r.status_code}).")
+            print("💡 포털에 다시 로그인한 뒤 SESSION_COOKIE를 새 값으로 설정해주세요.")
+            return False
+        if r.status_code >= 400:
+            print(f"✗ 포털 세션 확인 실패 (상태 코드 {r.status_code})")
+            return False
+
+        self._verified_at = time.monotonic()
+        # 확인 요청에서 서버가 쿠키를 갱신했을 수 있으므로 바로 저장
+        self.save()
+        return True
+
+    def post(self, path, data, referer_path=None):
+        """폼 전송 (응답으로 갱신된 쿠키는 저장)
+
+        Returns:
+            requests.Response
+        """
+        headers = {"Referer": self.url(referer_path)} if referer_path else None
+        r = self.session.post(self.url(path), data=data, timeout=self.timeout, headers=headers)
+        self.save()
+        return r
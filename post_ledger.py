@@ -0,0 +1,121 @@
+"""
+보고서 게시 기록 모듈
+포털에 게시한 보고서를 SQLite에 기록하여 이미 등록된 보고서를 다시 보내지 않도록 합니다.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+DEFAULT_LEDGER_PATH = os.path.join(
+    os.path.expanduser('~'), '.cache', 'cnu_report', 'post_ledger.sqlite3'
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    student_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    insert_result INTEGER,
+    posted_at REAL NOT NULL,
+    PRIMARY KEY (student_id, kind, key)
+);
+"""
+
+
+def content_hash(subject: str, contents: str) -> str:
+    """게시 내용 해시"""
+    return hashlib.sha256(f"{subject}\n{contents}".encode('utf-8')).hexdigest()
+
+
+class PostLedger:
+    """보고서 게시 기록 클래스
+
+    kind는 게시판 종류("Day"/"Week"), key는 날짜 또는 주차입니다.
+    insert_result가 NULL이면 전송 후 결과를 받지 못한 상태입니다.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: 기록 파일 경로 (없으면 POST_LEDGER_PATH 환경변수 또는 기본 캐시 경로)
+        """
+        self.path = path or os.getenv('POST_LEDGER_PATH') or DEFAULT_LEDGER_PATH
+        if self.path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        """기록 파일 닫기"""
+        with self._lock:
+            self._conn.close()
+
+    def get(self, student_id: str, kind: str, key: str) -> Optional[dict]:
+        """게시 기록 조회"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT content_hash, insert_result, posted_at FROM posts '
+                'WHERE student_id = ? AND kind = ? AND key = ?',
+                (student_id, kind, key)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        return {'content_hash': row[0], 'insert_result': row[1], 'posted_at': row[2]}
+
+    def is_posted(self, student_id: str, kind: str, key: str) -> bool:
+        """이미 등록에 성공한 보고서인지 확인"""
+        entry = self.get(student_id, kind, key)
+        return entry is not None and (entry['insert_result'] or 0) > 0
+
+    def check(self, student_id: str, kind: str, key: str, force: bool = False) -> bool:
+        """게시 전 확인
+
+        이미 등록됐거나, 전송 후 응답을 받지 못한 상태(예: 시간 초과)면 안내 후 True를 반환합니다.
+        응답을 받지 못한 게시는 실제로 등록됐을 수 있으므로 자동으로 다시 보내지 않으며,
+        포털에서 등록되지 않은 것을 확인한 뒤 force=True(--force)로 다시 보낼 수 있습니다.
+
+        Returns:
+            게시하지 않고 건너뛰어야 하면 True
+        """
+        entry = self.get(student_id, kind, key)
+        if entry is None:
+            return False
+
+        posted_at = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(entry['posted_at']))
+        if (entry['insert_result'] or 0) > 0:
+            print(f"⏭️ {key} 보고서는 이미 등록되었습니다. (Insert Result: {entry['insert_result']}, {posted_at})")
+            return True
+
+        if entry['insert_result'] is None:
+            if force:
+                print(f"⚠️ {key} 보고서의 이전 게시 결과를 확인하지 못했지만 ({posted_at}) --force로 다시 보냅니다.")
+                return False
+            print(f"⚠️ {key} 보고서의 이전 게시 결과를 확인하지 못했습니다 ({posted_at}). 중복 등록을 막기 위해 건너뜁니다.")
+            print("💡 포털에서 등록되지 않은 것을 확인했다면 --force 옵션으로 다시 게시해주세요.")
+            return True
+        return False
+
+    def mark_pending(self, student_id: str, kind: str, key: str, subject: str, contents: str):
+        """전송 직전 기록 (응답을 받지 못하고 중단된 경우를 구분하기 위함)"""
+        self._write(student_id, kind, key, content_hash(subject, contents), None)
+
+    def record(self, student_id: str, kind: str, key: str, subject: str, contents: str,
+               insert_result: int):
+        """게시 결과 기록"""
+        self._write(student_id, kind, key, content_hash(subject, contents), insert_result)
+
+    def _write(self, student_id, kind, key, digest, insert_result):
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO posts VALUES (?, ?, ?, ?, ?, ?)',
+                (student_id, kind, key, digest, insert_result, time.time())
+            )
@@ -0,0 +1,273 @@
+"""
+프롬프트 압축 모듈
+커밋 정보를 저장소/날짜별로 묶고 중복을 합쳐 지정한 토큰 예산 안에 들어가도록 줄입니다.
+"""
+
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List
+
+from git_analyzer import render_commits
+
+# 프롬프트 전체에 대한 기본 토큰 예산 (PROMPT_TOKEN_BUDGET 환경변수로 조정)
+DEFAULT_TOKEN_BUDGET = 4000
+
+# 예산을 넘으면 순서대로 적용할 압축 단계:
+# (커밋당 파일 수, 제목 최대 길이, 저장소/날짜별 최대 항목 수, 변경 내용 요약 표시 수준)
+# 변경 내용 요약 표시 수준: 'full' = 변경 라인 포함, 'functions' = 파일별 변경 함수만, None = 표시 안 함
+COMPACTION_LEVELS = [
+    (5, None, None, 'full'),
+    (5, None, None, 'functions'),
+    (5, None, None, None),
+    (3, None, None, None),
+    (1, 120, None, None),
+    (0, 80, None, None),
+    (0, 60, 10, None),
+    (0, 40, 5, None),
+    (0, 30, 2, None),
+]
+
+
+def get_token_budget() -> int:
+    """환경변수에 설정된 프롬프트 토큰 예산"""
+    return int(os.getenv('PROMPT_TOKEN_BUDGET', DEFAULT_TOKEN_BUDGET))
+
+
+def estimate_tokens(text: str) -> int:
+    """토큰 수 근사치 (영문/기호는 약 4자당 1토큰, 한글 등은 1자당 1토큰으로 계산)"""
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return ascii_chars // 4 + (len(text) - ascii_chars) + 1
+
+
+def _normalize_subject(subject: str) -> str:
+    """거의 같은 커밋 제목을 묶기 위한 정규화 (대소문자, 공백, 끝 문장부호 차이만 무시)
+
+    숫자와 기호는 그대로 두므로 'fix #12'와 'fix #13', 'v1.2'와 'v1.3'처럼 다른 작업은 따로 남습니다.
+    """
+    return ' '.join(subject.lower().split()).rstrip('.,;:!?… ')
+
+
+def truncate_text(text: str, token_budget: int, marker: str = "\n(이하 생략)") -> str:
+    """토큰 예산을 넘는 문자열을 줄 단위로 잘라내고 생략 표시를 붙임 (예산 안이면 그대로 반환)"""
+    if estimate_tokens(text) <= token_budget:
+        return text
+    while text and estimate_tokens(text) > token_budget:
+        text = text[:int(len(text) * 0.9)]
+    return text.rsplit("\n", 1)[0] + marker
+
+
+@dataclass
+class CompactionStats:
+    """프롬프트 압축 결과 통계"""
+    original_tokens: int
+    compacted_tokens: int
+    commits: int
+    merged_commits: int
+    dropped_files: int
+    dropped_entries: int
+    level: int
+
+    def summary(self) -> str:
+        return (f"✂️ 커밋 정보 압축: 약 {self.original_tokens} → {self.compacted_tokens} 토큰 "
+                f"(커밋 {self.commits}개, 중복 병합 {self.merged_commits}개, "
+                f"파일 {self.dropped_files}개 생략, 항목 {self.dropped_entries}개 생략)")
+
+
+class _Entry:
+    """같은 저장소/날짜에서 제목이 거의 같은 커밋 묶음"""
+
+    __slots__ = ('subject', 'count', 'churn', 'digests')
+
+    def __init__(self, subject):
+        self.subject = subject
+        self.count = 0
+        self.churn = {}
+        self.digests = []
+
+    def add(self, commit):
+        self.count += 1
+        for change in commit.files:
+            lines = (change.added or 0) + (change.deleted or 0)
+            self.churn[change.path] = self.churn.get(change.path, 0) + lines
+        self.digests.extend(commit.digest)
+
+
+def commit_local_day(commit):
+    """커밋 시각의 로컬 날짜 (GitAnalyzer 기본 설정의 commit_day와 같은 기준)"""
+    return datetime.fromtimestamp(commit.commit_timestamp).strftime('%Y-%m-%d')
+
+
+def _group_commits(results, day_of=commit_local_day):
+    """저장소 → 날짜 → 중복 병합된 항목 목록으로 묶기
+
+    날짜는 커밋을 수집한 GitAnalyzer와 같은 기준(day_of)으로 정해야 작성 시각 문자열과 달리
+    수집 기준과 어긋나지 않습니다 (예: 자정 전후 커밋, 다른 시간대에서 작성한 커밋).
+    """
+    groups = []
+    for result in results:
+        if not result.commits:
+            continue
+
+        days = {}
+        for commit in result.commits:
+            entries = days.setdefault(day_of(commit), {})
+            key = _normalize_subject(commit.subject)
+            if key not in entries:
+                entries[key] = _Entry(commit.subject)
+            entries[key].add(commit)
+
+        groups.append((result.name, sorted(days.items())))
+
+    return groups
+
+
+def _render_digests(digests, detail):
+    """변경 내용 요약을 표시 수준에 맞춰 라인 목록으로 변환"""
+    lines = []
+    for digest in digests:
+        if detail == 'full':
+            lines.extend("      " + line for line in digest.render().split("\n"))
+        elif digest.functions:
+            lines.append(f"      {digest.path}: {', '.join(digest.functions)}")
+    if lines:
+        lines.insert(0, "    변경 내용:")
+    return lines
+
+
+def _render(groups, max_files, max_subject, max_entries, digest_detail=None):
+    """압축 단계 설정에 맞춰 묶인 커밋 정보를 문자열로 변환
+
+    Returns:
+        (문자열, 생략된 파일 수, 생략된 항목 수)
+    """
+    lines: List[str] = []
+    dropped_files = 0
+    dropped_entries = 0
+
+    for repo_name, days in groups:
+        lines.append(f"📁 {repo_name}:")
+        for day, entries in days:
+            lines.append(f"  [{day}]")
+            items = list(entries.values())
+            omitted = 0
+            if max_entries is not None and len(items) > max_entries:
+                # 변경량이 큰 작업을 우선 남김
+                items.sort(key=lambda e: sum(e.churn.values()), reverse=True)
+                omitted = len(items) - max_entries
+                dropped_entries += omitted
+                items = items[:max_entries]
+
+            for entry in items:
+                subject = entry.subject
+                if max_subject is not None and len(subject) > max_subject:
+                    subject = subject[:max_subject - 1] + '…'
+                count = f" (×{entry.count})" if entry.count > 1 else ""
+                lines.append(f"  • {subject}{count}")
+
+                # 변경량(추가+삭제 라인) 상위 파일만 표시
+                files = sorted(entry.churn.items(), key=lambda item: item[1], reverse=True)
+                shown = files[:max_files]
+                dropped_files += len(files) - len(shown)
+                if shown:
+                    lines.append("    주요 파일: " + ", ".join(f"{path}({churn})" for path, churn in shown))
+                if digest_detail:
+                    lines.extend(_render_digests(entry.digests, digest_detail))
+
+            if omitted:
+                lines.append(f"  • 그 외 작업 {omitted}건")
+
+    return "\n".join(lines), dropped_files, dropped_entries
+
+
+def compact_commits(results, token_budget: int, day_of=None) -> tuple:
+    """커밋 수집 결과를 토큰 예산 안에 들어가는 프롬프트용 문자열로 압축
+
+    Args:
+        results: RepoCommits 리스트
+        token_budget: 커밋 정보에 사용할 최대 토큰 수
+        day_of: 커밋 → 날짜('YYYY-MM-DD') 함수 (보통 GitAnalyzer.commit_day, 없으면 커밋 시각의 로컬 날짜)
+
+    Returns:
+        (압축된 문자열, CompactionStats)
+    """
+    original_tokens = estimate_tokens(render_commits(results, show_date=True))
+    total_commits = sum(len(result.commits) for result in results)
+
+    groups = _group_commits(results, day_of or commit_local_day)
+    merged = total_commits - sum(len(entries) for _, days in groups for _, entries in days)
+
+    for level, (max_files, max_subject, max_entries, digest_detail) in enumerate(COMPACTION_LEVELS):
+        text, dropped_files, dropped_entries = _render(groups, max_files, max_subject, max_entries, digest_detail)
+        tokens = estimate_tokens(text)
+        if tokens <= token_budget:
+            break
+
+    # 마지막 단계로도 넘치면 예산에 맞춰 자름
+    if tokens > token_budget:
+        text = truncate_text(text, token_budget, "\n  • (이하 생략)")
+        tokens = estimate_tokens(text)
+
+    stats = CompactionStats(
+        original_tokens=original_tokens,
+        compacted_tokens=tokens,
+        commits=total_commits,
+        merged_commits=merged,
+        dropped_files=dropped_files,
+        dropped_entries=dropped_entries,
+        level=level,
+    )
+    return text, stats
+
+
+def fit_prompt(build_prompt, results, token_budget=None, day_of=None):
+    """프롬프트 템플릿 분량을 제외한 예산에 맞춰 커밋 정보를 압축한 뒤 프롬프트 생성
+
+    Args:
+        build_prompt: 커밋 정보 문자열을 받아 프롬프트를 만드는 함수
+        results: RepoCommits 리스트
+        token_budget: 프롬프트 전체 토큰 예산 (없으면 PROMPT_TOKEN_BUDGET 환경변수 또는 기본값)
+        day_of: 커밋 → 날짜 함수 (compact_commits 참고)
+
+    Returns:
+        (프롬프트, CompactionStats)
+    """
+    token_budget = token_budget or get_token_budget()
+    overhead = estimate_tokens(build_prompt(""))
+    commits_data, stats = compact_commits(results, max(token_budget - overhead, 100), day_of)
+    print(stats.summary())
+    return build_prompt(commits_data), stats
+
+
+def fit_sections(build_prompt, sections, token_budget=None):
+    """프롬프트 템플릿 분량을 제외한 예산을 여러 문단(예: 일일 보고서)에 나눠 맞춘 뒤 프롬프트 생성
+
+    예산 안이면 그대로 이어 붙이고, 넘치면 짧은 문단은 그대로 두고 남은 예산을 긴 문단들에
+    고르게 나눠 각각 잘라냅니다.
+
+    Args:
+        build_prompt: 이어 붙인 문자열을 받아 프롬프트를 만드는 함수
+        sections: 문자열 리스트 (순서 유지)
+        token_budget: 프롬프트 전체 토큰 예산 (없으면 PROMPT_TOKEN_BUDGET 환경변수 또는 기본값)
+
+    Returns:
+        프롬프트
+    """
+    token_budget = token_budget or get_token_budget()
+    available = max(token_budget - estimate_tokens(build_prompt("")), 100)
+    sizes = [estimate_tokens(section) for section in sections]
+
+    if sum(sizes) > available:
+        # 작은 문단부터 배분하고 남는 예산은 뒤의 긴 문단들이 나눠 가짐
+        shares = {}
+        remaining = available
+        order = sorted(range(len(sections)), key=lambda i: sizes[i])
+        for n, i in enumerate(order):
+            shares[i] = min(sizes[i], remaining // (len(order) - n))
+            remaining -= shares[i]
+        original = sum(sizes)
+        sections = [truncate_text(section, shares[i]) for i, section in enumerate(sections)]
+        print(f"✂️ 문단 압축: 약 {original} → {sum(estimate_tokens(s) for s in sections)} 토큰 "
+              f"(문단 {len(sections)}개)")
+
+    return build_prompt("\n\n".join(sections))
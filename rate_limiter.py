@@ -0,0 +1,75 @@
+"""
+요청 속도 제한 모듈
+토큰 버킷 방식으로 분당 요청 수를 제한하고, 서버가 요청한 대기 시간 동안 모든 호출을 멈춥니다.
+"""
+
+import os
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """스레드 간에 공유 가능한 토큰 버킷 속도 제한 클래스"""
+
+    def __init__(self, requests_per_minute: float, burst: int = 1):
+        """
+        Args:
+            requests_per_minute: 분당 허용 요청 수
+            burst: 한 번에 연속으로 보낼 수 있는 최대 요청 수
+        """
+        if requests_per_minute <= 0:
+            raise ValueError("requests_per_minute는 0보다 커야 합니다.")
+
+        self.rate = requests_per_minute / 60.0
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def acquire(self) -> float:
+        """토큰 하나를 얻을 때까지 대기
+
+        Returns:
+            대기한 시간(초)
+        """
+        waited = 0.0
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+
+                if now >= self._blocked_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+
+                wait = max(self._blocked_until - now, (1 - self._tokens) / self.rate)
+
+            time.sleep(wait)
+            waited += wait
+
+    def pause(self, seconds: float):
+        """서버가 속도 제한(429)을 알린 경우 모든 호출을 지정 시간 동안 멈춤"""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+
+
+_shared_limiter: Optional[TokenBucket] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_rate_limiter() -> TokenBucket:
+    """프로세스 전체에서 공유하는 Gemini 요청 속도 제한기 (GEMINI_RPM 환경변수, 기본 분당 15회)"""
+    global _shared_limiter
+
+    with _shared_lock:
+        if _shared_limiter is None:
+            _shared_limiter = TokenBucket(float(os.getenv('GEMINI_RPM', '15')))
+        return _shared_limiter
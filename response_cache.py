@@ -0,0 +1,119 @@
+"""
+Gemini 응답 캐시 모듈
+(모델, generationConfig, 프롬프트) 해시를 키로 응답을 디스크에 저장하여 같은 요청의 재호출을 막습니다.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.expanduser('~'), '.cache', 'cnu_report', 'gemini_cache.sqlite3'
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_by_access ON responses (accessed_at);
+"""
+
+
+class ResponseCache:
+    """TTL과 크기 제한(LRU 방식 정리)이 있는 Gemini 응답 디스크 캐시 클래스"""
+
+    def __init__(self, path: Optional[str] = None, ttl: float = 30 * 24 * 3600,
+                 max_entries: int = 1000, max_bytes: int = 20 * 1024 * 1024):
+        """
+        Args:
+            path: 캐시 파일 경로 (없으면 GEMINI_CACHE_PATH 환경변수 또는 기본 캐시 경로)
+            ttl: 응답 유효 시간(초)
+            max_entries: 최대 저장 응답 수
+            max_bytes: 최대 저장 용량(바이트)
+        """
+        self.path = path or os.getenv('GEMINI_CACHE_PATH') or DEFAULT_CACHE_PATH
+        if self.path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        """캐시 파일 닫기"""
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def make_key(model: str, generation_config: dict, prompt: str) -> str:
+        """요청 내용으로부터 캐시 키(SHA-256) 생성"""
+        payload = json.dumps(
+            {'model': model, 'generationConfig': generation_config, 'prompt': prompt},
+            sort_keys=True,
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """캐시된 응답 조회 (만료된 응답은 삭제 후 None)"""
+        now = time.time()
+
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                'SELECT response, created_at FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            response, created_at = row
+            if now - created_at > self.ttl:
+                self._conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+                return None
+
+            self._conn.execute(
+                'UPDATE responses SET accessed_at = ? WHERE key = ?', (now, key)
+            )
+
+        return response
+
+    def set(self, key: str, response: str):
+        """응답 저장 후 제한을 넘는 항목 정리"""
+        now = time.time()
+        size = len(response.encode('utf-8'))
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)',
+                (key, response, size, now, now)
+            )
+            self._evict(now)
+
+    def _evict(self, now: float):
+        """만료된 응답과 개수/용량 제한을 넘는 오래 사용하지 않은 응답 삭제 (잠금 안에서 호출)"""
+        self._conn.execute('DELETE FROM responses WHERE created_at < ?', (now - self.ttl,))
+
+        total_entries = 0
+        total_bytes = 0
+        stale = []
+        for key, size in self._conn.execute(
+            'SELECT key, size FROM responses ORDER BY accessed_at DESC'
+        ):
+            total_entries += 1
+            total_bytes += size
+            if total_entries > self.max_entries or total_bytes > self.max_bytes:
+                stale.append((key,))
+
+        if stale:
+            self._conn.executemany('DELETE FROM responses WHERE key = ?', stale)
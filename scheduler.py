@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+보고서 자동 게시 스케줄러
+계속 실행되면서 정해진 시각에 일일/주간 보고서를 생성하고 게시합니다.
+GeminiAPI, 포털 세션, 커밋 색인을 한 번만 만들어 재사용하고,
+절전이나 중단으로 놓친 게시 시각은 게시 기록(PostLedger)을 확인해 최근 기간만큼 따라잡습니다.
+
+사용 예:
+    python scheduler.py                          # 계속 실행
+    python scheduler.py --once                   # 밀린 작업만 처리하고 종료 (cron 등에서 사용)
+    python scheduler.py --daily-time 18:00 --weekly-time 18:30 --weekly-weekday 4
+"""
+
+import argparse
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from commit_index import CommitIndex
+from daily_post import (
+    REPOSITORIES, AUTHOR, summarize_commits, load_student_info, post_report
+)
+from git_analyzer import GitAnalyzer, has_commits
+from metrics import add_arguments as add_metrics_arguments, run_instrumented
+from portal_client import PortalClient
+from post_ledger import PostLedger
+from response_cache import ResponseCache
+from week_post import (
+    INTERN_START_DATE, calculate_week_number, collect_week_commits, summarize_week, post_week_report
+)
+
+# 기본 게시 시각 (환경변수로 조정)
+DEFAULT_DAILY_TIME = os.getenv('DAILY_POST_TIME', '18:00')
+DEFAULT_WEEKLY_TIME = os.getenv('WEEKLY_POST_TIME', '18:30')
+DEFAULT_WEEKLY_WEEKDAY = int(os.getenv('WEEKLY_POST_WEEKDAY', 4))  # 0=월요일, 4=금요일
+DEFAULT_CATCHUP_DAYS = int(os.getenv('SCHEDULER_CATCHUP_DAYS', 7))
+DEFAULT_RETRY_INTERVAL = int(os.getenv('SCHEDULER_RETRY_INTERVAL', 1800))
+
+# 한 번에 자는 최대 시간(초) — 절전 후 깨어났을 때 벽시계 시각을 다시 확인하기 위함
+MAX_SLEEP = 60
+
+
+@dataclass(frozen=True, order=True)
+class Slot:
+    """게시 예정 작업 하나 (due 시각 순으로 정렬)"""
+    due: datetime
+    kind: str
+    target: datetime
+
+    @property
+    def key(self):
+        """게시 기록 키 (일일: 날짜, 주간: 주차)"""
+        if self.kind == "Day":
+            return self.target.strftime('%Y-%m-%d')
+        return calculate_week_number(self.target)
+
+
+def parse_time(value):
+    """'HH:MM' 문자열을 (시, 분)으로 변환"""
+    try:
+        hour, minute = (int(part) for part in value.split(':'))
+    except ValueError:
+        raise ValueError(f"시각은 HH:MM 형식이어야 합니다: {value}")
+    if not (0 <= hour < 24 and 0 <= minute < 60):
+        raise ValueError(f"올바르지 않은 시각입니다: {value}")
+    return hour, minute
+
+
+class ReportScheduler:
+    """일일/주간 보고서 자동 게시 스케줄러"""
+
+    def __init__(self, daily_time=DEFAULT_DAILY_TIME, weekly_time=DEFAULT_WEEKLY_TIME,
+                 weekly_weekday=DEFAULT_WEEKLY_WEEKDAY, catchup_days=DEFAULT_CATCHUP_DAYS,
+                 include_weekends=False, hierarchical=False, retry_interval=DEFAULT_RETRY_INTERVAL):
+        """
+        Args:
+            daily_time: 일일 보고서 게시 시각 ('HH:MM')
+            weekly_time: 주간 보고서 게시 시각 ('HH:MM')
+            weekly_weekday: 주간 보고서 게시 요일 (0=월요일 ~ 6=일요일)
+            catchup_days: 놓친 게시를 따라잡을 최대 기간(일)
+            include_weekends: 주말 일일 보고서도 게시할지 여부
+            hierarchical: 주간 보고서를 일일 보고서 요약으로 생성할지 여부
+            retry_interval: 실패했거나 커밋이 없던 작업을 다시 확인하기까지의 대기 시간(초)
+        """
+        self.daily_time = parse_time(daily_time)
+        self.weekly_time = parse_time(weekly_time)
+        self.weekly_weekday = weekly_weekday
+        self.catchup_days = catchup_days
+        self.include_weekends = include_weekends
+        self.hierarchical = hierarchical
+        self.retry_interval = retry_interval
+
+        # 실행 내내 재사용하는 상태 (연결 풀, 저장된 포털 쿠키, 색인 연결)
+        self.student_info = load_student_info()
+        self.ledger = PostLedger()
+        self.analyzer = GitAnalyzer(REPOSITORIES, index=CommitIndex())
+        # requests를 불러오는 Gemini 클라이언트는 스케줄러를 실제로 만들 때만 불러옴
+        from gemini_client import GeminiAPI
+        self.gemini = GeminiAPI(cache=ResponseCache())
+        self.portal = PortalClient(key=self.student_info["id"])
+
+        # 게시 기록상 다시 보내지 않을 작업과, 실패했거나 커밋이 없던 작업의 다음 재시도 시각
+        # (게시 시각 이후에 커밋한 날짜도 따라잡기 기간 안에서는 다시 확인해 게시)
+        self.skipped = set()
+        self.retry_at = {}
+
+    def close(self):
+        """연결 정리"""
+        self.gemini.close()
+        self.portal.close()
+        self.analyzer.index.close()
+        self.ledger.close()
+
+    def slots_between(self, start, end):
+        """start 이후 end까지 게시 시각이 돌아오는 작업 목록 (시각 순)"""
+        slots = []
+        day = max(start, INTERN_START_DATE).replace(hour=0, minute=0, second=0, microsecond=0)
+        while day <= end:
+            if self.include_weekends or day.weekday() < 5:
+                slots.append(Slot(day.replace(hour=self.daily_time[0], minute=self.daily_time[1]), "Day", day))
+            if day.weekday() == self.weekly_weekday:
+                slots.append(Slot(day.replace(hour=self.weekly_time[0], minute=self.weekly_time[1]), "Week", day))
+            day += timedelta(days=1)
+
+        return sorted(slot for slot in slots if start <= slot.due <= end)
+
+    def due_slots(self, now):
+        """지금 실행해야 하는 작업 목록 (따라잡기 기간 내에서 아직 등록되지 않은 것)"""
+        slots = []
+        for slot in self.slots_between(now - timedelta(days=self.catchup_days), now):
+            if slot in self.skipped or self.retry_at.get(slot, now) > now:
+                continue
+            # 이미 등록됐거나 응답을 받지 못한 게시(중복 등록 위험)는 다시 보내지 않음 (안내는 한 번만 출력)
+            if self.ledger.check(self.student_info["id"], slot.kind, slot.key):
+                self.skipped.add(slot)
+                continue
+            slots.append(slot)
+
+        return slots
+
+    def next_wakeup(self, now):
+        """다음 작업 시각 (예정된 게시 또는 실패 작업 재시도 중 가장 빠른 것)"""
+        upcoming = [slot.due for slot in self.slots_between(now + timedelta(seconds=1), now + timedelta(days=8))]
+        upcoming.extend(when for when in self.retry_at.values() if when > now)
+        return min(upcoming) if upcoming else now + timedelta(days=1)
+
+    def run_slot(self, slot):
+        """작업 하나 실행
+
+        Returns:
+            '성공', '실패', '커밋 없음' 중 하나
+        """
+        print(f"\n⏰ {slot.kind} {slot.key} 작업 시작 (예정 시각 {slot.due.strftime('%Y-%m-%d %H:%M')})")
+
+        if slot.kind == "Day":
+            results = self.analyzer.collect_commits_for_date(slot.key, author=AUTHOR)
+            if not has_commits(results):
+                return "커밋 없음"
+            # 세션이 만료됐으면 보고서를 생성하지 않고 나중에 다시 시도
+            if not self.portal.preflight():
+                return "실패"
+            report = summarize_commits(self.gemini, results, slot.key)
+            if report is None:
+                print("✗ 보고서 생성에 실패해 게시하지 않습니다.")
+                return "실패"
+            subject, contents = report
+            post = lambda: post_report(self.portal, self.student_info, slot.key, subject, contents, self.ledger)
+        else:
+            results = collect_week_commits(self.analyzer, slot.target, AUTHOR)
+            if not has_commits(results):
+                return "커밋 없음"
+            if not self.portal.preflight():
+                return "실패"
+            # 방금 수집한 결과로 생성 (히스토리를 다시 순회하지 않음)
+            report = summarize_week(self.gemini, self.analyzer, results, slot.target, self.hierarchical)
+            # 생성에 실패하면 게시하지 않고 나중에 다시 생성
+            if report is None:
+                print("✗ 보고서 생성에 실패해 게시하지 않습니다.")
+                return "실패"
+            subject, contents = report
+            post = lambda: post_week_report(self.portal, self.student_info, slot.key, subject, contents, self.ledger)
+
+        import requests
+        try:
+            return "성공" if post() > 0 else "실패"
+        except requests.exceptions.RequestException as e:
+            print(f"✗ 게시 요청 실패: {e}")
+            return "실패"
+
+    def run_pending(self, now=None):
+        """밀린 작업을 오래된 순서대로 실행
+
+        Returns:
+            실행한 작업 수
+        """
+        now = now or datetime.now()
+        # 따라잡기 기간이 지난 작업은 더 이상 실행하지 않으므로 재시도 예약도 정리
+        window_start = now - timedelta(days=self.catchup_days)
+        self.retry_at = {slot: when for slot, when in self.retry_at.items() if slot.due >= window_start}
+
+        slots = self.due_slots(now)
+        for slot in slots:
+            status = self.run_slot(slot)
+            print(f"📋 {slot.kind} {slot.key}: {status}")
+            if status in ("커밋 없음", "실패"):
+                self.retry_at[slot] = datetime.now() + timedelta(seconds=self.retry_interval)
+            else:
+                self.retry_at.pop(slot, None)
+
+        return len(slots)
+
+    def run_forever(self):
+        """작업 시각마다 깨어나 밀린 작업 실행 (Ctrl+C로 종료)"""
+        print(f"🕒 스케줄러 시작: 일일 {self.daily_time[0]:02d}:{self.daily_time[1]:02d}, "
+              f"주간 {'월화수목금토일'[self.weekly_weekday]}요일 {self.weekly_time[0]:02d}:{self.weekly_time[1]:02d}, "
+              f"따라잡기 {self.catchup_days}일")
+        while True:
+            self.run_pending()
+
+            now = datetime.now()
+            wakeup = self.next_wakeup(now)
+            print(f"💤 다음 작업: {wakeup.strftime('%Y-%m-%d %H:%M')}")
+
+            # 짧게 나눠 자면서 벽시계를 확인 (절전 후 깨어나면 바로 밀린 작업 처리)
+            while datetime.now() < wakeup:
+                time.sleep(min(MAX_SLEEP, max((wakeup - datetime.now()).total_seconds(), 0.1)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="일일/주간 보고서 자동 게시 스케줄러")
+    parser.add_argument('--daily-time', default=DEFAULT_DAILY_TIME, help="일일 보고서 게시 시각 (HH:MM)")
+    parser.add_argument('--weekly-time', default=DEFAULT_WEEKLY_TIME, help="주간 보고서 게시 시각 (HH:MM)")
+    parser.add_argument('--weekly-weekday', type=int, default=DEFAULT_WEEKLY_WEEKDAY, choices=range(7),
+                        help="주간 보고서 게시 요일 (0=월요일 ~ 6=일요일, 기본 금요일)")
+    parser.add_argument('--catchup-days', type=int, default=DEFAULT_CATCHUP_DAYS,
+                        help="놓친 게시를 따라잡을 최대 기간(일)")
+    parser.add_argument('--include-weekends', action='store_true', help="주말 일일 보고서도 게시")
+    parser.add_argument('--hierarchical', action='store_true', help="주간 보고서를 일일 보고서 요약으로 생성")
+    parser.add_argument('--once', action='store_true', help="밀린 작업만 처리하고 종료")
+    add_metrics_arguments(parser)
+    args = parser.parse_args()
+
+    scheduler = ReportScheduler(
+        daily_time=args.daily_time,
+        weekly_time=args.weekly_time,
+        weekly_weekday=args.weekly_weekday,
+        catchup_days=args.catchup_days,
+        include_weekends=args.include_weekends,
+        hierarchical=args.hierarchical,
+    )
+
+    def run():
+        try:
+            if args.once:
+                count = scheduler.run_pending()
+                print(f"\n✓ 작업 {count}개 처리 완료")
+            else:
+                scheduler.run_forever()
+        except KeyboardInterrupt:
+            print("\n👋 스케줄러를 종료합니다.")
+        finally:
+            scheduler.close()
+
+    run_instrumented(run, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,29 +1,26 @@
-import requests
 import json
+import argparse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import os
 import sys
-from gemini_client import GeminiAPI
-from git_analyzer import GitAnalyzer
-
-# 환경변수에서 설정값 로드
-BASE = os.getenv('BASE_URL', 'https://cnujob.cnu.ac.kr')
-COOKIE = os.getenv('SESSION_COOKIE')
-
-# 필수 환경변수 체크
-if not COOKIE:
-    print("⚠️ SESSION_COOKIE 환경변수가 설정되지 않았습니다.")
-    print("💡 export SESSION_COOKIE='your_cookie_string'")
-    raise ValueError("SESSION_COOKIE가 필요합니다.")
+from response_cache import ResponseCache
+from git_analyzer import GitAnalyzer, has_commits
+from commit_index import CommitIndex
+from post_ledger import PostLedger
+from prompt_budget import compact_commits, fit_prompt, fit_sections, get_token_budget
+from metrics import metrics, add_arguments as add_metrics_arguments, run_instrumented
+from daily_post import REPOSITORIES, AUTHOR, summarize_commits, load_student_info
+from portal_client import PortalClient
 
 # 인턴십 시작일
 INTERN_START_DATE = datetime(2025, 9, 1)
 
-def get_target_date():
+def get_target_date(date_string=None):
     """대상 날짜 결정 (인자 또는 현재 날짜)"""
-    if len(sys.argv) > 1:
+    if date_string:
         try:
-            return datetime.strptime(sys.argv[1], '%Y-%m-%d')
+            return datetime.strptime(date_string, '%Y-%m-%d')
         except ValueError:
             print("올바른 날짜 형식을 입력해주세요 (YYYY-MM-DD)")
             sys.exit(1)
@@ -77,122 +74,182 @@ def create_gemini_prompt(commits_data, week_range, week_number):
 """
     return prompt
 
-def generate_content_with_gemini(target_date):
-    """Git 커밋 기반으로 주간 보고서 생성"""
-    # 주차 및 날짜 범위 계산
-    week_number = calculate_week_number(target_date)
-    week_range = get_week_date_range(target_date)
+def parse_summary(summary, week_number):
+    """생성된 보고서에서 제목과 내용 분리"""
+    lines = summary.strip().split('\n')
+    subject = ""
+    contents = ""
     
-    print(f"📊 {week_number} 보고서 생성 중...")
-    print(f"📅 분석 기간: {week_range[0].strftime('%Y-%m-%d')} ~ {week_range[1].strftime('%Y-%m-%d')}")
+    for i, line in enumerate(lines):
+        if line.startswith(f"# {week_number}"):
+            subject = line.replace("# ", "").strip()
+            contents = '\n'.join(lines[i+1:]).strip()
+            break
     
-    # Git 분석기 초기화
-    repositories = [
-        "/Users/iyein/Documents/ai-show-agent",
-        "/Users/iyein/Documents/cleaning-service", 
-        "/Users/iyein/Documents/gmpang-linktree-project"
-    ]
+    if not subject:
+        subject = f"{week_number} 주간보고서"
+        contents = summary.strip()
     
-    analyzer = GitAnalyzer(repositories)
+    return subject, contents
+
+def summarize_daily_reports(gemini, analyzer, results, week_range, max_workers=4):
+    """주간 커밋을 날짜별로 나눠 일일 보고서 생성 (map 단계)
+
+    daily_post와 같은 프롬프트를 사용하므로 이미 만든 일일 보고서는 캐시에서 바로 가져오고,
+    커밋이 바뀐 날짜만 새로 생성합니다. 일일 보고서 생성에 실패한 날짜는 그날의 커밋 정보를
+    압축해 대신 사용합니다.
+
+    Returns:
+        날짜순 (날짜, 제목, 내용) 리스트
+    """
+    start, end = week_range
+    days = [
+        (start + timedelta(days=i)).strftime('%Y-%m-%d')
+        for i in range((end.date() - start.date()).days + 1)
+    ]
+    # 이미 수집한 주간 결과를 날짜별로 나누므로 저장소 히스토리를 다시 순회하지 않음
+    by_day = analyzer.split_by_day(results, days)
+    target_days = [day for day in days if has_commits(by_day[day])]
     
-    # 주간 커밋 데이터 수집
-    print("🔍 커밋 정보 수집중...")
-    commits_data = analyzer.analyze_commits_for_date_range(
-        week_range[0].strftime('%Y-%m-%d'),
-        week_range[1].strftime('%Y-%m-%d'),
-        author="iyeaaa"
-    )
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        reports = list(executor.map(
+            lambda day: summarize_commits(gemini, by_day[day], day), target_days
+        ))
     
-    # 실제 커밋이 있는지 확인
-    lines = commits_data.strip().split('\n')
-    has_actual_commits = any('•' in line for line in lines)
+    daily_reports = []
+    for day, report in zip(target_days, reports):
+        if report is None:
+            print(f"↪️ {day} 일일 보고서 대신 커밋 정보를 사용합니다.")
+            commits_data, _ = compact_commits(
+                by_day[day], get_token_budget() // len(target_days), day_of=analyzer.commit_day
+            )
+            report = ("커밋 내역", commits_data)
+        daily_reports.append((day, *report))
     
-    if not has_actual_commits:
-        print(f"❌ {week_number}에 해당하는 커밋을 찾을 수 없습니다.")
-        return f"{week_number} 주간보고서", f"{week_number} 업무 수행 내용", week_number
+    return daily_reports
+
+def collect_week_commits(analyzer, target_date, author=AUTHOR):
+    """기준 날짜가 속한 주(월요일 또는 인턴십 시작일 ~ 기준 날짜)의 커밋 수집"""
+    week_start, week_end = get_week_date_range(target_date)
+    return analyzer.collect_commits_for_date_range(
+        week_start.strftime('%Y-%m-%d'),
+        week_end.strftime('%Y-%m-%d'),
+        author=author
+    )
+
+def summarize_week(gemini, analyzer, results, target_date, hierarchical=False):
+    """수집된 주간 커밋으로 주간 보고서 제목과 내용 생성
+
+    Args:
+        gemini: GeminiAPI
+        analyzer: 커밋을 수집한 GitAnalyzer (hierarchical일 때 날짜별로 나누는 데 사용)
+        results: collect_week_commits 결과
+        target_date: 기준 날짜
+        hierarchical: True면 일일 보고서를 먼저 만든 뒤(캐시 재사용) 이를 요약해 주간 보고서 생성
+
+    Returns:
+        (제목, 내용), Gemini 호출이 실패하거나 응답이 비어 있으면 None
+    """
+    week_number = calculate_week_number(target_date)
+    week_range = get_week_date_range(target_date)
     
     try:
-        gemini = GeminiAPI()
-        prompt = create_gemini_prompt(commits_data, week_range, week_number)
+        if hierarchical:
+            # 일일 보고서를 모아 짧은 주간 요약 프롬프트 생성 (reduce 단계)
+            print("🗂️ 일일 보고서 기반으로 주간 보고서를 생성합니다.")
+            daily_reports = summarize_daily_reports(gemini, analyzer, results, week_range)
+            # 일일 보고서를 합친 분량도 토큰 예산에 맞춰 날짜별로 나눠 줄임
+            prompt = fit_sections(
+                lambda reports_data: create_gemini_prompt(reports_data, week_range, week_number),
+                [f"[{day}] {subject}\n{contents}" for day, subject, contents in daily_reports]
+            )
+        else:
+            # 커밋 정보를 토큰 예산에 맞춰 압축한 프롬프트 생성
+            prompt, _ = fit_prompt(
+                lambda commits_data: create_gemini_prompt(commits_data, week_range, week_number), results,
+                day_of=analyzer.commit_day
+            )
         
-        summary = gemini.call_api(prompt, max_tokens=1500)
+        summary = gemini.call_api(prompt, max_tokens=1500, use_cache=not os.getenv('GEMINI_NO_CACHE'))
         
         if not summary:
-            return f"{week_number} 주간보고서", f"{week_number} 업무 수행 내용", week_number
+            print(f"✗ {week_number} 보고서 생성 실패 (빈 응답)")
+            return None
         
-        # 제목과 내용 분리
-        lines = summary.strip().split('\n')
-        subject = ""
-        contents = ""
-        
-        for i, line in enumerate(lines):
-            if line.startswith(f"# {week_number}"):
-                subject = line.replace("# ", "").strip()
-                contents = '\n'.join(lines[i+1:]).strip()
-                break
-        
-        if not subject:
-            subject = f"{week_number} 주간보고서"
-            contents = summary.strip()
-        
-        return subject, contents, week_number
+        return parse_summary(summary, week_number)
         
     except Exception as e:
         print(f"제미나이 API 오류: {e}")
-        return f"{week_number} 주간보고서", f"{week_number} 업무 수행 내용", week_number
+        return None
 
-def main():
-    # 대상 날짜 결정
-    target_date = get_target_date()
+def generate_content_with_gemini(target_date, hierarchical=False, gemini=None, analyzer=None, author=AUTHOR):
+    """Git 커밋 기반으로 주간 보고서 생성 (수집 후 summarize_week)
+
+    Args:
+        target_date: 기준 날짜
+        hierarchical: True면 일일 보고서를 먼저 만든 뒤(캐시 재사용) 이를 요약해 주간 보고서 생성
+        gemini: 재사용할 GeminiAPI (없으면 새로 생성)
+        analyzer: 재사용할 GitAnalyzer (없으면 커밋 색인을 사용하는 분석기 생성)
+        author: 작성자 필터
+
+    Returns:
+        (제목, 내용, 주차), 커밋이 없거나 생성에 실패하면 None
+    """
+    # 주차 및 날짜 범위 계산
+    week_number = calculate_week_number(target_date)
+    week_range = get_week_date_range(target_date)
+    
+    print(f"📊 {week_number} 보고서 생성 중...")
+    print(f"📅 분석 기간: {week_range[0].strftime('%Y-%m-%d')} ~ {week_range[1].strftime('%Y-%m-%d')}")
+    
+    # 커밋 색인을 사용해 이미 읽은 히스토리는 다시 순회하지 않음
+    analyzer = analyzer or GitAnalyzer(REPOSITORIES, index=CommitIndex())
     
-    print(f"제미나이 API를 사용하여 {target_date.strftime('%Y-%m-%d')} 기준 주간 보고서를 생성중...")
-    subject, contents, week_number = generate_content_with_gemini(target_date)
+    # 주간 커밋 데이터 수집
+    print("🔍 커밋 정보 수집중...")
+    results = collect_week_commits(analyzer, target_date, author)
     
-    print(f"생성된 제목: {subject}")
-    print(f"생성된 내용: {contents[:100]}...")
+    # 실제 커밋이 있는지 확인
+    if not has_commits(results):
+        print(f"❌ {week_number}에 해당하는 커밋을 찾을 수 없습니다.")
+        return None
     
-    # 세션 설정
-    s = requests.Session()
-    s.headers.update({
-        "Origin": BASE,
-        "Referer": f"{BASE}/student/report/studentBoardWeekAdd",
-        "User-Agent": "Mozilla/5.0",
-    })
+    try:
+        # 같은 날짜를 다시 실행하면 (예: 게시 실패 후 재시도) 캐시된 응답을 재사용
+        if gemini is None:
+            from gemini_client import GeminiAPI
+            gemini = GeminiAPI(cache=ResponseCache())
+    except Exception as e:
+        print(f"제미나이 API 오류: {e}")
+        return None
     
-    # 쿠키 설정
-    for kv in COOKIE.split("; "):
-        k, v = kv.split("=", 1)
-        s.cookies.set(k, v, domain="cnujob.cnu.ac.kr")
+    report = summarize_week(gemini, analyzer, results, target_date, hierarchical)
+    return None if report is None else (*report, week_number)
 
-    # 환경변수에서 사용자 정보 로드
-    seq_stu = os.getenv('STUDENT_SEQ')
-    seq_corp = os.getenv('CORP_SEQ')
-    seq_class = os.getenv('CLASS_SEQ')
-    seq_lect = os.getenv('LECT_SEQ')
-    student_id = os.getenv('STUDENT_ID')
-    
-    # 필수 환경변수 체크
-    required_vars = {
-        'STUDENT_SEQ': seq_stu,
-        'CORP_SEQ': seq_corp,
-        'CLASS_SEQ': seq_class,
-        'LECT_SEQ': seq_lect,
-        'STUDENT_ID': student_id
-    }
+def main():
+    parser = argparse.ArgumentParser(description="주간 보고서 생성 및 게시")
+    parser.add_argument('date', nargs='?', help="기준 날짜 (YYYY-MM-DD, 기본값: 오늘)")
+    parser.add_argument('--hierarchical', action='store_true',
+                        help="일일 보고서를 먼저 만들고(캐시 재사용) 이를 요약해 주간 보고서 생성")
+    parser.add_argument('--force', action='store_true',
+                        help="전송 후 응답을 받지 못한 보고서도 다시 게시 (포털에서 미등록을 확인한 경우)")
+    add_metrics_arguments(parser)
+    args = parser.parse_args()
     
-    missing_vars = [k for k, v in required_vars.items() if not v]
-    if missing_vars:
-        print(f"⚠️ 다음 환경변수들이 설정되지 않았습니다: {', '.join(missing_vars)}")
-        print("💡 .env.example 파일을 참고하여 환경변수를 설정해주세요.")
-        raise ValueError("필수 환경변수가 누락되었습니다.")
+    run_instrumented(lambda: run(args), args)
 
+def post_week_report(client, student_info, week_number, subject, contents, ledger=None):
+    """주간 보고서 게시 (ledger가 있으면 전송 전후로 기록)
+
+    Args:
+        client: PortalClient
+
+    Returns:
+        insertResult 값 (실패시 0)
+    """
     # 세션 데이터
     data = {
-        "seqStu": seq_stu,
-        "seqCorp": seq_corp, 
-        "seqClass": seq_class,
-        "seqLect": seq_lect,
-        "id": student_id,
+        **student_info,
         "bName": "Week",
         "subject": subject,
         "contents": contents,
@@ -200,8 +257,13 @@ def main():
         "week": week_number,
     }
 
+    if ledger is not None:
+        ledger.mark_pending(student_info["id"], "Week", week_number, subject, contents)
+
     # 게시물 전송
-    r = s.post(f"{BASE}/student/report/studentBoardAddProc", data=data, timeout=20)
+    with metrics.span('portal_post', kind="Week") as labels:
+        r = client.post("/student/report/studentBoardAddProc", data, referer_path="/student/report/studentBoardWeekAdd")
+        labels['status'] = r.status_code
     print(f"Status Code: {r.status_code}")
     print(f"URL: {r.url}")
 
@@ -218,6 +280,63 @@ def main():
     except json.JSONDecodeError:
         print("✗ JSON 응답 파싱 실패")
         print(f"Raw response: {r.text[:500]}")
+        insert_result = 0
+
+    if ledger is not None:
+        ledger.record(student_info["id"], "Week", week_number, subject, contents, insert_result)
+
+    return insert_result
+
+def run(args):
+    """기준 날짜의 주간 보고서 생성 및 게시"""
+    # 대상 날짜 결정
+    target_date = get_target_date(args.date)
+    post_weekly(target_date, args.hierarchical, force=args.force)
+
+def post_weekly(target_date, hierarchical=False, dry_run=False, force=False):
+    """기준 날짜의 주간 보고서 생성 후 게시
+
+    Args:
+        target_date: 기준 날짜 (datetime)
+        hierarchical: True면 일일 보고서 요약으로 주간 보고서 생성
+        dry_run: True면 생성 결과만 출력하고 게시하지 않음
+        force: 전송 후 응답을 받지 못한 보고서도 다시 게시
+    """
+    if dry_run:
+        report = generate_content_with_gemini(target_date, hierarchical)
+        if report is None:
+            print("✗ 주간 보고서를 생성하지 못했습니다.")
+            return
+        subject, contents, _ = report
+        print(f"생성된 제목: {subject}")
+        print(f"생성된 내용: {contents}")
+        return
+    
+    # 환경변수에서 사용자 정보 로드
+    student_info = load_student_info()
+    
+    # 이미 등록된 주차면 생성/게시 없이 종료
+    ledger = PostLedger()
+    if ledger.check(student_info["id"], "Week", calculate_week_number(target_date), force):
+        return
+    
+    with PortalClient(key=student_info["id"]) as client:
+        # 세션이 만료됐으면 Gemini를 호출하기 전에 종료
+        if not client.preflight():
+            return
+        
+        print(f"제미나이 API를 사용하여 {target_date.strftime('%Y-%m-%d')} 기준 주간 보고서를 생성중...")
+        report = generate_content_with_gemini(target_date, hierarchical)
+        # 생성에 실패하면 게시하지도, 게시 기록에 남기지도 않음 (다음 실행에서 다시 생성)
+        if report is None:
+            print(f"✗ {calculate_week_number(target_date)} 보고서가 생성되지 않아 게시하지 않습니다.")
+            return
+        subject, contents, week_number = report
+        
+        print(f"생성된 제목: {subject}")
+        print(f"생성된 내용: {contents[:100]}...")
+        
+        post_week_report(client, student_info, week_number, subject, contents, ledger)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()